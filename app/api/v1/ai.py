@@ -2,6 +2,7 @@ import os
 import uuid
 
 from fastapi import APIRouter, Query, HTTPException, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
 
 from app.services.ai_service import GeminiService
 from app.services.extract_service import ArticleService
@@ -45,14 +46,14 @@ async def analyze_image(
         raise HTTPException(status_code=500, detail=f"Error analyzing image: {str(e)}")
 
 @router.post("/translate-article")
-def translate_article(
+async def translate_article(
     url: str = Query(..., description="URL of the article to translate"),
     target_lang: str = Query("vi", description="Target language code")
 ):
     """Extract and translate an article from a URL"""
     try:
         # Extract article content
-        article_data = ArticleService.extract_article(url)
+        article_data = await ArticleService.extract_article(url)
         if not article_data:
             raise HTTPException(status_code=404, detail="Could not extract article from URL")
             
@@ -64,7 +65,9 @@ def translate_article(
             raise HTTPException(status_code=400, detail="Article is too long (max 1500 words)")
             
         # Translate the text
-        translated_text = GeminiService.translate_text(text, "auto", target_lang, max_tokens=2500)
+        translated_text = await run_in_threadpool(
+            GeminiService.translate_text, text, "auto", target_lang, max_tokens=2500
+        )
         
         # Return results
         return {
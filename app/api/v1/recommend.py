@@ -1,18 +1,26 @@
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Query
 from app.services.recommend_service import recommend_service
+from app.services.keyword_index import keyword_index
 from app.core.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.pagination import decode_cursor
 
 router = APIRouter(prefix="/recommend", tags=["recommend"])
 
 @router.get("/hot-articles")
 async def get_hot_articles(
     page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size")
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor")
 ):
     """Get hot articles with pagination"""
     try:
-        result = await recommend_service.get_hot_articles(page=page, page_size=page_size)
+        if cursor:
+            decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        result = await recommend_service.get_hot_articles(page=page, page_size=page_size, cursor=cursor)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -37,6 +45,11 @@ async def reset_cache():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/keyword-index/stats")
+async def get_keyword_index_stats():
+    """Size, memory footprint and last refresh of the in-process keyword index"""
+    return keyword_index.stats()
+
 @router.get("/by-keywords")
 async def get_articles_by_keywords(
     keywords: List[str] = Query(
@@ -46,14 +59,24 @@ async def get_articles_by_keywords(
         description="List of keyword names (1–25 items)"
     ),
     page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size")
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    sort: str = Query("date", pattern="^(date|relevance)$",
+                      description="date (newest first) or relevance (most matched keywords first)")
 ):
-    """Recommend articles by keywords, sorted from newest to oldest"""
+    """Recommend articles by keywords, newest first or by number of matched keywords"""
+    try:
+        if cursor:
+            decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     try:
         result = await recommend_service.get_articles_by_keywords(
             keywords=keywords,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            cursor=cursor,
+            sort=sort
         )
         return result
     except Exception as e:
@@ -63,19 +86,24 @@ async def get_articles_by_keywords(
 @router.get("/related-keywords-by-name")
 async def related_keywords_by_name(
     name: str = Query(..., description="Keyword name to find relations for"),
-    limit: int = Query(20, ge=1, le=100, description="Max number of related keywords")
+    limit: int = Query(20, ge=1, le=100, description="Max number of related keywords"),
+    scoring: str = Query("count", pattern="^(count|pmi|jaccard)$",
+                         description="count (shared articles), pmi or jaccard")
 ):
     try:
-        return await recommend_service.get_related_keywords_by_keyword_name(name, limit)
+        return await recommend_service.get_related_keywords_by_keyword_name(name, limit, scoring)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/related-keywords/{article_id}")
-async def get_related_keywords_by_article(article_id: int):
+async def get_related_keywords_by_article(
+    article_id: int,
+    limit: int = Query(20, ge=1, le=100, description="Max number of related keywords")
+):
     """Get keywords related to a specific article"""
     try:
-        result = await recommend_service.get_related_keywords_by_article(article_id)
+        result = await recommend_service.get_related_keywords_by_article(article_id, limit)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -84,14 +112,24 @@ async def get_related_keywords_by_article(article_id: int):
 async def get_related_articles_by_article(
     article_id: int,
     page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size")
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    sort: str = Query("date", pattern="^(date|relevance)$",
+                      description="date (newest first) or relevance (most matched keywords first)")
 ):
     """Get related articles by shared keywords, excluding the given article"""
+    try:
+        if cursor:
+            decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     try:
         result = await recommend_service.get_related_articles_by_article(
             article_id=article_id,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            cursor=cursor,
+            sort=sort
         )
         return result
     except Exception as e:
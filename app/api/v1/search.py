@@ -1,6 +1,10 @@
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Query
 from app.services.search_service import search_service
+from app.services.search_backends import fts5_backend
+from app.services.suggest_service import suggest_index
 from app.core.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.pagination import decode_cursor
 
 router = APIRouter(prefix="/search", tags=["search"])
 
@@ -8,11 +12,37 @@ router = APIRouter(prefix="/search", tags=["search"])
 async def search_articles(
     q: str = Query(..., description="Search query"),
     page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size")
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor")
 ):
     """Search articles by title and description"""
     try:
-        result = await search_service.search_articles(query=q, page=page, page_size=page_size)
+        if cursor:
+            decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        result = await search_service.search_articles(query=q, page=page, page_size=page_size, cursor=cursor)
         return result
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/suggest")
+async def suggest(
+    q: str = Query(..., min_length=1, description="Prefix typed so far"),
+    limit: int = Query(10, ge=1, le=20, description="Number of suggestions")
+):
+    """Search-as-you-type suggestions from keywords and popular queries"""
+    try:
+        return await search_service.suggest(q, limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/index-stats")
+async def get_search_index_stats():
+    """Backend in use and state of the embedded search index"""
+    return {
+        "backend": search_service.backend().name,
+        "fts5": fts5_backend.stats(),
+        "suggest": suggest_index.stats()
+    }
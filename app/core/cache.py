@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.redis import RedisClient, redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class ReadThroughCache:
+    """
+    Read-through cache on top of RedisClient.
+
+    - Single-flight: concurrent misses for the same key share one load.
+    - Stale-while-revalidate: after `ttl` the entry is still served for
+      `stale_ttl` seconds while a single background refresh replaces it.
+    - invalidate(prefix) wins over loads already running: a load started
+      before the invalidation returns its value but does not store it.
+    """
+
+    def __init__(self, client: RedisClient):
+        self.client = client
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Invalidation generation, and the generation at which each prefix was last invalidated
+        self._generation = 0
+        self._invalidated: Dict[str, int] = {}
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]],
+                          ttl: int, stale_ttl: int = 0,
+                          cache_if: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Return cached value for key, calling loader on a miss.
+        Loaded values for which cache_if returns False are returned but not stored.
+        """
+        entry = await self.client.get(key)
+        if entry is not None:
+            if entry["expires_at"] <= time.time():
+                # Serve the stale value, refresh without blocking the reader
+                self._load(key, loader, ttl, stale_ttl, cache_if)
+            return entry["value"]
+
+        # shield: a cancelled request must not cancel the load other readers wait on
+        return await asyncio.shield(self._load(key, loader, ttl, stale_ttl, cache_if))
+
+    def _load(self, key: str, loader: Callable[[], Awaitable[Any]],
+              ttl: int, stale_ttl: int, cache_if: Optional[Callable[[Any], bool]] = None) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fill(key, loader, ttl, stale_ttl, cache_if))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return task
+
+    def _done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Cache load failed for {key}: {task.exception()}")
+
+    async def _fill(self, key: str, loader: Callable[[], Awaitable[Any]],
+                    ttl: int, stale_ttl: int, cache_if: Optional[Callable[[Any], bool]] = None) -> Any:
+        started = self._generation
+        value = await loader()
+        if cache_if is not None and not cache_if(value):
+            return value
+        if any(key.startswith(prefix) and generation > started
+               for prefix, generation in self._invalidated.items()):
+            return value
+        entry = {"value": value, "expires_at": time.time() + ttl}
+        await self.client.set(key, entry, ttl + stale_ttl)
+        return value
+
+    async def invalidate(self, prefix: str) -> int:
+        """Delete every cached key starting with prefix"""
+        self._generation += 1
+        self._invalidated[prefix] = self._generation
+        for key in [k for k in self._inflight if k.startswith(prefix)]:
+            self._inflight.pop(key, None)
+        deleted = await self.client.delete_pattern(f"{prefix}*")
+        logger.info(f"Invalidated {deleted} cache keys with prefix {prefix}")
+        return deleted
+
+
+# Global cache instance
+cache = ReadThroughCache(redis_client)
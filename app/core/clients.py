@@ -0,0 +1,100 @@
+from typing import Optional
+import httpx
+from supabase import create_client, Client
+from app.core.config import (
+    SUPABASE_URL, SUPABASE_KEY, HTTP2_ENABLED, HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS, HTTP_KEEPALIVE_EXPIRY, HTTP_TIMEOUT
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+    )
+
+
+def _pool_stats(client: httpx.Client) -> dict:
+    """Connection usage of an httpx client (httpcore pool internals, best effort)"""
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    requests = list(getattr(pool, "_requests", []))
+    queued = sum(1 for request in requests if getattr(request, "is_queued", lambda: False)())
+    return {
+        "max_connections": HTTP_MAX_CONNECTIONS,
+        "open_connections": len(connections),
+        "idle_connections": sum(1 for conn in connections if conn.is_idle()),
+        "active_requests": len(requests) - queued,
+        "queued_requests": queued,
+        "http2": HTTP2_ENABLED
+    }
+
+
+class ClientRegistry:
+    """
+    Process-wide network clients, opened by the app lifespan on startup and
+    closed on shutdown (and opened at import for scripts and tests).
+
+    - supabase: the single Supabase client. Its PostgREST session is replaced
+      by a pooled keep-alive (optionally HTTP/2) httpx.Client with
+      HTTP_MAX_CONNECTIONS / HTTP_MAX_KEEPALIVE_CONNECTIONS limits.
+    - http: pooled httpx.Client for direct Supabase REST calls (auth admin API).
+
+    The Supabase client object itself lives for the whole process (modules
+    import it); open() only replaces the httpx sessions closed by close().
+    """
+
+    def __init__(self):
+        self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        self.http: Optional[httpx.Client] = None
+        self.open()
+
+    @property
+    def closed(self) -> bool:
+        return self.http is None or self.http.is_closed
+
+    def open(self) -> None:
+        """Create the pooled sessions if they are not open (idempotent)"""
+        if not self.closed:
+            return
+        self._pool_postgrest()
+        self.http = httpx.Client(
+            base_url=SUPABASE_URL or "",
+            headers={"apikey": SUPABASE_KEY or "", "Authorization": f"Bearer {SUPABASE_KEY}"},
+            http2=HTTP2_ENABLED,
+            limits=_limits(),
+            timeout=HTTP_TIMEOUT
+        )
+
+    def _pool_postgrest(self) -> None:
+        postgrest = self.supabase.postgrest
+        session = postgrest.session
+        postgrest.session = httpx.Client(
+            base_url=session.base_url,
+            headers=session.headers,
+            timeout=session.timeout,
+            http2=HTTP2_ENABLED,
+            limits=_limits()
+        )
+        session.close()
+
+    def pool_stats(self) -> dict:
+        return {
+            "postgrest": _pool_stats(self.supabase.postgrest.session),
+            "http": _pool_stats(self.http)
+        }
+
+    def close(self) -> None:
+        for name, client in (("postgrest", self.supabase.postgrest.session), ("http", self.http)):
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning(f"Failed to close {name} client: {e}")
+
+
+# Global client registry
+clients = ClientRegistry()
@@ -1,19 +1,118 @@
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
-
-# Cache settings
-CACHE_TTL_HOT_ARTICLES = 600  # 10 minutes
-CACHE_TTL_HOT_KEYWORDS = 600  # 10 minutes
-CACHE_TTL_SEARCH = 300  # 5 minutes
-
-# Pagination
-DEFAULT_PAGE_SIZE = 20
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+
+# Local verification of Supabase access tokens (app/dependencies/auth.py)
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")  # HS256 projects
+SUPABASE_JWT_AUDIENCE = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+# Asymmetric (RS256/ES256) signing keys
+SUPABASE_JWKS_URL = os.getenv(
+    "SUPABASE_JWKS_URL", f"{SUPABASE_URL}/auth/v1/.well-known/jwks.json" if SUPABASE_URL else None
+)
+AUTH_JWKS_CACHE_TTL = int(os.getenv("AUTH_JWKS_CACHE_TTL", 600))  # seconds
+# Ask the auth server when a token cannot be verified locally (no secret/key)
+AUTH_REMOTE_FALLBACK = os.getenv("AUTH_REMOTE_FALLBACK", "true").lower() == "true"
+AUTH_TOKEN_CACHE_TTL = int(os.getenv("AUTH_TOKEN_CACHE_TTL", 60))  # seconds
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", 10000))
+
+# Thread pool for Supabase queries made from async endpoints, and per-query timeout (seconds)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 16))
+DB_QUERY_TIMEOUT = float(os.getenv("DB_QUERY_TIMEOUT", 10))
+
+# Shared HTTP connection pools (app/core/clients.py)
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 50))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30))  # seconds
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 10))  # seconds
+
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
+
+# Cache settings
+CACHE_TTL_HOT_ARTICLES = 600  # 10 minutes
+CACHE_TTL_HOT_KEYWORDS = 600  # 10 minutes
+CACHE_TTL_SEARCH = 300  # 5 minutes
+# Stale entries are still served (while one refresh runs) for this long after the TTL
+CACHE_STALE_TTL_HOT_ARTICLES = int(os.getenv("CACHE_STALE_TTL_HOT_ARTICLES", 300))
+
+# Hot keywords leaderboard (maintained in Redis by the keyword extractor)
+HOT_KEYWORDS_WINDOW_DAYS = int(os.getenv("HOT_KEYWORDS_WINDOW_DAYS", 7))
+# Per-day weight multiplier: 1.0 = plain sliding window, <1.0 = older days count less
+HOT_KEYWORDS_DECAY = float(os.getenv("HOT_KEYWORDS_DECAY", 1.0))
+
+# Keyword co-occurrence (maintained in Redis by the keyword extractor):
+# neighbours seen in fewer shared articles are ignored when scoring
+KEYWORD_COOC_MIN_COUNT = int(os.getenv("KEYWORD_COOC_MIN_COUNT", 2))
+# The extractor keeps a larger buffer per keyword; only the top N are read and reranked
+KEYWORD_COOC_MAX_NEIGHBOURS = int(os.getenv("KEYWORD_COOC_MAX_NEIGHBOURS", 200))
+
+# Related keywords of an article: cached result and latency budget for the neighbour lookups
+CACHE_TTL_RELATED_KEYWORDS = int(os.getenv("CACHE_TTL_RELATED_KEYWORDS", 3600))
+RELATED_KEYWORDS_BUDGET_MS = int(os.getenv("RELATED_KEYWORDS_BUDGET_MS", 150))
+RELATED_KEYWORDS_PER_KEYWORD = int(os.getenv("RELATED_KEYWORDS_PER_KEYWORD", 20))
+
+# Total counts for paginated endpoints:
+#   exact     - COUNT(*) on every request
+#   cached    - exact count shared across pages, cached for CACHE_TTL_COUNT
+#   planned   - Postgres planner estimate (cheap, approximate)
+#   estimated - exact for small results, planner estimate for large ones
+#   none      - no total, only has_more
+CACHE_TTL_COUNT = int(os.getenv("CACHE_TTL_COUNT", 600))
+COUNT_MODE_HOT_ARTICLES = os.getenv("COUNT_MODE_HOT_ARTICLES", "cached")
+COUNT_MODE_SEARCH = os.getenv("COUNT_MODE_SEARCH", "cached")
+COUNT_MODE_KEYWORDS = os.getenv("COUNT_MODE_KEYWORDS", "cached")
+
+# In-process keyword -> article index (app/services/keyword_index.py)
+KEYWORD_INDEX_ENABLED = os.getenv("KEYWORD_INDEX_ENABLED", "false").lower() == "true"
+KEYWORD_INDEX_REFRESH_INTERVAL = int(os.getenv("KEYWORD_INDEX_REFRESH_INTERVAL", 60))  # seconds
+KEYWORD_INDEX_FULL_RELOAD_INTERVAL = int(os.getenv("KEYWORD_INDEX_FULL_RELOAD_INTERVAL", 6 * 3600))
+KEYWORD_INDEX_PAGE_SIZE = int(os.getenv("KEYWORD_INDEX_PAGE_SIZE", 1000))  # PostgREST max-rows
+
+# Search backend: "ilike" (Postgres substring scan) or "fts5" (embedded SQLite FTS5 index)
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "ilike")
+# Relative paths are resolved against the project root, not the working directory
+SEARCH_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    os.getenv("SEARCH_INDEX_PATH", "search_index.db")
+)
+SEARCH_INDEX_REFRESH_INTERVAL = int(os.getenv("SEARCH_INDEX_REFRESH_INTERVAL", 60))  # seconds
+# New articles are synced by article_id; a full pass picks up edited and deleted ones
+SEARCH_INDEX_FULL_SYNC_INTERVAL = int(os.getenv("SEARCH_INDEX_FULL_SYNC_INTERVAL", 6 * 3600))
+SEARCH_INDEX_PAGE_SIZE = int(os.getenv("SEARCH_INDEX_PAGE_SIZE", 1000))
+SEARCH_STOPWORDS_PATH = os.getenv(
+    "SEARCH_STOPWORDS_PATH",
+    os.path.join(os.path.dirname(__file__), "..", "..", "craw_data_service", "vietnamese-stopwords.txt")
+)
+SEARCH_TITLE_WEIGHT = float(os.getenv("SEARCH_TITLE_WEIGHT", 3.0))
+
+# Search suggestions (app/services/suggest_service.py)
+# Keyword weights come from the extractor's kw_cooc:df hash (KEYWORD_COOC_ENABLED),
+# or from the get_hot_keywords RPC when that hash is empty
+SUGGEST_INDEX_ENABLED = os.getenv("SUGGEST_INDEX_ENABLED", "false").lower() == "true"
+SUGGEST_REFRESH_INTERVAL = int(os.getenv("SUGGEST_REFRESH_INTERVAL", 60))  # seconds
+SUGGEST_FULL_RELOAD_INTERVAL = int(os.getenv("SUGGEST_FULL_RELOAD_INTERVAL", 3600))
+SUGGEST_POPULAR_QUERIES = int(os.getenv("SUGGEST_POPULAR_QUERIES", 5000))
+# search:popular is trimmed to this many queries on every refresh
+SUGGEST_POPULAR_MAX = int(os.getenv("SUGGEST_POPULAR_MAX", 10 * SUGGEST_POPULAR_QUERIES))
+# Prefixes up to this many characters get precomputed top-k lists
+SUGGEST_SHORT_PREFIX_LENGTH = int(os.getenv("SUGGEST_SHORT_PREFIX_LENGTH", 2))
+SUGGEST_TOP_K = int(os.getenv("SUGGEST_TOP_K", 50))
+SUGGEST_MAX_SCAN = int(os.getenv("SUGGEST_MAX_SCAN", 5000))
+# Ranked results of longer prefixes kept in an LRU, cleared when entries are added
+SUGGEST_CACHE_SIZE = int(os.getenv("SUGGEST_CACHE_SIZE", 10000))
+
+# Article extraction cache (app/services/extract_service.py)
+EXTRACT_CACHE_TTL = int(os.getenv("EXTRACT_CACHE_TTL", 24 * 3600))  # Redis, seconds
+EXTRACT_CACHE_MAX_BYTES = int(os.getenv("EXTRACT_CACHE_MAX_BYTES", 512 * 1024))  # larger results skip Redis
+EXTRACT_LOCAL_CACHE_SIZE = int(os.getenv("EXTRACT_LOCAL_CACHE_SIZE", 256))  # entries per process
+EXTRACT_LOCAL_CACHE_TTL = int(os.getenv("EXTRACT_LOCAL_CACHE_TTL", 300))
+EXTRACT_NEGATIVE_CACHE_TTL = int(os.getenv("EXTRACT_NEGATIVE_CACHE_TTL", 60))
+
+# Pagination
+DEFAULT_PAGE_SIZE = 20
 MAX_PAGE_SIZE = 100
\ No newline at end of file
@@ -1,4 +1,58 @@
-from supabase import create_client, Client
-from app.core.config import SUPABASE_URL, SUPABASE_KEY
-
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+from supabase import Client
+from app.core.clients import clients
+from app.core.config import DB_POOL_SIZE, DB_QUERY_TIMEOUT
+
+supabase: Client = clients.supabase
+
+# The supabase client is synchronous. Queries from async code run on this
+# bounded pool, so a slow query holds one worker thread instead of the event loop.
+# The app lifespan recreates it on startup and shuts it down on exit.
+db_executor: Optional[ThreadPoolExecutor] = None
+
+
+def start_query_pool() -> None:
+    """Create the query thread pool if it is not running (idempotent)"""
+    global db_executor
+    if db_executor is None:
+        db_executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix="supabase")
+
+
+def stop_query_pool() -> None:
+    """Shut the query thread pool down; run_query falls back to the loop's default executor"""
+    global db_executor
+    if db_executor is not None:
+        db_executor.shutdown(wait=False, cancel_futures=True)
+        db_executor = None
+
+
+start_query_pool()
+
+_query_stats = {"in_flight": 0, "peak_in_flight": 0, "total": 0, "timeouts": 0}
+
+
+async def run_query(builder, timeout: Optional[float] = DB_QUERY_TIMEOUT) -> Any:
+    """
+    Execute a PostgREST query builder (table/rpc chain without `.execute()`)
+    off the event loop. Raises asyncio.TimeoutError after `timeout` seconds;
+    the worker thread finishes the HTTP call in the background.
+    Independent queries can be awaited together with asyncio.gather.
+    """
+    loop = asyncio.get_running_loop()
+    _query_stats["in_flight"] += 1
+    _query_stats["total"] += 1
+    _query_stats["peak_in_flight"] = max(_query_stats["peak_in_flight"], _query_stats["in_flight"])
+    try:
+        return await asyncio.wait_for(loop.run_in_executor(db_executor, builder.execute), timeout)
+    except asyncio.TimeoutError:
+        _query_stats["timeouts"] += 1
+        raise
+    finally:
+        _query_stats["in_flight"] -= 1
+
+
+def query_pool_stats() -> dict:
+    """Saturation of the query thread pool: in_flight above pool_size means queries are queueing"""
+    return {"pool_size": DB_POOL_SIZE, **_query_stats}
@@ -0,0 +1,48 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+
+def encode_cursor(pub_date: Any, article_id: int) -> str:
+    """Opaque cursor pointing just after the (pub_date, article_id) row"""
+    raw = json.dumps([pub_date, article_id], default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decode a cursor, raising ValueError if it was not produced by encode_cursor.
+    The values end up inside a PostgREST filter, so pub_date must parse as an
+    ISO timestamp and article_id as an integer (no room for extra filter terms).
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        pub_date, article_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(pub_date, str) or isinstance(article_id, bool):
+            raise ValueError
+        return datetime.fromisoformat(pub_date.replace("Z", "+00:00")).isoformat(), int(article_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def apply_keyset(query, cursor: Optional[str]):
+    """
+    Order by (pub_date, article_id) desc and, if a cursor is given, keep only
+    rows after it. The condition goes into a top-level `and` parameter so it
+    composes with endpoints that already use `or` (e.g. search).
+    """
+    query = query.order("pub_date", desc=True).order("article_id", desc=True)
+    if cursor:
+        pub_date, article_id = decode_cursor(cursor)
+        keyset = f'pub_date.lt."{pub_date}",and(pub_date.eq."{pub_date}",article_id.lt.{article_id})'
+        query.params = query.params.add("and", f"(or({keyset}))")
+    return query
+
+
+def next_cursor(rows: List[dict], has_more: bool) -> Optional[str]:
+    """Cursor for the page after `rows`, None on the last page"""
+    if not has_more or not rows:
+        return None
+    last = rows[-1]
+    return encode_cursor(last["pub_date"], last["article_id"])
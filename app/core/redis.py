@@ -35,6 +35,26 @@ class RedisClient:
         except Exception:
             return False
 
+    async def delete_pattern(self, pattern: str) -> int:
+        """Delete all keys matching a glob pattern, return number deleted"""
+        try:
+            keys = [key async for key in self.redis.scan_iter(match=pattern, count=500)]
+            if keys:
+                await self.redis.delete(*keys)
+            return len(keys)
+        except Exception:
+            return 0
+
+    def pool_stats(self) -> dict:
+        """Connection usage of the Redis pool"""
+        pool = self.redis.connection_pool
+        return {
+            "max_connections": pool.max_connections,
+            "created_connections": getattr(pool, "_created_connections", None),
+            "in_use_connections": len(getattr(pool, "_in_use_connections", ())),
+            "available_connections": len(getattr(pool, "_available_connections", ()))
+        }
+
     async def close(self):
         """Close Redis connection"""
         await self.redis.close()
@@ -0,0 +1,77 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, Tuple
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+MAX_STOPWORD_LENGTH = 4  # syllables in the longest stopword phrase we try to match
+
+
+@lru_cache(maxsize=4096)
+def _fold_char(ch: str) -> str:
+    if ch in "đĐ":
+        return "d"
+    base = "".join(c for c in unicodedata.normalize("NFD", ch) if not unicodedata.combining(c))
+    base = base.lower()
+    # Keep one output char per input char so offsets map back to the original text
+    return base if len(base) == 1 else ch.lower()
+
+
+def fold_vietnamese(text: str) -> str:
+    """
+    Lowercase and strip Vietnamese diacritics ("Đà Nẵng" -> "da nang").
+    The result has the same length as the input, character for character.
+    """
+    return "".join(_fold_char(ch) for ch in text)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased syllables of text, diacritics kept"""
+    return WORD_RE.findall(text.lower())
+
+
+def load_stopwords(path: str) -> FrozenSet[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return frozenset(line.strip().lower() for line in f if line.strip())
+    except OSError:
+        return frozenset()
+
+
+def remove_stopwords(tokens: List[str], stopwords: FrozenSet[str]) -> List[str]:
+    """
+    Drop stopword phrases (matched longest first on the accented tokens, so
+    "mà" is dropped but "mã" is kept). Returns the input if nothing is left.
+    """
+    kept = []
+    i = 0
+    while i < len(tokens):
+        for n in range(min(MAX_STOPWORD_LENGTH, len(tokens) - i), 0, -1):
+            if " ".join(tokens[i:i + n]) in stopwords:
+                i += n
+                break
+        else:
+            kept.append(tokens[i])
+            i += 1
+    return kept or tokens
+
+
+def match_spans(text: str, terms: Iterable[str]) -> List[Tuple[int, int]]:
+    """(start, end) of whole-syllable matches of folded terms in text, accent-insensitive"""
+    folded = fold_vietnamese(text)
+    wanted = set(terms)
+    return [m.span() for m in WORD_RE.finditer(folded) if m.group() in wanted]
+
+
+def highlight(text: str, terms: Iterable[str], before: str = "<mark>", after: str = "</mark>") -> str:
+    """Wrap matches of folded terms in the original (accented) text"""
+    if not text:
+        return text
+    parts = []
+    last = 0
+    for start, end in match_spans(text, terms):
+        parts.append(text[last:start])
+        parts.append(f"{before}{text[start:end]}{after}")
+        last = end
+    parts.append(text[last:])
+    return "".join(parts)
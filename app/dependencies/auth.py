@@ -1,67 +1,139 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from supabase import create_client, Client
-from app.core.config import SUPABASE_URL, SUPABASE_KEY
-import httpx
-
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-
-bearer_scheme = HTTPBearer(auto_error=False)
-
-
-async def get_current_user(
-        credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
-):
-    if not credentials or credentials.scheme.lower() != "bearer":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing or invalid Authorization header",
-        )
-
-    token = credentials.credentials  # Bearer token của user
-    try:
-        # Dùng token này để xác thực user
-        user_resp = supabase.auth.get_user(token)
-        user = user_resp.user
-
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired token",
-            )
-
-        return {
-            "id": user.id,
-            "email": user.email,
-            "role": getattr(user, "role", None)
-        }
-
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Authentication error: {str(e)}",
-        )
-
-def delete_auth_user(anonymous_user_id: str):
-    """
-    Xóa user từ bảng auth.users qua Admin API.
-    SUPABASE_KEY đã là Service Role Key, đủ quyền DELETE user.
-    """
-    url = f"{SUPABASE_URL}/auth/v1/admin/users/{anonymous_user_id}"
-    headers = {
-        "apikey": SUPABASE_KEY,
-        "Authorization": f"Bearer {SUPABASE_KEY}"
-    }
-
-    supabase.auth.api.delete_user(anonymous_user_id)
-
-    response = httpx.delete(url, headers=headers)
-
-    if response.status_code == 204:
-        print("Anonymous user deleted successfully.")
-    else:
-        print("Error deleting user:", response.status_code, response.text)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to delete anonymous user"
-        )
+import hashlib
+import time
+import jwt
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from jwt import PyJWKClient, PyJWKClientError
+from app.core.clients import clients
+from app.core.config import (
+    SUPABASE_JWT_SECRET, SUPABASE_JWT_AUDIENCE, SUPABASE_JWKS_URL, AUTH_REMOTE_FALLBACK,
+    AUTH_TOKEN_CACHE_TTL, AUTH_TOKEN_CACHE_SIZE, AUTH_JWKS_CACHE_TTL
+)
+from app.core.database import supabase
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+# Asymmetric algorithms Supabase signs access tokens with
+JWKS_ALGORITHMS = ("RS256", "ES256")
+
+# Verified tokens: sha256(token) -> (user, exp). Entries never outlive the token's exp.
+_token_cache = TTLCache(maxsize=AUTH_TOKEN_CACHE_SIZE, ttl=AUTH_TOKEN_CACHE_TTL)
+_jwks_client = PyJWKClient(SUPABASE_JWKS_URL, cache_keys=True, lifespan=AUTH_JWKS_CACHE_TTL) \
+    if SUPABASE_JWKS_URL else None
+
+
+class _CannotVerifyLocally(Exception):
+    """No secret/public key available here for this token"""
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+
+def _verify_locally(token: str) -> dict:
+    """
+    Check signature, exp and aud of a Supabase access token without calling
+    the auth server: HS256 with SUPABASE_JWT_SECRET, asymmetric keys via the
+    project's cached JWKS. Raises jwt.InvalidTokenError for bad tokens and
+    _CannotVerifyLocally when no key is available.
+    """
+    # The header only picks the key; the accepted algorithm is pinned per key
+    # (never taken from the token, or "none"/HS256-with-a-public-key would pass)
+    if jwt.get_unverified_header(token).get("alg") == "HS256":
+        if not SUPABASE_JWT_SECRET:
+            raise _CannotVerifyLocally("SUPABASE_JWT_SECRET is not set")
+        key, algorithms = SUPABASE_JWT_SECRET, ["HS256"]
+    else:
+        if _jwks_client is None:
+            raise _CannotVerifyLocally("No JWKS URL configured")
+        try:
+            signing_key = _jwks_client.get_signing_key_from_jwt(token)
+        except (PyJWKClientError, jwt.exceptions.PyJWKError) as e:
+            raise _CannotVerifyLocally(str(e))
+        if signing_key.algorithm_name not in JWKS_ALGORITHMS:
+            raise jwt.InvalidAlgorithmError(f"JWKS key algorithm {signing_key.algorithm_name} is not allowed")
+        key, algorithms = signing_key.key, [signing_key.algorithm_name]
+
+    return jwt.decode(
+        token, key, algorithms=algorithms, audience=SUPABASE_JWT_AUDIENCE,
+        options={"require": ["exp", "sub"]}
+    )
+
+
+def _verify_remotely(token: str) -> dict:
+    """Ask the Supabase auth server (one network round trip)"""
+    user = supabase.auth.get_user(token).user
+    if user is None:
+        raise _unauthorized("Invalid or expired token")
+    return {
+        "id": user.id,
+        "email": user.email,
+        "role": getattr(user, "role", None)
+    }
+
+
+async def verify_token(token: str) -> dict:
+    """User of a bearer token: cache, then local JWT verification, then (optionally) remote"""
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    cached = _token_cache.get(key)
+    if cached is not None and cached[1] > time.time():
+        return cached[0]
+
+    try:
+        # JWKS lookups may fetch keys over the network, keep them off the event loop
+        claims = await run_in_threadpool(_verify_locally, token)
+        user = {"id": claims["sub"], "email": claims.get("email"), "role": claims.get("role")}
+        exp = claims["exp"]
+    except jwt.ExpiredSignatureError:
+        raise _unauthorized("Token has expired")
+    except jwt.InvalidTokenError as e:
+        raise _unauthorized(f"Invalid token: {e}")
+    except _CannotVerifyLocally as e:
+        if not AUTH_REMOTE_FALLBACK:
+            raise _unauthorized(f"Cannot verify token: {e}")
+        user = await run_in_threadpool(_verify_remotely, token)
+        claims = jwt.decode(token, options={"verify_signature": False})
+        exp = min(time.time() + AUTH_TOKEN_CACHE_TTL, claims.get("exp", float("inf")))
+
+    _token_cache[key] = (user, exp)
+    return user
+
+
+async def get_current_user(
+        credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
+):
+    if not credentials or credentials.scheme.lower() != "bearer":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing or invalid Authorization header",
+        )
+
+    token = credentials.credentials  # Bearer token của user
+    try:
+        return await verify_token(token)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Authentication error: {str(e)}",
+        )
+
+def delete_auth_user(anonymous_user_id: str):
+    """
+    Xóa user từ bảng auth.users qua Admin API.
+    SUPABASE_KEY đã là Service Role Key, đủ quyền DELETE user.
+    """
+    # Pooled keep-alive client, already carries apikey/Authorization headers
+    response = clients.http.delete(f"/auth/v1/admin/users/{anonymous_user_id}")
+
+    if response.status_code == 204:
+        print("Anonymous user deleted successfully.")
+    else:
+        print("Error deleting user:", response.status_code, response.text)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to delete anonymous user"
+        )
@@ -1,9 +1,53 @@
-from fastapi import FastAPI
-from app.api.v1 import user, extract, ai, recommend, search
-
-app = FastAPI()
-app.include_router(user.router, prefix="/api/v1", tags=["Protected"])
-app.include_router(extract.router, prefix="/api/v1", tags=["Public"])
-app.include_router(ai.router, prefix="/api/v1", tags=["Protected"])
-app.include_router(recommend.router, prefix="/api/v1", tags=["Public"])
-app.include_router(search.router, prefix="/api/v1", tags=["Public"])
\ No newline at end of file
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from app.api.v1 import user, extract, ai, recommend, search
+from app.core.clients import clients
+from app.core.database import query_pool_stats, start_query_pool, stop_query_pool
+from app.core.redis import redis_client
+from app.core.config import KEYWORD_INDEX_ENABLED, SEARCH_BACKEND, SEARCH_INDEX_REFRESH_INTERVAL
+from app.core.config import SUGGEST_INDEX_ENABLED, SUGGEST_REFRESH_INTERVAL
+from app.services.keyword_index import keyword_index
+from app.services.search_backends import fts5_backend
+from app.services.suggest_service import suggest_index
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared clients (reopened if a previous lifespan closed them)
+    clients.open()
+    start_query_pool()
+    # Background indexes
+    if KEYWORD_INDEX_ENABLED:
+        keyword_index.start()
+    if SEARCH_BACKEND == "fts5":
+        fts5_backend.start(SEARCH_INDEX_REFRESH_INTERVAL)
+    if SUGGEST_INDEX_ENABLED:
+        suggest_index.start(SUGGEST_REFRESH_INTERVAL)
+
+    yield
+
+    await keyword_index.stop()
+    await fts5_backend.stop()
+    await suggest_index.stop()
+    # Shared clients
+    stop_query_pool()
+    clients.close()
+    await redis_client.close()
+
+
+app = FastAPI(lifespan=lifespan)
+app.include_router(user.router, prefix="/api/v1", tags=["Protected"])
+app.include_router(extract.router, prefix="/api/v1", tags=["Public"])
+app.include_router(ai.router, prefix="/api/v1", tags=["Protected"])
+app.include_router(recommend.router, prefix="/api/v1", tags=["Public"])
+app.include_router(search.router, prefix="/api/v1", tags=["Public"])
+
+
+@app.get("/metrics/pools", tags=["Metrics"])
+async def pool_metrics():
+    """Connection/thread pool saturation, for sizing workers and pool limits"""
+    return {
+        "db_queries": query_pool_stats(),
+        "http": clients.pool_stats(),
+        "redis": redis_client.pool_stats()
+    }
@@ -0,0 +1,61 @@
+from typing import Any, Callable, List, Optional, Tuple
+from app.core.cache import cache
+from app.core.database import run_query
+from app.core.config import CACHE_TTL_COUNT
+import logging
+
+logger = logging.getLogger(__name__)
+
+COUNT_MODES = ("exact", "cached", "planned", "estimated", "none")
+COUNT_CACHE_PREFIX = "count:"
+
+
+class CountService:
+    """
+    Totals for paginated endpoints without transferring the matching rows.
+
+    `build_query(method)` must return a query builder selecting with
+    `count=method, head=True` and the endpoint's filters; only the count
+    header comes back from PostgREST.
+    """
+
+    @staticmethod
+    async def get_total(cache_key: str, build_query: Callable[[str], Any],
+                        mode: str = "cached") -> Optional[int]:
+        """Total number of matching rows for the given count mode, None in "none" mode"""
+        if mode not in COUNT_MODES:
+            raise ValueError(f"Unknown count mode: {mode}")
+        if mode == "none":
+            return None
+        if mode == "cached":
+            return await cache.get_or_load(
+                f"{COUNT_CACHE_PREFIX}{cache_key}",
+                lambda: CountService._count(build_query, "exact"),
+                ttl=CACHE_TTL_COUNT,
+                stale_ttl=CACHE_TTL_COUNT
+            )
+        return await CountService._count(build_query, mode)
+
+    @staticmethod
+    async def _count(build_query: Callable[[str], Any], method: str) -> Optional[int]:
+        result = await run_query(build_query(method))
+        return result.count
+
+    @staticmethod
+    def page_limit(page_size: int) -> int:
+        """Rows to fetch for a page: one extra row tells whether another page exists"""
+        return page_size + 1
+
+    @staticmethod
+    def trim_page(rows: List[dict], page_size: int) -> Tuple[List[dict], bool]:
+        """Drop the look-ahead row, return (rows, has_more)"""
+        return rows[:page_size], len(rows) > page_size
+
+    @staticmethod
+    async def invalidate(prefix: str = "") -> int:
+        """Drop cached totals"""
+        return await cache.invalidate(f"{COUNT_CACHE_PREFIX}{prefix}")
+
+
+# Global service instance
+count_service = CountService()
@@ -1,6 +1,80 @@
 import trafilatura
+import asyncio
+import hashlib
 import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
 from typing import Dict, List, Optional
+from cachetools import TTLCache
+from fastapi.concurrency import run_in_threadpool
+from trafilatura.utils import normalize_unicode
+from trafilatura.xml import xmltotxt
+from app.core.redis import RedisClient, redis_client
+from app.core.config import (
+    EXTRACT_CACHE_TTL, EXTRACT_CACHE_MAX_BYTES, EXTRACT_LOCAL_CACHE_SIZE,
+    EXTRACT_LOCAL_CACHE_TTL, EXTRACT_NEGATIVE_CACHE_TTL
+)
+
+logger = logging.getLogger(__name__)
+
+# Tăng khi định dạng kết quả thay đổi (vd. "text" chuyển sang markdown),
+# để không đọc lại các entry cũ còn trong Redis
+EXTRACT_FORMAT_VERSION = 2
+EXTRACT_CACHE_PREFIX = f"extract:v{EXTRACT_FORMAT_VERSION}:"
+
+def _markdown(document) -> str:
+    """Nội dung markdown từ cây đã trích xuất (giống output_format="markdown")"""
+    text = xmltotxt(document.body, include_formatting=True)
+    if document.commentsbody is not None:
+        text = f"{text}\n{xmltotxt(document.commentsbody, include_formatting=True)}".strip()
+    return normalize_unicode(text)
+
+
+def _images(document) -> List[str]:
+    """URL ảnh trong nội dung bài (thẻ graphic), không có thì lấy ảnh đại diện"""
+    images = []
+    for graphic in document.body.iter("graphic"):
+        src = graphic.get("src")
+        if src and src not in images:
+            images.append(src)
+    if not images and document.image:
+        images.append(document.image)
+    return images
+
+
+def parse_article(html: str, url: Optional[str] = None) -> Optional[Dict]:
+    """
+    Phân tích HTML đã tải về thành thông tin bài báo.
+
+    Cây nội dung chỉ được dựng một lần (bare_extraction); markdown, ảnh và
+    metadata đều lấy từ cùng một Document.
+    """
+    document = trafilatura.bare_extraction(
+        html,
+        url=url,
+        output_format="markdown",
+        with_metadata=True,
+        include_images=True,
+        include_links=True
+    )
+    if document is None or document.body is None:
+        return None
+
+    markdown_content = _markdown(document)
+    if not markdown_content:
+        return None
+
+    return {
+        "title": document.title or "Không rõ",
+        "text": markdown_content,  # Nội dung dạng markdown có chứa link ảnh
+        "images": _images(document),
+        "pubDate": document.date or "Không rõ",
+        "author": document.author or "Không rõ"
+    }
+
 
 def extract_article(url: str) -> Optional[Dict]:
     """
@@ -21,53 +95,83 @@ def extract_article(url: str) -> Optional[Dict]:
         print(f"Không tải được URL: {url}")
         return None
 
-    # Trích xuất nội dung Markdown và metadata riêng biệt
-    markdown_content = trafilatura.extract(
-        downloaded,
-        url=url,
-        output_format="markdown",
-        include_images=True,
-        include_links=True
-    )
+    article = parse_article(downloaded, url)
+    if article is None:
+        print(f"Không trích xuất được nội dung từ: {url}")
+    return article
 
-    # Trích xuất metadata dưới dạng JSON
-    metadata_json = trafilatura.extract(
-        downloaded,
-        url=url,
-        output_format="json",
-        with_metadata=True,
-        include_images=True
-    )
 
-    if not markdown_content or not metadata_json:
-        print(f"Không trích xuất được nội dung từ: {url}")
-        return None
+class ExtractionCache:
+    """
+    URL-keyed cache of extract_article results shared by the /extract and
+    translate endpoints: an in-process TTL/LRU cache in front of Redis, with
+    single-flight so concurrent requests for one URL trigger one download.
 
-    # Chuyển JSON metadata thành dictionary
-    metadata = json.loads(metadata_json)
+    Results larger than EXTRACT_CACHE_MAX_BYTES stay in process only.
+    Failed extractions (None) are remembered locally for
+    EXTRACT_NEGATIVE_CACHE_TTL so a bad URL is not re-downloaded per request.
+    """
 
-    # Trả về thông tin bài viết với nội dung dạng markdown
-    return {
-        "title": metadata.get("title") or "Không rõ",
-        "text": markdown_content,  # Nội dung dạng markdown có chứa link ảnh
-        "images": metadata.get("images") or [],
-        "pubDate": metadata.get("date") or "Không rõ",
-        "author": metadata.get("author") or "Không rõ"
-    }
+    def __init__(self, client: RedisClient):
+        self.client = client
+        self.local = TTLCache(maxsize=EXTRACT_LOCAL_CACHE_SIZE, ttl=EXTRACT_LOCAL_CACHE_TTL)
+        self.failed = TTLCache(maxsize=EXTRACT_LOCAL_CACHE_SIZE, ttl=EXTRACT_NEGATIVE_CACHE_TTL)
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return f"{EXTRACT_CACHE_PREFIX}{hashlib.sha256(url.encode('utf-8')).hexdigest()}"
+
+    async def get(self, url: str) -> Optional[Dict]:
+        key = self._key(url)
+        # get(), not `in` + []: a TTLCache entry can expire between the two calls
+        article = self.local.get(key)
+        if article is not None:
+            return article
+        if self.failed.get(key):
+            return None
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, url))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._inflight.pop(key, None))
+        # shield: a cancelled request must not cancel the load other readers wait on
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str, url: str) -> Optional[Dict]:
+        article = await self.client.get(key)
+        if article is None:
+            # trafilatura download + parsing is blocking
+            article = await run_in_threadpool(extract_article, url)
+            if article is None:
+                self.failed[key] = True
+                return None
+            size = len(json.dumps(article, ensure_ascii=False).encode("utf-8"))
+            if size <= EXTRACT_CACHE_MAX_BYTES:
+                await self.client.set(key, article, EXTRACT_CACHE_TTL)
+            else:
+                logger.info(f"Extraction of {url} is {size} bytes, not stored in Redis")
+        self.local[key] = article
+        return article
+
+
+# Global extraction cache
+extraction_cache = ExtractionCache(redis_client)
 
 
 class ArticleService:
     """Xử lý và trích xuất thông tin bài báo"""
 
     @staticmethod
-    def extract_article(url: str) -> Optional[Dict]:
-        """Trích xuất toàn bộ thông tin bài báo từ URL"""
-        return extract_article(url)
+    async def extract_article(url: str) -> Optional[Dict]:
+        """Trích xuất toàn bộ thông tin bài báo từ URL (qua cache)"""
+        return await extraction_cache.get(url)
 
     @staticmethod
-    def get_article_summary(url: str, max_length: int = 200) -> Optional[str]:
+    async def get_article_summary(url: str, max_length: int = 200) -> Optional[str]:
         """Tạo bản tóm tắt ngắn của bài báo"""
-        article_data = extract_article(url)
+        article_data = await extraction_cache.get(url)
         if not article_data or not article_data["text"]:
             return None
 
@@ -79,9 +183,9 @@ class ArticleService:
         return summary
 
     @staticmethod
-    def get_article_metadata(url: str) -> Optional[Dict]:
+    async def get_article_metadata(url: str) -> Optional[Dict]:
         """Trích xuất metadata của bài báo"""
-        article_data = extract_article(url)
+        article_data = await extraction_cache.get(url)
         if not article_data:
             return None
 
@@ -92,10 +196,52 @@ class ArticleService:
         }
 
     @staticmethod
-    def get_article_images(url: str) -> Optional[List[str]]:
+    async def get_article_images(url: str) -> Optional[List[str]]:
         """Trích xuất danh sách hình ảnh từ bài báo"""
-        article_data = extract_article(url)
+        article_data = await extraction_cache.get(url)
         if not article_data:
             return None
 
-        return article_data["images"]
\ No newline at end of file
+        return article_data["images"]
+
+
+def _parse_two_pass(html: str, url: Optional[str] = None) -> Optional[Dict]:
+    """Cách cũ (markdown + json metadata, phân tích HTML hai lần), chỉ dùng để so sánh"""
+    markdown_content = trafilatura.extract(html, url=url, output_format="markdown",
+                                           include_images=True, include_links=True)
+    metadata_json = trafilatura.extract(html, url=url, output_format="json",
+                                        with_metadata=True, include_images=True)
+    if not markdown_content or not metadata_json:
+        return None
+    return {"text": markdown_content, **json.loads(metadata_json)}
+
+
+def benchmark(corpus_dir: str, runs: int = 3) -> None:
+    """Đo pages/sec và bộ nhớ đỉnh trên thư mục các trang HTML đã lưu"""
+    pages = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(corpus_dir, name), "r", encoding="utf-8", errors="replace") as f:
+                pages.append(f.read())
+    if not pages:
+        print(f"Không có file .html trong {corpus_dir}")
+        return
+
+    for label, parse in (("single-pass", parse_article), ("two-pass", _parse_two_pass)):
+        tracemalloc.start()
+        started = time.perf_counter()
+        extracted = 0
+        for _ in range(runs):
+            extracted += sum(1 for html in pages if parse(html) is not None)
+        seconds = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{label}: {len(pages) * runs / seconds:.1f} pages/sec, "
+              f"peak {peak / 1024 / 1024:.1f} MiB, {extracted}/{len(pages) * runs} extracted")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "bench":
+        benchmark(sys.argv[2])
+    else:
+        print("Usage: python -m app.services.extract_service bench <html_dir>")
\ No newline at end of file
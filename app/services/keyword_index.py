@@ -0,0 +1,383 @@
+import asyncio
+import heapq
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from app.core.database import supabase
+from app.core.config import (
+    KEYWORD_INDEX_ENABLED, KEYWORD_INDEX_REFRESH_INTERVAL,
+    KEYWORD_INDEX_FULL_RELOAD_INTERVAL, KEYWORD_INDEX_PAGE_SIZE
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+LOOKUP_SIZE = 200  # article ids per `in_` when loading pub_date
+
+# (article_id, keyword_id) of the last article_keyword row loaded
+HighWaterMark = Tuple[int, int]
+
+
+def _contains(posting: array, article_id: int) -> bool:
+    i = bisect_left(posting, article_id)
+    return i < len(posting) and posting[i] == article_id
+
+
+def pub_timestamp(pub_date) -> float:
+    """pub_date as returned by PostgREST -> epoch seconds (0 if missing)"""
+    if not pub_date:
+        return 0.0
+    try:
+        return datetime.fromisoformat(str(pub_date).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+class _Tables:
+    """
+    The index data. Postings are sorted `array('q')` of article_id per
+    keyword_id; pub dates live in two parallel arrays sorted by article_id.
+    Rows are loaded in (article_id, keyword_id) order, so these only ever
+    grow by appending.
+
+    `by_date` holds the same postings ordered by (pub_ts, article_id), for
+    newest-first merges. A full load sorts them once at the end (`sort_by_date`);
+    after that each new posting is appended, or inserted in place when its
+    article is older than the keyword's newest one.
+    """
+
+    def __init__(self):
+        self.postings: Dict[int, array] = {}
+        self.by_date: Dict[int, array] = {}
+        self.article_ids = array("q")
+        self.pub_ts = array("d")
+        self.postings_count = 0
+        self.high_water: HighWaterMark = (0, 0)
+        self.date_sorted = False
+
+    def apply(self, rows: List[dict], pub_dates: Dict[int, str]) -> None:
+        for row in rows:
+            article_id, keyword_id = row["article_id"], row["keyword_id"]
+            if not self.article_ids or self.article_ids[-1] < article_id:
+                self.article_ids.append(article_id)
+                self.pub_ts.append(pub_timestamp(pub_dates.get(article_id)))
+            posting = self.postings.get(keyword_id)
+            if posting is None:
+                posting = self.postings[keyword_id] = array("q")
+            if not posting or posting[-1] < article_id:
+                posting.append(article_id)
+                self.postings_count += 1
+                if self.date_sorted:
+                    self._insert_by_date(keyword_id, article_id)
+            self.high_water = (article_id, keyword_id)
+
+    def _insert_by_date(self, keyword_id: int, article_id: int) -> None:
+        ids = self.by_date.get(keyword_id)
+        if ids is None:
+            ids = self.by_date[keyword_id] = array("q")
+        key = self.date_key(article_id)
+        if not ids or self.date_key(ids[-1]) <= key:
+            ids.append(article_id)
+        else:
+            ids.insert(bisect_right(ids, key, key=self.date_key), article_id)
+
+    def sort_by_date(self) -> None:
+        """Build `by_date` from `postings` in one pass (used after a full load)"""
+        order = sorted(range(len(self.article_ids)), key=lambda i: (self.pub_ts[i], self.article_ids[i]))
+        rank = {self.article_ids[i]: r for r, i in enumerate(order)}
+        self.by_date = {keyword_id: array("q", sorted(posting, key=rank.__getitem__))
+                        for keyword_id, posting in self.postings.items()}
+        self.date_sorted = True
+
+    def pub_ts_of(self, article_id: int) -> Optional[float]:
+        i = bisect_left(self.article_ids, article_id)
+        if i < len(self.article_ids) and self.article_ids[i] == article_id:
+            return self.pub_ts[i]
+        return None
+
+    def date_key(self, article_id: int) -> Tuple[float, int]:
+        return (self.pub_ts_of(article_id) or 0.0, article_id)
+
+    def newest(self, keyword_id: int, before: Optional[Tuple[float, int]] = None) -> Iterator[Tuple[float, int]]:
+        """(pub_ts, article_id) of a keyword's articles, newest first, strictly older than `before`"""
+        ids = self.by_date.get(keyword_id)
+        if not ids:
+            return
+        end = len(ids) if before is None else bisect_left(ids, before, key=self.date_key)
+        for i in range(end - 1, -1, -1):
+            yield self.date_key(ids[i])
+
+    def memory_bytes(self) -> int:
+        return (
+            sys.getsizeof(self.postings)
+            + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in self.postings.items())
+            + sys.getsizeof(self.by_date)
+            + sum(sys.getsizeof(v) for v in self.by_date.values())
+            + sys.getsizeof(self.article_ids)
+            + sys.getsizeof(self.pub_ts)
+        )
+
+
+class KeywordIndex:
+    """
+    In-process inverted index keyword_id -> article ids over `article_keyword`,
+    with article_id -> pub_date, so by-keywords and related-articles queries
+    (union, intersection, newest-k, most-matched-k) never scan article_keyword
+    over the network.
+
+    `refresh()` loads rows after the high-water mark (article_id, keyword_id).
+    Rows that show up below the mark later (e.g. articles re-processed by the
+    keyword extractor's retry list) are picked up by the periodic full reload.
+    """
+
+    def __init__(self, page_size: int = KEYWORD_INDEX_PAGE_SIZE,
+                 full_reload_interval: float = KEYWORD_INDEX_FULL_RELOAD_INTERVAL):
+        self.page_size = page_size
+        self.full_reload_interval = full_reload_interval
+        self._tables: Optional[_Tables] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.last_refresh: Optional[dict] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._tables is not None
+
+    # ---- Loading ----
+
+    def _fetch_page(self, tables: _Tables) -> Tuple[List[dict], Dict[int, str]]:
+        """
+        One page of article_keyword rows after the high-water mark of `tables`,
+        with pub_date of the articles the index does not have yet
+        """
+        article_id, keyword_id = tables.high_water
+        rows = supabase.table("article_keyword") \
+                       .select("article_id,keyword_id") \
+                       .or_(f"article_id.gt.{article_id},"
+                            f"and(article_id.eq.{article_id},keyword_id.gt.{keyword_id})") \
+                       .order("article_id").order("keyword_id") \
+                       .limit(self.page_size) \
+                       .execute().data
+
+        last_loaded = tables.article_ids[-1] if tables.article_ids else 0
+        new_ids = sorted({row["article_id"] for row in rows if row["article_id"] > last_loaded})
+        pub_dates: Dict[int, str] = {}
+        for i in range(0, len(new_ids), LOOKUP_SIZE):
+            res = supabase.table("article") \
+                          .select("article_id,pub_date") \
+                          .in_("article_id", new_ids[i:i + LOOKUP_SIZE]) \
+                          .execute()
+            pub_dates.update((row["article_id"], row["pub_date"]) for row in res.data)
+        return rows, pub_dates
+
+    def _build(self) -> _Tables:
+        """Full load; pages are applied as they arrive, so peak memory is the index plus one page"""
+        tables = _Tables()
+        while True:
+            rows, pub_dates = self._fetch_page(tables)
+            tables.apply(rows, pub_dates)
+            if len(rows) < self.page_size:
+                tables.sort_by_date()
+                return tables
+
+    async def refresh(self, full: bool = False) -> dict:
+        """Load new article_keyword rows (or everything when full / not loaded yet)"""
+        async with self._lock:
+            started = time.perf_counter()
+            full = full or self._tables is None \
+                or time.monotonic() - self._loaded_at > self.full_reload_interval
+            if full:
+                # Build off the event loop, then swap in one assignment
+                self._tables = await asyncio.to_thread(self._build)
+                self._loaded_at = time.monotonic()
+                added = self._tables.postings_count
+            else:
+                tables = self._tables
+                before = tables.postings_count
+                while True:
+                    rows, pub_dates = await asyncio.to_thread(self._fetch_page, tables)
+                    # Applied on the event loop so readers never see half-appended arrays
+                    tables.apply(rows, pub_dates)
+                    if len(rows) < self.page_size:
+                        break
+                added = tables.postings_count - before
+
+            self.last_refresh = {
+                "full": full,
+                "postings_added": added,
+                "seconds": round(time.perf_counter() - started, 3),
+                "at": datetime.now().isoformat()
+            }
+            logger.info(f"Keyword index refreshed: {self.last_refresh}")
+            return self.last_refresh
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Keyword index refresh failed: {e}")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float = KEYWORD_INDEX_REFRESH_INTERVAL) -> None:
+        """Start the background refresh loop (first iteration does the full load)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ---- Queries ----
+
+    def postings(self, keyword_id: int) -> array:
+        return self._tables.postings.get(keyword_id, array("q"))
+
+    def union(self, keyword_ids: Iterable[int]) -> set:
+        result = set()
+        for keyword_id in keyword_ids:
+            result.update(self.postings(keyword_id))
+        return result
+
+    def intersection(self, keyword_ids: Iterable[int]) -> set:
+        lists = sorted((self.postings(kid) for kid in keyword_ids), key=len)
+        if not lists:
+            return set()
+        result = set(lists[0])
+        for posting in lists[1:]:
+            result.intersection_update(posting)
+            if not result:
+                break
+        return result
+
+    def match_counts(self, keyword_ids: Iterable[int]) -> Counter:
+        """article_id -> number of the given keywords it is tagged with"""
+        counts = Counter()
+        for keyword_id in keyword_ids:
+            counts.update(self.postings(keyword_id))
+        return counts
+
+    def top_by_date(self, keyword_ids: List[int], limit: int, offset: int = 0,
+                    before: Optional[Tuple[float, int]] = None,
+                    exclude_article_id: Optional[int] = None,
+                    match_all: bool = False, count: bool = True) -> Tuple[List[int], Optional[int]]:
+        """
+        Newest `limit` article ids (after skipping `offset`, or strictly older
+        than `before` = (pub_ts, article_id)) tagged with any / all of
+        keyword_ids. Returns (ids, number of matching articles, or None
+        unless `count`).
+
+        The date-ordered postings are merged newest first and the merge stops
+        after offset + limit articles, so only those (plus duplicates across
+        keywords) are visited. Counting is a set union / intersection over
+        all candidates; skip it when the total is not shown (cursor pages).
+        """
+        tables = self._tables
+        keyword_ids = list(dict.fromkeys(keyword_ids))
+        wanted = offset + limit
+        ids: List[int] = []
+        if keyword_ids and wanted > 0:
+            if match_all:
+                # Walk the rarest keyword, keep articles every other keyword has
+                rarest = min(keyword_ids, key=lambda kid: len(self.postings(kid)))
+                others = [self.postings(kid) for kid in keyword_ids if kid != rarest]
+                merged = (key for key in tables.newest(rarest, before)
+                          if all(_contains(posting, key[1]) for posting in others))
+            else:
+                merged = heapq.merge(*(tables.newest(kid, before) for kid in keyword_ids), reverse=True)
+            last = None
+            for key in merged:
+                # An article tagged with several of the keywords comes up once per keyword, back to back
+                if key == last or key[1] == exclude_article_id:
+                    continue
+                last = key
+                ids.append(key[1])
+                if len(ids) == wanted:
+                    break
+
+        total = None
+        if count:
+            if len(keyword_ids) == 1:
+                posting = self.postings(keyword_ids[0])
+                total = len(posting) - (1 if exclude_article_id is not None
+                                        and _contains(posting, exclude_article_id) else 0)
+            else:
+                candidates = self.intersection(keyword_ids) if match_all else self.union(keyword_ids)
+                candidates.discard(exclude_article_id)
+                total = len(candidates)
+        return ids[offset:], total
+
+    def top_by_relevance(self, keyword_ids: List[int], limit: int, offset: int = 0,
+                         exclude_article_id: Optional[int] = None) -> Tuple[List[int], int]:
+        """Article ids ordered by matched keywords, then newest first. Returns (ids, total)."""
+        tables = self._tables
+        counts = self.match_counts(keyword_ids)
+        counts.pop(exclude_article_id, None)
+        top = heapq.nlargest(
+            offset + limit,
+            ((n, tables.pub_ts_of(aid) or 0.0, aid) for aid, n in counts.items())
+        )
+        return [aid for _, _, aid in top[offset:]], len(counts)
+
+    def stats(self) -> dict:
+        if self._tables is None:
+            return {"ready": False, "last_refresh": self.last_refresh}
+        tables = self._tables
+        memory = tables.memory_bytes()
+        return {
+            "ready": True,
+            "keywords": len(tables.postings),
+            "articles": len(tables.article_ids),
+            "postings": tables.postings_count,
+            "memory_bytes": memory,
+            "bytes_per_million_postings": round(memory / tables.postings_count * 1_000_000)
+            if tables.postings_count else None,
+            "high_water": list(tables.high_water),
+            "last_refresh": self.last_refresh
+        }
+
+
+# Global index instance; only started when KEYWORD_INDEX_ENABLED
+keyword_index = KeywordIndex()
+
+
+def benchmark(keyword_names: List[str], page_size: int = 20, runs: int = 20) -> None:
+    """Compare one by-keywords page from the index against the Supabase join"""
+    from app.services.recommend_service import RecommendService
+
+    async def _bench():
+        await keyword_index.refresh(full=True)
+        print(keyword_index.stats())
+        kw_ids = [row["keyword_id"] for row in supabase.table("keyword")
+                  .select("keyword_id").in_("keyword_name", keyword_names).execute().data]
+
+        started = time.perf_counter()
+        for _ in range(runs):
+            keyword_index.top_by_date(kw_ids, page_size + 1)
+        index_ms = (time.perf_counter() - started) / runs * 1000
+
+        started = time.perf_counter()
+        for _ in range(runs):
+            RecommendService._keyword_articles_query(kw_ids) \
+                .order("pub_date", desc=True).limit(page_size + 1).execute()
+        db_ms = (time.perf_counter() - started) / runs * 1000
+        print(f"index: {index_ms:.3f} ms/query (ids only), supabase join: {db_ms:.1f} ms/query")
+
+    asyncio.run(_bench())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "bench":
+        benchmark(sys.argv[2].split(","))
+    else:
+        print("Usage: python -m app.services.keyword_index bench <keyword1,keyword2,...>")
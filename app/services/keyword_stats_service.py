@@ -0,0 +1,148 @@
+import math
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from app.core.redis import RedisClient, redis_client
+from app.core.config import (
+    CACHE_TTL_HOT_KEYWORDS, HOT_KEYWORDS_WINDOW_DAYS, HOT_KEYWORDS_DECAY,
+    KEYWORD_COOC_MIN_COUNT, KEYWORD_COOC_MAX_NEIGHBOURS
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Keys written by craw_data_service/keyword_stats.py
+HOT_KEYWORDS_DAY_KEY = "hot_keywords:day:{day}"
+HOT_KEYWORDS_NAMES_KEY = "hot_keywords:names"
+HOT_KEYWORDS_WINDOW_KEY = "hot_keywords:window:"
+KEYWORD_COOC_KEY = "kw_cooc:{keyword_id}"
+KEYWORD_COOC_DF_KEY = "kw_cooc:df"
+KEYWORD_COOC_ARTICLES_KEY = "kw_cooc:articles"
+
+COOC_SCORINGS = ("count", "pmi", "jaccard")
+
+
+class HotKeywordLeaderboard:
+    """
+    Reads the hot-keywords leaderboard the keyword extractor maintains as one
+    Redis sorted set per day. The window (last N days, each day weighted by
+    decay ** age) is materialized with ZUNIONSTORE once per cache TTL, so a
+    request is a single O(log n + limit) ZREVRANGE.
+    """
+
+    def __init__(self, client: RedisClient, window_days: int = HOT_KEYWORDS_WINDOW_DAYS,
+                 decay: float = HOT_KEYWORDS_DECAY):
+        self.client = client
+        self.window_days = window_days
+        self.decay = decay
+
+    def _window_key(self, today: str) -> str:
+        return f"{HOT_KEYWORDS_WINDOW_KEY}{self.window_days}:{self.decay}:{today}"
+
+    async def _materialize(self, window_key: str, now: datetime) -> None:
+        weights = {}
+        for age in range(self.window_days):
+            day = (now - timedelta(days=age)).strftime("%Y%m%d")
+            weights[HOT_KEYWORDS_DAY_KEY.format(day=day)] = self.decay ** age
+        await self.client.redis.zunionstore(window_key, weights)
+        await self.client.redis.expire(window_key, CACHE_TTL_HOT_KEYWORDS)
+
+    async def top(self, limit: int = 50) -> Optional[List[dict]]:
+        """Top keywords by (decayed) article count, None if the leaderboard is empty or unavailable"""
+        try:
+            now = datetime.now(timezone.utc)
+            window_key = self._window_key(now.strftime("%Y%m%d"))
+            if not await self.client.redis.exists(window_key):
+                await self._materialize(window_key, now)
+
+            top = await self.client.redis.zrevrange(window_key, 0, limit - 1, withscores=True)
+            if not top:
+                return None
+
+            names = await self.client.redis.hmget(HOT_KEYWORDS_NAMES_KEY, [kid for kid, _ in top])
+            return [
+                {"keyword_id": int(kid), "keyword_name": name, "count": score}
+                for (kid, score), name in zip(top, names) if name
+            ]
+        except Exception as e:
+            logger.warning(f"Hot keywords leaderboard unavailable: {e}")
+            return None
+
+    async def invalidate(self) -> int:
+        """Drop materialized windows so the next read recomputes them"""
+        return await self.client.delete_pattern(f"{HOT_KEYWORDS_WINDOW_KEY}*")
+
+
+class KeywordCooccurrence:
+    """
+    Reads the keyword co-occurrence sets the keyword extractor maintains
+    (neighbours per keyword with shared-article counts, plus per-keyword
+    article counts), so related keywords are one pipelined Redis read.
+
+    Scoring:
+      count   - articles shared with the keyword
+      pmi     - log(count * N / (df_a * df_b)), favours specific neighbours
+      jaccard - count / (df_a + df_b - count)
+    """
+
+    def __init__(self, client: RedisClient, min_count: int = KEYWORD_COOC_MIN_COUNT,
+                 max_neighbours: int = KEYWORD_COOC_MAX_NEIGHBOURS):
+        self.client = client
+        self.min_count = min_count
+        self.max_neighbours = max_neighbours
+
+    @staticmethod
+    def _score(scoring: str, count: float, df_a: float, df_b: float, total: float) -> float:
+        if scoring == "pmi":
+            return math.log(count * total / (df_a * df_b)) if df_a and df_b and total else 0.0
+        if scoring == "jaccard":
+            union = df_a + df_b - count
+            return count / union if union > 0 else 0.0
+        return count
+
+    async def related(self, keyword_id: int, limit: int = 20,
+                      scoring: str = "count") -> Optional[List[dict]]:
+        """Neighbours of keyword_id ranked by `scoring`, None if no data is available"""
+        if scoring not in COOC_SCORINGS:
+            raise ValueError(f"Unknown scoring: {scoring}")
+        try:
+            redis = self.client.redis
+            key = KEYWORD_COOC_KEY.format(keyword_id=keyword_id)
+            # Raw counts only need the head of the set; PMI/Jaccard rerank the top max_neighbours
+            end = limit - 1 if scoring == "count" else self.max_neighbours - 1
+            neighbours = await redis.zrevrange(key, 0, end, withscores=True)
+            if not neighbours:
+                return None
+            neighbours = [(kid, score) for kid, score in neighbours if score >= self.min_count] \
+                or neighbours[:limit]
+
+            ids = [kid for kid, _ in neighbours]
+            pipe = redis.pipeline(transaction=False)
+            pipe.hmget(HOT_KEYWORDS_NAMES_KEY, ids)
+            pipe.hmget(KEYWORD_COOC_DF_KEY, [str(keyword_id)] + ids)
+            pipe.get(KEYWORD_COOC_ARTICLES_KEY)
+            names, dfs, total = await pipe.execute()
+
+            df_a = float(dfs[0] or 0)
+            total = float(total or 0)
+            related = []
+            for (kid, count), name, df_b in zip(neighbours, names, dfs[1:]):
+                if not name:
+                    continue
+                related.append({
+                    "keyword_id": int(kid),
+                    "keyword_name": name,
+                    "count": int(count),
+                    "score": self._score(scoring, count, df_a, float(df_b or 0), total)
+                })
+            related.sort(key=lambda kw: kw["score"], reverse=True)
+            return related[:limit] or None
+        except Exception as e:
+            logger.warning(f"Keyword co-occurrence unavailable: {e}")
+            return None
+
+
+# Global leaderboard instance
+hot_keyword_leaderboard = HotKeywordLeaderboard(redis_client)
+
+# Global co-occurrence reader
+keyword_cooccurrence = KeywordCooccurrence(redis_client)
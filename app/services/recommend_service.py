@@ -1,14 +1,44 @@
-from typing import List
-from app.core.database import supabase
+import asyncio
+import time
+from collections import defaultdict
+from typing import List, Optional
+from app.core.database import run_query, supabase
+from app.core.pagination import apply_keyset, decode_cursor, next_cursor
+from app.core.cache import cache
+from app.services.keyword_stats_service import hot_keyword_leaderboard, keyword_cooccurrence
+from app.core.config import CACHE_TTL_HOT_ARTICLES, CACHE_STALE_TTL_HOT_ARTICLES, COUNT_MODE_HOT_ARTICLES, COUNT_MODE_KEYWORDS
+from app.core.config import CACHE_TTL_RELATED_KEYWORDS, RELATED_KEYWORDS_BUDGET_MS, RELATED_KEYWORDS_PER_KEYWORD
+from app.services.count_service import count_service
+from app.services.keyword_index import keyword_index, pub_timestamp
 import logging
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+HOT_ARTICLES_CACHE_PREFIX = "hot_articles:"
+RELATED_KEYWORDS_CACHE_PREFIX = "related_keywords:"
+
+ARTICLE_COLUMNS = "article_id, title, link, image_url, description, pub_date, rss_id"
+
 class RecommendService:
     @staticmethod
-    async def get_hot_articles(page: int = 1, page_size: int = 20) -> dict:
-        """Get hot articles without caching"""
+    async def get_hot_articles(page: int = 1, page_size: int = 20,
+                               cursor: Optional[str] = None) -> dict:
+        """Get hot articles through the read-through cache"""
+        if cursor:
+            cache_key = f"{HOT_ARTICLES_CACHE_PREFIX}c:{cursor}:{page_size}"
+        else:
+            cache_key = f"{HOT_ARTICLES_CACHE_PREFIX}{page}:{page_size}"
+        return await cache.get_or_load(
+            cache_key,
+            lambda: RecommendService._load_hot_articles(page, page_size, cursor),
+            ttl=CACHE_TTL_HOT_ARTICLES,
+            stale_ttl=CACHE_STALE_TTL_HOT_ARTICLES
+        )
+
+    @staticmethod
+    async def _load_hot_articles(page: int, page_size: int, cursor: Optional[str] = None) -> dict:
+        """Query hot articles from database (offset mode, or keyset mode when cursor is given)"""
         try:
             # Calculate offset
             offset = (page - 1) * page_size
@@ -27,18 +57,32 @@ class RecommendService:
                 pub_date,
                 rss_id
             """
-            ).lte("pub_date", today).order("pub_date", desc=True).range(offset, offset + page_size - 1)
-
-            result = query.execute()
-
-            # Get total count with date filter
-            count_result = supabase.table("article").select("article_id", count="exact").lte("pub_date", today).execute()
-            total = count_result.count
+            ).lte("pub_date", today)
+            query = apply_keyset(query, cursor)
+            if cursor:
+                query = query.limit(count_service.page_limit(page_size))
+            else:
+                query = query.range(offset, offset + count_service.page_limit(page_size) - 1)
+
+            # Page and total count (cached/estimated per COUNT_MODE_HOT_ARTICLES) run concurrently
+            result, total = await asyncio.gather(
+                run_query(query),
+                count_service.get_total(
+                    f"hot_articles:{today}",
+                    lambda method: supabase.table("article")
+                                           .select("article_id", count=method, head=True)
+                                           .lte("pub_date", today),
+                    mode=COUNT_MODE_HOT_ARTICLES
+                )
+            )
+            articles, has_more = count_service.trim_page(result.data, page_size)
 
             response_data = {
-                "articles": result.data,
+                "articles": articles,
                 "total": total,
-                "page": page,
+                "has_more": has_more,
+                "next_cursor": next_cursor(articles, has_more),
+                "page": None if cursor else page,
                 "page_size": page_size
             }
 
@@ -51,43 +95,33 @@ class RecommendService:
 
     @staticmethod
     async def get_hot_keywords(limit: int = 50) -> dict:
-        """Get hot keywords without caching"""
+        """
+        Get hot keywords from the Redis leaderboard, falling back to the
+        `get_hot_keywords` RPC, which counts, orders and limits server-side:
+
+            create or replace function get_hot_keywords(limit_count int)
+            returns table (keyword_id bigint, keyword_name text, count bigint)
+            language sql stable as $$
+                select k.keyword_id, k.keyword_name, count(*) as count
+                from article_keyword ak
+                join keyword k on k.keyword_id = ak.keyword_id
+                group by k.keyword_id, k.keyword_name
+                order by count desc
+                limit limit_count
+            $$;
+
+        An empty leaderboard is refilled with
+        `python article_keyword_systemd.py rebuild-hot-keywords`.
+        """
         try:
-            # Query hot keywords from database using RPC
-            query = supabase.rpc("get_hot_keywords", {"limit_count": limit})
-            result = query.execute()
-
-            # Nếu function không tồn tại, dùng query thông thường
-            if not result.data:
-                # Fallback query
-                query = supabase.table("keyword").select(
-                    """
-                    keyword_id,
-                    keyword_name,
-                    article_keyword!inner(article_id)
-                """
-                ).limit(limit)
-                result = query.execute()
-
-                # Process data to count articles per keyword
-                keyword_counts = {}
-                for item in result.data:
-                    keyword_id = item['keyword_id']
-                    if keyword_id not in keyword_counts:
-                        keyword_counts[keyword_id] = {
-                            'keyword_id': keyword_id,
-                            'keyword_name': item['keyword_name'],
-                            'count': 0
-                        }
-                    keyword_counts[keyword_id]['count'] += 1
-
-                # Sort by count and take top keywords
-                sorted_keywords = sorted(keyword_counts.values(),
-                                         key=lambda x: x['count'], reverse=True)[:limit]
-                keywords_data = [{'keyword_id': k['keyword_id'],
-                                  'keyword_name': k['keyword_name']} for k in sorted_keywords]
-            else:
-                keywords_data = result.data
+            keywords_data = await hot_keyword_leaderboard.top(limit)
+            if keywords_data:
+                logger.info("Hot keywords retrieved from leaderboard")
+                return {"keywords": keywords_data, "total": len(keywords_data)}
+
+            logger.warning("Hot keywords leaderboard is empty, using the get_hot_keywords RPC")
+            result = await run_query(supabase.rpc("get_hot_keywords", {"limit_count": limit}))
+            keywords_data = result.data or []
 
             response_data = {
                 "keywords": keywords_data,
@@ -103,74 +137,202 @@ class RecommendService:
 
     @staticmethod
     async def reset_recommendation_cache() -> dict:
-        """Stub method (no cache used)"""
-        logger.info("No cache to reset in this version.")
+        """Invalidate cached recommendation results"""
+        deleted = await cache.invalidate(HOT_ARTICLES_CACHE_PREFIX)
+        deleted += await count_service.invalidate("hot_articles:")
+        deleted += await hot_keyword_leaderboard.invalidate()
+        deleted += await cache.invalidate(RELATED_KEYWORDS_CACHE_PREFIX)
         return {
             "success": True,
-            "message": "No cache used; nothing to reset."
+            "message": f"Recommendation cache cleared ({deleted} keys)."
+        }
+
+    @staticmethod
+    def _keyword_articles_query(keyword_ids: List[int], exclude_article_id: Optional[int] = None,
+                                count: Optional[str] = None):
+        """
+        Articles tagged with any of keyword_ids. The join with article_keyword
+        runs server-side (inner embed), so each article comes back once and no
+        id list is pulled into Python.
+        """
+        if count:
+            query = supabase.table("article") \
+                            .select("article_id, article_keyword!inner(keyword_id)", count=count, head=True)
+        else:
+            query = supabase.table("article") \
+                            .select(f"{ARTICLE_COLUMNS}, article_keyword!inner(keyword_id)")
+        query = query.in_("article_keyword.keyword_id", keyword_ids)
+        if exclude_article_id is not None:
+            query = query.neq("article_id", exclude_article_id)
+        return query
+
+    @staticmethod
+    async def _keyword_articles_page(keyword_ids: List[int], page: int, page_size: int,
+                                     cursor: Optional[str] = None,
+                                     exclude_article_id: Optional[int] = None) -> dict:
+        """Page of articles tagged with any of keyword_ids, newest first (offset or keyset)"""
+        query = apply_keyset(
+            RecommendService._keyword_articles_query(keyword_ids, exclude_article_id), cursor
+        )
+        if cursor:
+            query = query.limit(count_service.page_limit(page_size))
+        else:
+            offset = (page - 1) * page_size
+            query = query.range(offset, offset + count_service.page_limit(page_size) - 1)
+
+        total = None
+        if cursor:
+            result = await run_query(query)
+        else:
+            ids_key = ",".join(str(kid) for kid in sorted(keyword_ids))
+            result, total = await asyncio.gather(
+                run_query(query),
+                count_service.get_total(
+                    f"by_keywords:{ids_key}:{exclude_article_id or ''}",
+                    lambda method: RecommendService._keyword_articles_query(
+                        keyword_ids, exclude_article_id, count=method
+                    ),
+                    mode=COUNT_MODE_KEYWORDS
+                )
+            )
+
+        rows, has_more = count_service.trim_page(result.data, page_size)
+        articles = [{k: v for k, v in row.items() if k != "article_keyword"} for row in rows]
+
+        return {
+            "articles": articles,
+            "total": total,
+            "has_more": has_more,
+            "next_cursor": next_cursor(articles, has_more),
+            "page": None if cursor else page,
+            "page_size": page_size
+        }
+
+    @staticmethod
+    async def _ranked_keyword_articles_page(keyword_ids: List[int], page: int, page_size: int,
+                                            exclude_article_id: Optional[int] = None) -> dict:
+        """
+        Page of articles ordered by the number of matched keywords, then newest
+        first. Ranking happens in the database, in one call to:
+
+            create function articles_by_keywords_ranked(
+                p_keyword_ids bigint[], p_exclude_article_id bigint,
+                p_limit int, p_offset int)
+            returns table (article_id bigint, title text, link text, image_url text,
+                           description text, pub_date timestamptz, rss_id bigint,
+                           matched_keywords bigint)
+            language sql stable as $$
+                select a.article_id, a.title, a.link, a.image_url, a.description,
+                       a.pub_date, a.rss_id, m.matched_keywords
+                from (select ak.article_id, count(*) as matched_keywords
+                      from article_keyword ak
+                      where ak.keyword_id = any(p_keyword_ids)
+                        and ak.article_id is distinct from p_exclude_article_id
+                      group by ak.article_id) m
+                join article a on a.article_id = m.article_id
+                order by m.matched_keywords desc, a.pub_date desc, a.article_id desc
+                limit p_limit offset p_offset
+            $$;
+        """
+        offset = (page - 1) * page_size
+        result = await run_query(supabase.rpc("articles_by_keywords_ranked", {
+            "p_keyword_ids": keyword_ids,
+            "p_exclude_article_id": exclude_article_id,
+            "p_limit": count_service.page_limit(page_size),
+            "p_offset": offset
+        }))
+
+        articles, has_more = count_service.trim_page(result.data, page_size)
+        return {
+            "articles": articles,
+            "total": None,
+            "has_more": has_more,
+            "next_cursor": None,
+            "page": page,
+            "page_size": page_size
         }
 
+    @staticmethod
+    async def _indexed_keyword_articles_page(keyword_ids: List[int], page: int, page_size: int,
+                                             cursor: Optional[str], sort: str,
+                                             exclude_article_id: Optional[int] = None) -> dict:
+        """Pick the page from the in-process keyword index, then load just those articles"""
+        limit = count_service.page_limit(page_size)
+        offset = 0 if cursor else (page - 1) * page_size
+        if sort == "relevance" and not cursor:
+            ids, total = keyword_index.top_by_relevance(keyword_ids, limit, offset, exclude_article_id)
+        else:
+            before = None
+            if cursor:
+                pub_date, last_id = decode_cursor(cursor)
+                before = (pub_timestamp(pub_date), last_id)
+            ids, total = keyword_index.top_by_date(keyword_ids, limit, offset, before, exclude_article_id,
+                                                   count=not cursor)
+
+        page_ids, has_more = count_service.trim_page(ids, page_size)
+        rows = {}
+        if page_ids:
+            res = await run_query(supabase.table("article").select(ARTICLE_COLUMNS).in_("article_id", page_ids))
+            rows = {row["article_id"]: row for row in res.data}
+        articles = [rows[aid] for aid in page_ids if aid in rows]
+
+        return {
+            "articles": articles,
+            "total": None if cursor else total,
+            "has_more": has_more,
+            "next_cursor": next_cursor(articles, has_more) if sort == "date" or cursor else None,
+            "page": None if cursor else page,
+            "page_size": page_size
+        }
+
+    @staticmethod
+    async def _articles_for_keyword_ids(keyword_ids: List[int], page: int, page_size: int,
+                                        cursor: Optional[str], sort: str,
+                                        exclude_article_id: Optional[int] = None) -> dict:
+        if keyword_index.ready:
+            return await RecommendService._indexed_keyword_articles_page(
+                keyword_ids, page, page_size, cursor, sort, exclude_article_id
+            )
+        if sort == "relevance" and not cursor:
+            try:
+                return await RecommendService._ranked_keyword_articles_page(
+                    keyword_ids, page, page_size, exclude_article_id
+                )
+            except Exception as e:
+                # RPC chưa được tạo hoặc lỗi: quay về sắp xếp theo ngày
+                logger.warning(f"Ranked keyword query failed, falling back to date order: {e}")
+        return await RecommendService._keyword_articles_page(
+            keyword_ids, page, page_size, cursor, exclude_article_id
+        )
+
     @staticmethod
     async def get_articles_by_keywords(keywords: List[str],
                                        page: int = 1,
-                                       page_size: int = 20) -> dict:
+                                       page_size: int = 20,
+                                       cursor: Optional[str] = None,
+                                       sort: str = "date") -> dict:
         """
-        Recommend articles by a list of keyword names, sorted by pub_date desc.
-        - keywords: list of keyword_name (1–10 items)
+        Recommend articles by a list of keyword names.
+        - keywords: list of keyword_name (1–25 items)
         - page, page_size: pagination
+        - cursor: keyset pagination (takes precedence over page)
+        - sort: "date" (pub_date desc) or "relevance" (matched keywords desc, then pub_date desc)
         """
         try:
             # 1) Lấy keyword_id
-            kw_res = supabase.table("keyword") \
-                              .select("keyword_id") \
-                              .in_("keyword_name", keywords) \
-                              .execute()
+            kw_res = await run_query(supabase.table("keyword")
+                                              .select("keyword_id")
+                                              .in_("keyword_name", keywords))
             kw_ids = [row["keyword_id"] for row in kw_res.data]
             if not kw_ids:
-                return {"articles": [], "total": 0, "page": page, "page_size": page_size}
-
-            # 2) Lấy danh sách article_id chứa ít nhất 1 trong kw_ids
-            ak_res = supabase.table("article_keyword") \
-                             .select("article_id") \
-                             .in_("keyword_id", kw_ids) \
-                             .execute()
-            article_ids = list({row["article_id"] for row in ak_res.data})
-            total = len(article_ids)
-
-            if total == 0:
-                return {"articles": [], "total": 0, "page": page, "page_size": page_size}
-
-            # 3) Phân trang
-            start = (page - 1) * page_size
-            end = start + page_size
-            page_ids = article_ids[start:end]
-            if not page_ids:
-                return {"articles": [], "total": total, "page": page, "page_size": page_size}
-
-            # 4) Lấy chi tiết bài viết, sắp xếp theo pub_date desc
-            art_res = supabase.table("article") \
-                              .select(
-                                  """
-                                      article_id,
-                                      title,
-                                      link,
-                                      image_url,
-                                      description,
-                                      pub_date,
-                                      rss_id
-                                  """
-                              ) \
-                              .in_("article_id", page_ids) \
-                              .order("pub_date", desc=True) \
-                              .execute()
-
-            response = {
-                "articles": art_res.data,
-                "total": total,
-                "page": page,
-                "page_size": page_size
-            }
-            logger.info(f"Retrieved {len(art_res.data)} articles by keywords {keywords}, sorted by date")
+                return {"articles": [], "total": 0, "has_more": False, "next_cursor": None,
+                        "page": None if cursor else page, "page_size": page_size}
+
+            # 2) Một truy vấn join article/article_keyword, sắp xếp và phân trang phía DB
+            response = await RecommendService._articles_for_keyword_ids(
+                kw_ids, page, page_size, cursor, sort
+            )
+            logger.info(f"Retrieved {len(response['articles'])} articles by keywords {keywords}, sorted by {sort}")
             return response
 
         except Exception as e:
@@ -178,39 +340,40 @@ class RecommendService:
             raise Exception(f"Failed to recommend by keywords: {e}")
 
     @staticmethod
-    async def get_related_keywords_by_keyword_name(keyword_name: str, limit: int = 20) -> dict:
+    async def get_related_keywords_by_keyword_name(keyword_name: str, limit: int = 20,
+                                                   scoring: str = "count") -> dict:
         """
         Lấy danh sách các keyword liên quan đến 1 keyword cho trước (theo tên):
         - Tìm keyword_id từ keyword_name
-        - Lấy tất cả article chứa keyword đó
-        - Lấy tất cả các keyword khác xuất hiện trong những article đó
-        - Loại bỏ chính keyword đầu vào, đếm tần suất và trả về top `limit`
+        - Đọc top hàng xóm từ ma trận đồng xuất hiện trong Redis (count/pmi/jaccard)
+        - Nếu Redis chưa có dữ liệu: đếm tần suất các keyword cùng xuất hiện từ DB
         """
         try:
             # 1) Lấy keyword_id tương ứng với keyword_name
-            kw_lookup = supabase.table("keyword") \
-                                .select("keyword_id") \
-                                .eq("keyword_name", keyword_name) \
-                                .single() \
-                                .execute()
+            kw_lookup = await run_query(supabase.table("keyword")
+                                                .select("keyword_id")
+                                                .eq("keyword_name", keyword_name)
+                                                .single())
             if not kw_lookup.data:
                 return {"keywords": []}
             keyword_id = kw_lookup.data["keyword_id"]
 
+            related = await keyword_cooccurrence.related(keyword_id, limit, scoring)
+            if related is not None:
+                return {"keywords": related, "scoring": scoring}
+
             # 2) Lấy tất cả article_id có chứa keyword_id này
-            ak_res = supabase.table("article_keyword") \
-                             .select("article_id") \
-                             .eq("keyword_id", keyword_id) \
-                             .execute()
+            ak_res = await run_query(supabase.table("article_keyword")
+                                             .select("article_id")
+                                             .eq("keyword_id", keyword_id))
             article_ids = [row["article_id"] for row in ak_res.data]
             if not article_ids:
                 return {"keywords": []}
 
             # 3) Lấy các keyword_id khác trong những article đó
-            co_ak_res = supabase.table("article_keyword") \
-                                .select("keyword_id") \
-                                .in_("article_id", article_ids) \
-                                .execute()
+            co_ak_res = await run_query(supabase.table("article_keyword")
+                                                .select("keyword_id")
+                                                .in_("article_id", article_ids))
 
             # Đếm tần suất
             freq: dict[int, int] = {}
@@ -228,10 +391,9 @@ class RecommendService:
             top_ids = [kid for kid, _ in top_kids]
 
             # 5) Lấy chi tiết tên keyword
-            kw_res = supabase.table("keyword") \
-                             .select("keyword_id, keyword_name") \
-                             .in_("keyword_id", top_ids) \
-                             .execute()
+            kw_res = await run_query(supabase.table("keyword")
+                                             .select("keyword_id, keyword_name")
+                                             .in_("keyword_id", top_ids))
 
             # Build result với count
             related = []
@@ -241,72 +403,117 @@ class RecommendService:
                     "keyword_name": kw["keyword_name"],
                     "count": freq.get(kw["keyword_id"], 0)
                 })
+            related.sort(key=lambda kw: kw["count"], reverse=True)
 
-            return {"keywords": related}
+            return {"keywords": related, "scoring": "count"}
 
         except Exception as e:
             logger.error(f"Error in get_related_keywords_by_keyword_name: {e}")
             raise Exception(f"Failed to get related keywords by name: {e}")
 
+    @staticmethod
+    async def get_related_keywords_by_article(article_id: int, limit: int = 20) -> dict:
+        """
+        Keywords of an article plus neighbouring keywords weighted by co-occurrence.
+        Complete results are cached; a result cut short by the latency budget or
+        missing co-occurrence data is returned with partial=True and not cached,
+        so the next call retries.
+        """
+        try:
+            return await cache.get_or_load(
+                f"{RELATED_KEYWORDS_CACHE_PREFIX}{article_id}:{limit}",
+                lambda: RecommendService._load_related_keywords(article_id, limit),
+                ttl=CACHE_TTL_RELATED_KEYWORDS,
+                cache_if=lambda result: not result["partial"]
+            )
+        except Exception as e:
+            logger.error(f"Error in get_related_keywords_by_article: {e}")
+            raise Exception(f"Failed to get related keywords: {e}")
+
+    @staticmethod
+    async def _load_related_keywords(article_id: int, limit: int) -> dict:
+        started = time.perf_counter()
+
+        # 1) Keyword của bài viết, kèm tên (một truy vấn)
+        ak_res = await run_query(supabase.table("article_keyword")
+                                         .select("keyword_id, keyword(keyword_name)")
+                                         .eq("article_id", article_id))
+        keywords = [
+            {"keyword_id": row["keyword_id"],
+             "keyword_name": (row.get("keyword") or {}).get("keyword_name")}
+            for row in ak_res.data
+        ]
+        own_ids = {kw["keyword_id"] for kw in keywords}
+
+        # 2) Hàng xóm của từng keyword từ ma trận đồng xuất hiện, song song, trong ngân sách thời gian
+        budget = RELATED_KEYWORDS_BUDGET_MS / 1000 - (time.perf_counter() - started)
+        partial = False
+        neighbour_lists = []
+        if own_ids:
+            lookups = [
+                asyncio.ensure_future(
+                    keyword_cooccurrence.related(kid, RELATED_KEYWORDS_PER_KEYWORD, "jaccard")
+                )
+                for kid in own_ids
+            ]
+            # Giữ các lookup đã xong, chỉ hủy phần quá ngân sách
+            done, pending = await asyncio.wait(lookups, timeout=max(budget, 0.01))
+            for lookup in pending:
+                lookup.cancel()
+            neighbour_lists = [lookup.result() for lookup in done if not lookup.exception()]
+            if pending:
+                logger.warning(f"Related keywords for article {article_id}: {len(pending)}/{len(lookups)} "
+                               f"lookups exceeded {RELATED_KEYWORDS_BUDGET_MS} ms budget, returning partial result")
+            # Thiếu dữ liệu co-occurrence (chưa dựng, Redis lỗi) cũng là kết quả chưa đầy đủ
+            partial = len(neighbour_lists) < len(lookups) or any(n is None for n in neighbour_lists)
+
+        # 3) Cộng trọng số (Jaccard) của các hàng xóm, bỏ các keyword của chính bài viết
+        weights = defaultdict(float)
+        names = {}
+        for neighbours in neighbour_lists:
+            for kw in neighbours or []:
+                if kw["keyword_id"] in own_ids:
+                    continue
+                weights[kw["keyword_id"]] += kw["score"]
+                names[kw["keyword_id"]] = kw["keyword_name"]
+        top = sorted(weights.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+        return {
+            "article_id": article_id,
+            "keywords": keywords,
+            "related_keywords": [
+                {"keyword_id": kid, "keyword_name": names[kid], "weight": round(weight, 4)}
+                for kid, weight in top
+            ],
+            "partial": partial
+        }
+
     @staticmethod
     async def get_related_articles_by_article(article_id: int,
                                               page: int = 1,
-                                              page_size: int = 20) -> dict:
+                                              page_size: int = 20,
+                                              cursor: Optional[str] = None,
+                                              sort: str = "date") -> dict:
         """
         Lấy danh sách bài viết liên quan đến 1 bài viết (cùng keyword), trừ chính nó.
+        Có cursor thì phân trang theo keyset (pub_date, article_id).
+        sort="relevance" xếp theo số keyword trùng trước, rồi theo ngày.
         """
         try:
             # 1) Lấy keyword_id của bài viết gốc
-            ak_res = supabase.table("article_keyword") \
-                             .select("keyword_id") \
-                             .eq("article_id", article_id) \
-                             .execute()
+            ak_res = await run_query(supabase.table("article_keyword")
+                                             .select("keyword_id")
+                                             .eq("article_id", article_id))
 
             keyword_ids = [row["keyword_id"] for row in ak_res.data]
             if not keyword_ids:
-                return {"articles": [], "total": 0, "page": page, "page_size": page_size}
-
-            # 2) Tìm các bài viết có ít nhất 1 keyword giống, loại trừ chính nó
-            related_ak_res = supabase.table("article_keyword") \
-                                     .select("article_id") \
-                                     .in_("keyword_id", keyword_ids) \
-                                     .neq("article_id", article_id) \
-                                     .execute()
-
-            article_ids = list({row["article_id"] for row in related_ak_res.data})
-            total = len(article_ids)
-
-            if total == 0:
-                return {"articles": [], "total": 0, "page": page, "page_size": page_size}
-
-            # 3) Phân trang
-            start = (page - 1) * page_size
-            end = start + page_size
-            page_ids = article_ids[start:end]
-
-            # 4) Lấy chi tiết bài viết và sắp xếp theo pub_date giảm dần
-            articles_res = supabase.table("article") \
-                                   .select(
-                                       """
-                                           article_id,
-                                           title,
-                                           link,
-                                           image_url,
-                                           description,
-                                           pub_date,
-                                           rss_id
-                                       """
-                                   ) \
-                                   .in_("article_id", page_ids) \
-                                   .order("pub_date", desc=True) \
-                                   .execute()
-
-            return {
-                "articles": articles_res.data,
-                "total": total,
-                "page": page,
-                "page_size": page_size
-            }
+                return {"articles": [], "total": 0, "has_more": False, "next_cursor": None,
+                        "page": None if cursor else page, "page_size": page_size}
+
+            # 2) Các bài viết có ít nhất 1 keyword giống, loại trừ chính nó, mới nhất trước
+            return await RecommendService._articles_for_keyword_ids(
+                keyword_ids, page, page_size, cursor, sort, exclude_article_id=article_id
+            )
 
         except Exception as e:
             logger.error(f"Error in get_related_articles_by_article: {e}")
@@ -0,0 +1,300 @@
+import asyncio
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Optional
+from app.core.database import run_query, supabase
+from app.core.pagination import apply_keyset, next_cursor
+from app.core.text import fold_vietnamese, highlight, load_stopwords, remove_stopwords, tokenize
+from app.core.config import (
+    COUNT_MODE_SEARCH, SEARCH_INDEX_FULL_SYNC_INTERVAL, SEARCH_INDEX_PATH, SEARCH_INDEX_PAGE_SIZE,
+    SEARCH_STOPWORDS_PATH, SEARCH_TITLE_WEIGHT
+)
+from app.services.count_service import count_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_FIELDS = ("article_id", "title", "link", "image_url", "description", "pub_date", "rss_id")
+LOOKUP_SIZE = 500  # ids per `IN (...)`, below SQLite's parameter limit
+
+
+class IlikeSearchBackend:
+    """Substring match on title/description in Postgres, newest first (no ranking)"""
+
+    name = "ilike"
+
+    async def search(self, query: str, page: int, page_size: int,
+                     cursor: Optional[str] = None) -> dict:
+        offset = (page - 1) * page_size
+        search_query = f"%{query.strip()}%"
+        search_filter = f"title.ilike.{search_query},description.ilike.{search_query}"
+
+        # Query one page (plus one look-ahead row) from database
+        query_builder = apply_keyset(supabase.table("article").select("""
+            article_id,
+            title,
+            link,
+            image_url,
+            description,
+            pub_date,
+            rss_id
+        """).or_(search_filter), cursor)
+        if cursor:
+            query_builder = query_builder.limit(count_service.page_limit(page_size))
+        else:
+            query_builder = query_builder.range(offset, offset + count_service.page_limit(page_size) - 1)
+        # Page and server-side match count run concurrently
+        result, total = await asyncio.gather(
+            run_query(query_builder),
+            count_service.get_total(
+                f"search:{query.lower().strip()}",
+                lambda method: supabase.table("article")
+                                       .select("article_id", count=method, head=True)
+                                       .or_(search_filter),
+                mode=COUNT_MODE_SEARCH
+            )
+        )
+        articles, has_more = count_service.trim_page(result.data, page_size)
+
+        return {
+            "articles": articles,
+            "total": total,
+            "has_more": has_more,
+            "next_cursor": next_cursor(articles, has_more)
+        }
+
+
+class Fts5SearchBackend:
+    """
+    Embedded SQLite FTS5 index over article title/description.
+
+    Text is indexed diacritic-folded (fold_vietnamese, so "Đà Nẵng" matches
+    "da nang"), queries drop Vietnamese stopwords, results are ranked by
+    BM25 with the title weighted SEARCH_TITLE_WEIGHT times the description,
+    and matches are highlighted in the original accented text.
+
+    The index follows the `article` table by article_id high-water mark,
+    see `sync()`. There is no updated_at column to follow, so the first sync
+    of a process and then one every SEARCH_INDEX_FULL_SYNC_INTERVAL is a full
+    pass: rows that changed are re-indexed and rows deleted upstream are
+    dropped. Until the first sync finishes, `ready` is False.
+    """
+
+    name = "fts5"
+
+    def __init__(self, path: str = SEARCH_INDEX_PATH, stopwords_path: str = SEARCH_STOPWORDS_PATH,
+                 title_weight: float = SEARCH_TITLE_WEIGHT, page_size: int = SEARCH_INDEX_PAGE_SIZE,
+                 full_sync_interval: float = SEARCH_INDEX_FULL_SYNC_INTERVAL):
+        self.path = path
+        self.stopwords = load_stopwords(stopwords_path)
+        self.title_weight = title_weight
+        self.page_size = page_size
+        self.full_sync_interval = full_sync_interval
+        self._full_synced_at: Optional[float] = None
+        self.ready = False
+        self.last_sync: Optional[dict] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @contextmanager
+    def _connect(self):
+        """Connection per operation (runs in worker threads), committed and closed on exit"""
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_schema(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS article (
+                    article_id INTEGER PRIMARY KEY,
+                    title TEXT, link TEXT, image_url TEXT, description TEXT,
+                    pub_date TEXT, rss_id INTEGER
+                )
+            """)
+            # Contentless: only the folded tokens are stored, originals live in `article`
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS article_fts
+                USING fts5(title, description, content='', tokenize='unicode61')
+            """)
+
+    # ---- Indexing ----
+
+    @staticmethod
+    def _local_rows(conn, ids: List[int]) -> dict:
+        rows = {}
+        for i in range(0, len(ids), LOOKUP_SIZE):
+            chunk = ids[i:i + LOOKUP_SIZE]
+            rows.update((row["article_id"], dict(row)) for row in conn.execute(
+                f"SELECT * FROM article WHERE article_id IN ({','.join('?' * len(chunk))})", chunk
+            ))
+        return rows
+
+    @staticmethod
+    def _unindex(conn, rows: List[dict]) -> None:
+        # Contentless FTS5: removing a row takes the exact values that were indexed
+        conn.executemany(
+            "INSERT INTO article_fts (article_fts, rowid, title, description) VALUES ('delete', ?, ?, ?)",
+            [(row["article_id"], fold_vietnamese(row.get("title") or ""),
+              fold_vietnamese(row.get("description") or "")) for row in rows]
+        )
+
+    def _upsert(self, conn, rows: List[dict]) -> int:
+        """Index new rows and re-index changed ones, returns how many were written"""
+        local = self._local_rows(conn, [row["article_id"] for row in rows])
+        changed = [row for row in rows
+                   if any(local.get(row["article_id"], {}).get(field) != row.get(field) for field in ARTICLE_FIELDS)]
+        self._unindex(conn, [local[row["article_id"]] for row in changed if row["article_id"] in local])
+        conn.executemany(
+            "INSERT OR REPLACE INTO article VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [tuple(row.get(field) for field in ARTICLE_FIELDS) for row in changed]
+        )
+        conn.executemany(
+            "INSERT INTO article_fts (rowid, title, description) VALUES (?, ?, ?)",
+            [(row["article_id"], fold_vietnamese(row.get("title") or ""),
+              fold_vietnamese(row.get("description") or "")) for row in changed]
+        )
+        return len(changed)
+
+    def _delete_missing(self, seen: set) -> int:
+        """Drop local rows whose article no longer exists upstream"""
+        with self._connect() as conn:
+            missing = [row[0] for row in conn.execute("SELECT article_id FROM article") if row[0] not in seen]
+            stale = list(self._local_rows(conn, missing).values())
+            self._unindex(conn, stale)
+            conn.executemany("DELETE FROM article WHERE article_id = ?", [(aid,) for aid in missing])
+        return len(missing)
+
+    def _sync_once(self, full: bool = False) -> dict:
+        """
+        Index articles newer than the local high-water mark, or (full) walk
+        every article, re-index the ones that changed and drop deleted ones
+        """
+        self._init_schema()
+        written = 0
+        seen = set()
+        last_id = 0
+        if not full:
+            with self._connect() as conn:
+                last_id = conn.execute("SELECT COALESCE(MAX(article_id), 0) FROM article").fetchone()[0]
+        while True:
+            rows = supabase.table("article") \
+                           .select(",".join(ARTICLE_FIELDS)) \
+                           .gt("article_id", last_id) \
+                           .order("article_id") \
+                           .limit(self.page_size) \
+                           .execute().data
+            if not rows:
+                break
+            with self._connect() as conn:
+                written += self._upsert(conn, rows)
+            seen.update(row["article_id"] for row in rows)
+            last_id = rows[-1]["article_id"]
+            if len(rows) < self.page_size:
+                break
+        deleted = self._delete_missing(seen) if full else 0
+        return {"full": full, "written": written, "deleted": deleted}
+
+    async def sync(self, full: bool = False) -> dict:
+        async with self._lock:
+            started = time.perf_counter()
+            full = full or self._full_synced_at is None \
+                or time.monotonic() - self._full_synced_at > self.full_sync_interval
+            result = await asyncio.to_thread(self._sync_once, full)
+            if full:
+                self._full_synced_at = time.monotonic()
+            self.ready = True
+            self.last_sync = {
+                **result,
+                "seconds": round(time.perf_counter() - started, 3),
+                "at": datetime.now().isoformat()
+            }
+            if result["written"] or result["deleted"]:
+                logger.info(f"Search index synced: {self.last_sync}")
+            return self.last_sync
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.error(f"Search index sync failed: {e}")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float) -> None:
+        """Start the background sync loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ---- Querying ----
+
+    def query_terms(self, query: str) -> List[str]:
+        """Folded search terms of a user query, stopwords removed"""
+        return [fold_vietnamese(token) for token in remove_stopwords(tokenize(query), self.stopwords)]
+
+    def _search(self, terms: List[str], limit: int, offset: int):
+        match = " ".join(f'"{term}"' for term in terms)
+        with self._connect() as conn:
+            rows = conn.execute("""
+                SELECT a.*, bm25(article_fts, ?, 1.0) AS score
+                FROM article_fts JOIN article a ON a.article_id = article_fts.rowid
+                WHERE article_fts MATCH ?
+                ORDER BY score
+                LIMIT ? OFFSET ?
+            """, (self.title_weight, match, limit, offset)).fetchall()
+            total = conn.execute(
+                "SELECT COUNT(*) FROM article_fts WHERE article_fts MATCH ?", (match,)
+            ).fetchone()[0]
+        return [dict(row) for row in rows], total
+
+    async def search(self, query: str, page: int, page_size: int,
+                     cursor: Optional[str] = None) -> dict:
+        terms = self.query_terms(query)
+        if not terms:
+            return {"articles": [], "total": 0, "has_more": False, "next_cursor": None}
+
+        offset = (page - 1) * page_size
+        rows, total = await asyncio.to_thread(
+            self._search, terms, count_service.page_limit(page_size), offset
+        )
+        articles, has_more = count_service.trim_page(rows, page_size)
+        for article in articles:
+            # bm25() is lower-is-better; expose higher-is-better
+            article["score"] = round(-article["score"], 4)
+            article["title_highlight"] = highlight(article.get("title") or "", terms)
+            article["description_highlight"] = highlight(article.get("description") or "", terms)
+
+        return {
+            "articles": articles,
+            "total": total,
+            "has_more": has_more,
+            "next_cursor": None
+        }
+
+    def stats(self) -> dict:
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {"backend": self.name, "ready": self.ready, "path": self.path,
+                "size_bytes": size, "last_sync": self.last_sync}
+
+
+# Global backend instances
+ilike_backend = IlikeSearchBackend()
+fts5_backend = Fts5SearchBackend()
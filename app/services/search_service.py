@@ -1,7 +1,8 @@
-from typing import List, Optional
-from app.core.database import supabase
+from typing import Optional
 from app.core.redis import redis_client
-from app.core.config import CACHE_TTL_SEARCH
+from app.core.config import CACHE_TTL_SEARCH, SEARCH_BACKEND
+from app.services.search_backends import fts5_backend, ilike_backend
+from app.services.suggest_service import suggest_index
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,18 +10,38 @@ logger = logging.getLogger(__name__)
 
 class SearchService:
     @staticmethod
-    async def search_articles(query: str, page: int = 1, page_size: int = 20) -> dict:
-        """Search articles with caching"""
+    def backend(cursor: Optional[str] = None):
+        """
+        Backend selected by SEARCH_BACKEND. The FTS5 index ranks by relevance, so
+        date-ordered cursor pages, and requests before its first sync, use ilike.
+        """
+        if SEARCH_BACKEND == "fts5" and fts5_backend.ready and not cursor:
+            return fts5_backend
+        return ilike_backend
+
+    @staticmethod
+    async def search_articles(query: str, page: int = 1, page_size: int = 20,
+                              cursor: Optional[str] = None) -> dict:
+        """Search articles with caching (offset mode, or keyset mode when cursor is given)"""
         if not query or not query.strip():
             return {
                 "articles": [],
                 "total": 0,
+                "has_more": False,
+                "next_cursor": None,
                 "query": query,
-                "page": page,
+                "page": None if cursor else page,
                 "page_size": page_size
             }
 
-        cache_key = f"search:{query.lower().strip()}:{page}:{page_size}"
+        if page == 1 and not cursor:
+            # Feed the popular-queries suggestions (first pages only, not pagination)
+            await suggest_index.record_query(query)
+
+        if cursor:
+            cache_key = f"search:{query.lower().strip()}:c:{cursor}:{page_size}"
+        else:
+            cache_key = f"search:{SearchService.backend().name}:{query.lower().strip()}:{page}:{page_size}"
 
         # Try to get from cache
         cached_data = await redis_client.get(cache_key)
@@ -29,35 +50,14 @@ class SearchService:
             return cached_data
 
         try:
-            # Calculate offset
-            offset = (page - 1) * page_size
-
-            # Search in title and description
-            search_query = f"%{query.strip()}%"
-
-            # Query articles from database
-            query_builder = supabase.table("article").select("""
-                article_id,
-                title,
-                link,
-                image_url,
-                description,
-                pub_date,
-                rss_id
-            """).or_(f"title.ilike.{search_query},description.ilike.{search_query}")
-
-            # Get total count first
-            count_result = query_builder.execute()
-            total = len(count_result.data)
-
-            # Get paginated results
-            result = query_builder.order("pub_date", desc=True).range(offset, offset + page_size - 1).execute()
+            backend = SearchService.backend(cursor)
+            result = await backend.search(query, page, page_size, cursor)
 
             response_data = {
-                "articles": result.data,
-                "total": total,
+                **result,
                 "query": query,
-                "page": page,
+                "backend": backend.name,
+                "page": None if cursor else page,
                 "page_size": page_size
             }
 
@@ -72,5 +72,11 @@ class SearchService:
             raise Exception(f"Failed to search articles: {str(e)}")
 
 
+    @staticmethod
+    async def suggest(prefix: str, limit: int = 10) -> dict:
+        """Autocomplete from keyword names and popular queries, accent-insensitive"""
+        return {"query": prefix, "suggestions": suggest_index.suggest(prefix, limit)}
+
+
 # Global service instance
 search_service = SearchService()
\ No newline at end of file
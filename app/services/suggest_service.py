@@ -0,0 +1,286 @@
+import asyncio
+import heapq
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from app.core.database import supabase
+from app.core.redis import RedisClient, redis_client
+from app.core.text import fold_vietnamese
+from app.core.config import (
+    SUGGEST_CACHE_SIZE, SUGGEST_FULL_RELOAD_INTERVAL, SUGGEST_INDEX_ENABLED, SUGGEST_MAX_SCAN,
+    SUGGEST_POPULAR_MAX, SUGGEST_POPULAR_QUERIES, SUGGEST_SHORT_PREFIX_LENGTH, SUGGEST_TOP_K
+)
+from app.services.keyword_stats_service import KEYWORD_COOC_DF_KEY
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Sorted set of normalized search queries -> number of times searched
+SEARCH_POPULAR_KEY = "search:popular"
+PAGE_SIZE = 1000
+
+# (folded text, display text, kind, weight)
+Entry = Tuple[str, str, str, float]
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class _PrefixTable:
+    """
+    Suggestions as one list sorted by folded text, so the entries for a prefix
+    are a contiguous slice found with bisect. Prefixes up to `short_length`
+    characters match too many entries to rank per request; their top-k lists
+    are kept precomputed and updated on insert. Longer prefixes rank up to
+    `max_scan` entries, so their top-k lists are kept in an LRU of
+    `cache_size` prefixes, cleared on insert.
+    """
+
+    def __init__(self, entries: List[Entry], short_length: int, top_k: int,
+                 cache_size: int = SUGGEST_CACHE_SIZE):
+        self.short_length = short_length
+        self.top_k = top_k
+        self.cache_size = cache_size
+        self._results: "OrderedDict[str, List[Entry]]" = OrderedDict()
+        self.entries = sorted(entries)
+        self.keys = [entry[0] for entry in self.entries]
+        self.short: Dict[str, List[Entry]] = {}
+        heaps: Dict[str, List] = {}
+        for entry in self.entries:
+            for prefix in self._short_prefixes(entry[0]):
+                heap = heaps.setdefault(prefix, [])
+                item = (entry[3], entry[0], entry)
+                if len(heap) < top_k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+        for prefix, heap in heaps.items():
+            self.short[prefix] = [entry for _, _, entry in sorted(heap, reverse=True)]
+
+    def _short_prefixes(self, key: str) -> List[str]:
+        return [key[:n] for n in range(1, min(self.short_length, len(key)) + 1)]
+
+    def insert(self, entry: Entry) -> None:
+        i = bisect_left(self.keys, entry[0])
+        if i < len(self.keys) and self.keys[i] == entry[0]:
+            return
+        self.keys.insert(i, entry[0])
+        self.entries.insert(i, entry)
+        self._results.clear()
+        for prefix in self._short_prefixes(entry[0]):
+            top = self.short.setdefault(prefix, [])
+            if len(top) < self.top_k or entry[3] > top[-1][3]:
+                insort(top, entry, key=lambda e: -e[3])
+                del top[self.top_k:]
+
+    def lookup(self, prefix: str, limit: int, max_scan: int) -> List[Entry]:
+        if len(prefix) <= self.short_length:
+            return self.short.get(prefix, [])[:limit]
+        top = self._results.get(prefix) if limit <= self.top_k else None
+        if top is not None:
+            self._results.move_to_end(prefix)
+            return top[:limit]
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + "\U0010ffff", start, min(start + max_scan, len(self.keys)))
+        top = heapq.nlargest(max(limit, self.top_k), self.entries[start:end], key=lambda e: e[3])
+        if limit > self.top_k:
+            return top
+        self._results[prefix] = top
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+        return top[:limit]
+
+
+class SuggestIndex:
+    """
+    In-memory autocomplete over keyword names and popular search queries.
+
+    Matching is on diacritic-folded text ("da n" suggests "Đà Nẵng"). Keywords
+    are weighted by the number of articles tagged with them, read from the
+    `kw_cooc:df` hash that the keyword extractor keeps only while
+    KEYWORD_COOC_ENABLED is on. When that hash has none of the keywords
+    (co-occurrence disabled, or not rebuilt yet) the counts come from the
+    `get_hot_keywords` RPC instead. Queries are weighted by how often they were
+    searched (`search:popular`). New keywords are added incrementally by
+    keyword_id high-water mark and newly popular queries on every refresh;
+    weights are refreshed by a periodic rebuild. Each refresh also trims
+    `search:popular` to the `popular_max` most searched queries.
+    """
+
+    def __init__(self, client: RedisClient, short_length: int = SUGGEST_SHORT_PREFIX_LENGTH,
+                 top_k: int = SUGGEST_TOP_K, max_scan: int = SUGGEST_MAX_SCAN,
+                 full_reload_interval: float = SUGGEST_FULL_RELOAD_INTERVAL,
+                 popular_max: int = SUGGEST_POPULAR_MAX, enabled: bool = SUGGEST_INDEX_ENABLED,
+                 cache_size: int = SUGGEST_CACHE_SIZE):
+        self.client = client
+        self.short_length = short_length
+        self.top_k = top_k
+        self.max_scan = max_scan
+        self.full_reload_interval = full_reload_interval
+        self.popular_max = popular_max
+        self.enabled = enabled
+        self.cache_size = cache_size
+        self._table: Optional[_PrefixTable] = None
+        self._high_water = 0
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.last_refresh: Optional[dict] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._table is not None
+
+    # ---- Loading ----
+
+    @staticmethod
+    def _fetch_keywords(after_id: int) -> List[dict]:
+        rows: List[dict] = []
+        while True:
+            page = supabase.table("keyword") \
+                           .select("keyword_id,keyword_name") \
+                           .gt("keyword_id", after_id) \
+                           .order("keyword_id") \
+                           .limit(PAGE_SIZE) \
+                           .execute().data
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                return rows
+            after_id = page[-1]["keyword_id"]
+
+    @staticmethod
+    def _fetch_frequencies(limit: int) -> Dict[int, int]:
+        """Articles per keyword counted in the database, for at most `limit` keywords"""
+        rows = supabase.rpc("get_hot_keywords", {"limit_count": limit}).execute().data or []
+        return {row["keyword_id"]: row["count"] for row in rows}
+
+    async def _keyword_entries(self, rows: List[dict]) -> List[Entry]:
+        dfs = []
+        try:
+            for i in range(0, len(rows), PAGE_SIZE * 10):
+                dfs += await self.client.redis.hmget(
+                    KEYWORD_COOC_DF_KEY, [row["keyword_id"] for row in rows[i:i + PAGE_SIZE * 10]]
+                )
+        except Exception as e:
+            logger.warning(f"Keyword frequencies unavailable in Redis: {e}")
+            dfs = [None] * len(rows)
+        if rows and not any(dfs):
+            logger.warning(f"{KEYWORD_COOC_DF_KEY} is empty, counting keyword frequencies in the database")
+            try:
+                # keyword_ids are serial, so the highest one bounds the number of keywords
+                counts = await asyncio.to_thread(self._fetch_frequencies, rows[-1]["keyword_id"])
+                dfs = [counts.get(row["keyword_id"]) for row in rows]
+            except Exception as e:
+                logger.warning(f"Keyword frequencies unavailable, suggestions are unweighted: {e}")
+        return [
+            (fold_vietnamese(row["keyword_name"]), row["keyword_name"], "keyword", float(df or 1))
+            for row, df in zip(rows, dfs) if row.get("keyword_name")
+        ]
+
+    async def _query_entries(self) -> List[Entry]:
+        try:
+            # Bound the set: every first-page search adds to it
+            await self.client.redis.zremrangebyrank(SEARCH_POPULAR_KEY, 0, -(self.popular_max + 1))
+            popular = await self.client.redis.zrevrange(
+                SEARCH_POPULAR_KEY, 0, SUGGEST_POPULAR_QUERIES - 1, withscores=True
+            )
+        except Exception as e:
+            logger.warning(f"Popular queries unavailable: {e}")
+            return []
+        return [(fold_vietnamese(query), query, "query", score) for query, score in popular]
+
+    async def refresh(self, full: bool = False) -> dict:
+        """Add keywords created since the last refresh, or rebuild everything with fresh weights"""
+        async with self._lock:
+            started = time.perf_counter()
+            full = full or self._table is None \
+                or time.monotonic() - self._loaded_at > self.full_reload_interval
+            after_id = 0 if full else self._high_water
+            rows = await asyncio.to_thread(self._fetch_keywords, after_id)
+            entries = await self._keyword_entries(rows) + await self._query_entries()
+
+            if full:
+                self._table = await asyncio.to_thread(
+                    _PrefixTable, entries, self.short_length, self.top_k, self.cache_size
+                )
+                self._loaded_at = time.monotonic()
+            else:
+                for entry in entries:
+                    self._table.insert(entry)
+            if rows:
+                self._high_water = rows[-1]["keyword_id"]
+
+            self.last_refresh = {
+                "full": full,
+                "entries": len(entries),
+                "seconds": round(time.perf_counter() - started, 3),
+                "at": datetime.now().isoformat()
+            }
+            if full or rows:
+                logger.info(f"Suggest index refreshed: {self.last_refresh}")
+            return self.last_refresh
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Suggest index refresh failed: {e}")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ---- Querying ----
+
+    async def record_query(self, query: str) -> None:
+        """Count a search query towards the popular-queries suggestions"""
+        normalized = normalize_query(query)
+        if not self.enabled or not normalized:
+            return
+        try:
+            await self.client.redis.zincrby(SEARCH_POPULAR_KEY, 1, normalized)
+        except Exception as e:
+            logger.warning(f"Failed to record search query: {e}")
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[dict]:
+        folded = " ".join(fold_vietnamese(prefix).split())
+        if not folded or self._table is None:
+            return []
+        seen = set()
+        suggestions = []
+        # Ask for extra rows: a popular query may duplicate a keyword
+        for key, text, kind, weight in self._table.lookup(folded, limit * 2, self.max_scan):
+            if key in seen:
+                continue
+            seen.add(key)
+            suggestions.append({"text": text, "kind": kind, "weight": weight})
+            if len(suggestions) == limit:
+                break
+        return suggestions
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "entries": len(self._table.entries) if self._table else 0,
+            "short_prefixes": len(self._table.short) if self._table else 0,
+            "high_water": self._high_water,
+            "last_refresh": self.last_refresh
+        }
+
+
+# Global suggest index
+suggest_index = SuggestIndex(redis_client)
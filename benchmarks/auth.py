@@ -0,0 +1,91 @@
+"""
+Auth overhead per request for get_current_user's three paths:
+
+  cache  - token already verified (TTLCache hit keyed by sha256(token))
+  hs256  - local signature/exp/aud check with SUPABASE_JWT_SECRET
+  jwks   - local RS256 check with a cached JWKS key
+  remote - supabase.auth.get_user fallback, stood in by a `latency_ms` sleep
+
+Runs offline against stand-ins:
+    python -m benchmarks.auth [requests] [remote_latency_ms]
+"""
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:1")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt import PyJWK
+from jwt.algorithms import RSAAlgorithm
+
+from app.dependencies import auth
+
+SECRET = "bench-secret-" + "x" * 32
+
+
+class _StandInJWKS:
+    def __init__(self, jwk: dict):
+        self.jwk = PyJWK.from_dict(jwk)
+
+    def get_signing_key_from_jwt(self, token):
+        return self.jwk
+
+
+class _StandInAuth:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def get_user(self, token):
+        time.sleep(self.latency)
+        return SimpleNamespace(user=SimpleNamespace(id="user-1", email="a@b.vn", role="authenticated"))
+
+
+def _claims() -> dict:
+    return {"sub": "user-1", "aud": auth.SUPABASE_JWT_AUDIENCE, "exp": int(time.time()) + 3600}
+
+
+async def _per_request_us(tokens, clear_cache: bool) -> float:
+    started = time.perf_counter()
+    for token in tokens:
+        if clear_cache:
+            auth._token_cache.clear()
+        await auth.verify_token(token)
+    return (time.perf_counter() - started) / len(tokens) * 1e6
+
+
+def benchmark(requests: int = 2000, remote_latency_ms: float = 30) -> None:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = {**RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True), "alg": "RS256", "kid": "bench"}
+    auth.SUPABASE_JWT_SECRET = SECRET
+    auth._jwks_client = _StandInJWKS(jwk)
+    auth.supabase = SimpleNamespace(auth=_StandInAuth(remote_latency_ms / 1000))
+
+    hs256 = [jwt.encode({**_claims(), "n": i}, SECRET, algorithm="HS256") for i in range(requests)]
+    rs256 = [jwt.encode({**_claims(), "n": i}, private_key, algorithm="RS256", headers={"kid": "bench"})
+             for i in range(requests)]
+    # HS256 tokens once the secret is unset: no local key, so get_user is called
+    remote = hs256[:max(1, requests // 20)]
+
+    async def _bench():
+        results = {"hs256": await _per_request_us(hs256, clear_cache=True),
+                   "jwks": await _per_request_us(rs256, clear_cache=True),
+                   "cache": 0.0}
+        await _per_request_us(hs256, clear_cache=False)  # warm the token cache
+        results["cache"] = await _per_request_us(hs256, clear_cache=False)
+        auth.SUPABASE_JWT_SECRET = None
+        auth.AUTH_REMOTE_FALLBACK = True
+        results["remote"] = await _per_request_us(remote, clear_cache=True)
+        return results
+
+    for path, us in asyncio.run(_bench()).items():
+        print(f"{path:>6}: {us:10.1f} µs/request")
+    print(f"(remote = stand-in get_user sleeping {remote_latency_ms:.0f} ms, {len(remote)} requests)")
+
+
+if __name__ == "__main__":
+    benchmark(*(float(arg) if i else int(arg) for i, arg in enumerate(sys.argv[1:3])))
@@ -0,0 +1,46 @@
+"""
+Requests/sec of concurrent hot-articles loads against a stand-in Supabase
+client whose queries take `latency_ms`, with execute() blocking the event
+loop (as before run_query) vs offloaded to the bounded query pool.
+
+    python -m benchmarks.db_load [concurrency] [latency_ms]
+"""
+import asyncio
+import os
+import sys
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:1")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+
+from app.core.config import DB_POOL_SIZE
+from app.core.database import run_query
+from app.services import count_service, recommend_service
+from app.services.recommend_service import RecommendService
+from tests.fakes import StandInClient
+
+
+async def _blocking_query(builder, timeout=None):
+    return builder.execute()
+
+
+def load_test(concurrency: int = 200, latency_ms: float = 50) -> None:
+    recommend_service.supabase = StandInClient(latency_ms / 1000)
+    recommend_service.COUNT_MODE_HOT_ARTICLES = "exact"
+
+    for label, query in (("blocking", _blocking_query), ("run_query", run_query)):
+        recommend_service.run_query = count_service.run_query = query
+
+        async def _run():
+            started = time.perf_counter()
+            await asyncio.gather(*(RecommendService._load_hot_articles(page, 20)
+                                   for page in range(1, concurrency + 1)))
+            return time.perf_counter() - started
+
+        elapsed = asyncio.run(_run())
+        print(f"{label:>9}: {concurrency / elapsed:7.1f} req/s "
+              f"({concurrency} concurrent, {latency_ms:.0f} ms/query, pool {DB_POOL_SIZE})")
+
+
+if __name__ == "__main__":
+    load_test(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,73 @@
+"""
+Database round trips per article for the keyword extractor's writes: the
+previous per-pair path (select + insert for the keyword, then for the
+article_keyword pair) vs KeywordWriter, on a synthetic workload with a
+Zipf-like keyword distribution, against the in-memory FakeSupabase.
+
+    python -m benchmarks.keyword_writer [articles] [page_size]
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "craw_data_service"))
+
+from keyword_writer import KeywordWriter, generate_md5
+from tests.fakes import FakeSupabase
+
+
+def keyword_db() -> FakeSupabase:
+    return FakeSupabase(unique={"keyword": ["keyword_md5"], "article_keyword": ["article_id", "keyword_id"]},
+                        serial={"keyword": "keyword_id"})
+
+
+def legacy_write(db, article_keywords) -> None:
+    """The previous per-pair path: select + insert for the keyword, then for the pair"""
+    for article_id, keywords in article_keywords.items():
+        for kw in keywords:
+            existing = db.table("keyword").select("keyword_id").eq("keyword_md5", generate_md5(kw)).execute()
+            if existing.data:
+                keyword_id = existing.data[0]["keyword_id"]
+            else:
+                keyword_id = db.table("keyword").insert(
+                    {"keyword_name": kw, "keyword_md5": generate_md5(kw)}).execute().data[0]["keyword_id"]
+            pair = db.table("article_keyword").select("*").eq("article_id", article_id) \
+                     .eq("keyword_id", keyword_id).execute()
+            if not pair.data:
+                db.table("article_keyword").insert({"article_id": article_id, "keyword_id": keyword_id}).execute()
+
+
+def workload(articles: int, vocabulary: int = 2000, seed: int = 1):
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, vocabulary + 1)]
+    return {
+        article_id: list({f"từ khóa {n}" for n in rng.choices(range(vocabulary), weights, k=rng.randint(2, 8))})
+        for article_id in range(1, articles + 1)
+    }
+
+
+def benchmark(articles: int = 2000, page_size: int = 500) -> None:
+    article_keywords = workload(articles)
+    pages = [dict(list(article_keywords.items())[i:i + page_size]) for i in range(0, articles, page_size)]
+    pairs = sum(len(keywords) for keywords in article_keywords.values())
+
+    legacy_db = keyword_db()
+    for page in pages:
+        legacy_write(legacy_db, page)
+
+    writer = KeywordWriter(keyword_db())
+    per_page = []
+    for page in pages:
+        before = writer.round_trips
+        writer.write(page)
+        per_page.append((writer.round_trips - before) / len(page))
+
+    print(f"{articles} articles, {pairs} pairs, pages of {page_size}")
+    print(f"   legacy: {len(legacy_db.calls) / articles:7.2f} round trips/article")
+    print(f"     bulk: {writer.round_trips / articles:7.2f} round trips/article "
+          f"(first page {per_page[0]:.3f}, last page {per_page[-1]:.3f})")
+    print(f"  {writer.summary()}")
+
+
+if __name__ == "__main__":
+    benchmark(*(int(arg) for arg in sys.argv[1:3]))
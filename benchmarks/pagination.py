@@ -0,0 +1,47 @@
+"""
+Latency of hot-articles page N in offset mode vs cursor mode (page query
+only, no count), against the Supabase project in SUPABASE_URL/SUPABASE_KEY.
+
+    python -m benchmarks.pagination [1,10,50,100]
+"""
+import asyncio
+import sys
+import time
+from typing import Tuple
+
+from app.services import recommend_service
+from app.services.recommend_service import RecommendService
+
+
+def benchmark(pages: Tuple[int, ...] = (1, 10, 50, 100), page_size: int = 20, runs: int = 5) -> None:
+    recommend_service.COUNT_MODE_HOT_ARTICLES = "none"
+
+    async def _time(load) -> float:
+        started = time.perf_counter()
+        for _ in range(runs):
+            await load()
+        return (time.perf_counter() - started) / runs * 1000
+
+    async def _bench():
+        # Walk the pages once to collect the cursor that leads to each page
+        cursors = {}
+        cursor = None
+        for page in range(1, max(pages) + 1):
+            cursors[page] = cursor
+            cursor = (await RecommendService._load_hot_articles(page, page_size, cursor))["next_cursor"]
+            if cursor is None:
+                break
+
+        for page in pages:
+            if page not in cursors:
+                print(f"page {page}: past the last page")
+                continue
+            offset_ms = await _time(lambda: RecommendService._load_hot_articles(page, page_size))
+            cursor_ms = await _time(lambda: RecommendService._load_hot_articles(page, page_size, cursors[page]))
+            print(f"page {page:>5}: offset {offset_ms:7.1f} ms | cursor {cursor_ms:7.1f} ms")
+
+    asyncio.run(_bench())
+
+
+if __name__ == "__main__":
+    benchmark(tuple(int(n) for n in sys.argv[1].split(",")) if len(sys.argv) > 1 else (1, 10, 50, 100))
@@ -0,0 +1,67 @@
+"""
+Per-request latency of SuggestIndex.suggest() (p50/p99/max) over a synthetic
+vocabulary of Vietnamese-looking keywords and queries, for prefixes of
+1..8 characters. Short prefixes hit the precomputed top-k lists, longer ones
+rank the bisect slice: "uncached" with the result LRU off, "cached" with it
+on (SUGGEST_CACHE_SIZE), where the same prefixes repeat across requests.
+
+Runs offline, the index is built in memory:
+    python -m benchmarks.suggest [entries] [requests]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:1")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+
+from app.core.text import fold_vietnamese
+from app.services.suggest_service import SuggestIndex, _PrefixTable
+
+SYLLABLES = ["đà", "nẵng", "hà", "nội", "giá", "vàng", "bão", "số", "tỷ", "xăng", "dầu", "thủ", "tướng",
+             "chính", "phủ", "bóng", "đá", "việt", "nam", "kinh", "tế", "du", "lịch", "thời", "tiết",
+             "học", "sinh", "thi", "tuyển", "công", "nghệ", "ngân", "hàng", "lãi", "suất", "nhà", "đất"]
+
+
+def vocabulary(n: int, rng: random.Random):
+    entries = {}
+    while len(entries) < n:
+        text = " ".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4)))
+        kind = "query" if rng.random() < 0.3 else "keyword"
+        # Zipf-like weights: a few very frequent entries, a long tail
+        entries[fold_vietnamese(text)] = (fold_vietnamese(text), text, kind, float(int(1 / rng.random() ** 1.2)))
+    return list(entries.values())
+
+
+def percentile(samples, p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def benchmark(entries: int = 200_000, requests: int = 20_000) -> None:
+    rng = random.Random(7)
+    vocab = vocabulary(entries, rng)
+    indexes = {}
+    for name, cache_size in (("uncached", 0), ("cached", None)):
+        index = SuggestIndex(client=None, enabled=True)
+        started = time.perf_counter()
+        index._table = _PrefixTable(vocab, index.short_length, index.top_k,
+                                    index.cache_size if cache_size is None else cache_size)
+        indexes[name] = index
+    print(f"built {len(vocab)} entries in {time.perf_counter() - started:.2f} s")
+
+    for length in (1, 2, 3, 5, 8):
+        prefixes = [entry[1][:length] for entry in rng.choices(vocab, k=requests)]
+        for name, index in indexes.items():
+            samples = []
+            for prefix in prefixes:
+                started = time.perf_counter()
+                index.suggest(prefix)
+                samples.append((time.perf_counter() - started) * 1e6)
+            print(f"prefix {length} chars, {name:>8}: p50 {percentile(samples, 0.5):7.1f} µs | "
+                  f"p99 {percentile(samples, 0.99):7.1f} µs | max {max(samples):8.1f} µs")
+
+
+if __name__ == "__main__":
+    benchmark(*(int(n) for n in sys.argv[1:3]))
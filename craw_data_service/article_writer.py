@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Batched dedup and insert of crawled articles.
+
+Instead of one existence check and one insert per entry, the writer collects
+all rows of a crawl window, looks up which `link_article_md5` values already
+exist with chunked `in_` queries, and inserts the new rows in chunks.
+With a link filter attached, md5s the filter has never seen skip the lookup.
+
+The filter is only safe to trust if it knows every stored md5: it is updated
+after each inserted chunk, and the crawler marks it dirty while writing (see
+link_filter.py) so a run killed before saving it falls back to full checks.
+`article.link_article_md5` should also carry a unique index, so that a stale
+filter can never produce silent duplicates:
+
+    CREATE UNIQUE INDEX IF NOT EXISTS article_link_article_md5_key
+        ON article (link_article_md5);
+"""
+from typing import Dict, Iterable, List, Set
+
+DEFAULT_CHUNK_SIZE = 100    # Số dòng mỗi lần insert
+DEFAULT_LOOKUP_SIZE = 200   # Số md5 mỗi câu `in_` (giữ URL đủ ngắn cho PostgREST)
+
+
+class ArticleWriter:
+    def __init__(self, client, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 lookup_size: int = DEFAULT_LOOKUP_SIZE, link_filter=None):
+        self.client = client
+        self.link_filter = link_filter
+        self.chunk_size = chunk_size
+        self.lookup_size = lookup_size
+        self.round_trips = 0
+        self.rows_written = 0
+        self.lookups_skipped = 0
+        self.failed_rows: List[Dict] = []
+
+    def existing_md5s(self, md5s: Iterable[str]) -> Set[str]:
+        """Trả về tập các link_article_md5 đã có trong bảng `article`."""
+        md5s = list(md5s)
+        existing = set()
+        for i in range(0, len(md5s), self.lookup_size):
+            chunk = md5s[i:i + self.lookup_size]
+            resp = self.client.table("article") \
+                              .select("link_article_md5") \
+                              .in_("link_article_md5", chunk) \
+                              .execute()
+            self.round_trips += 1
+            existing.update(row["link_article_md5"] for row in resp.data)
+        return existing
+
+    def write(self, rows: Iterable[Dict]) -> List[Dict]:
+        """
+        Ghi các bài viết chưa tồn tại, trả về danh sách dòng đã ghi.
+        Dòng trùng md5 trong cùng cửa sổ chỉ được giữ lại dòng đầu tiên.
+        Chunk bị lỗi được lưu vào `failed_rows` thay vì làm dừng cả lượt ghi.
+        """
+        unique: Dict[str, Dict] = {}
+        for row in rows:
+            unique.setdefault(row["link_article_md5"], row)
+
+        to_check = list(unique.keys())
+        if self.link_filter is not None:
+            to_check = [md5 for md5 in to_check if md5 in self.link_filter]
+            self.lookups_skipped += len(unique) - len(to_check)
+
+        existing = self.existing_md5s(to_check)
+        for md5 in existing:
+            print(f"⏭️ Already exists: {unique[md5]['title']}")
+        new_rows = [row for md5, row in unique.items() if md5 not in existing]
+
+        written = []
+        for i in range(0, len(new_rows), self.chunk_size):
+            chunk = new_rows[i:i + self.chunk_size]
+            try:
+                self._insert(chunk)
+            except Exception as e:
+                if self.link_filter is None:
+                    self.failed_rows.extend(chunk)
+                    print(f"❌ Error inserting {len(chunk)} articles: {e}")
+                    continue
+                # Filter có thể đã cũ (vd. crawler bị dừng trước khi lưu filter):
+                # kiểm tra lại chunk với database rồi thử ghi một lần nữa
+                existing = self.existing_md5s(row["link_article_md5"] for row in chunk)
+                chunk = [row for row in chunk if row["link_article_md5"] not in existing]
+                try:
+                    if chunk:
+                        self._insert(chunk)
+                except Exception as e:
+                    self.failed_rows.extend(chunk)
+                    print(f"❌ Error inserting {len(chunk)} articles: {e}")
+                    continue
+            written.extend(chunk)
+            if self.link_filter is not None:
+                # Cập nhật ngay sau mỗi chunk, không đợi hết lượt ghi
+                self.link_filter.update(row["link_article_md5"] for row in chunk)
+
+        return written
+
+    def _insert(self, chunk: List[Dict]) -> None:
+        self.round_trips += 1
+        self.client.table("article").insert(chunk, returning="minimal").execute()
+        self.rows_written += len(chunk)
+
+    @property
+    def rows_per_round_trip(self) -> float:
+        return self.rows_written / self.round_trips if self.round_trips else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"Article writer: {self.rows_written} rows in {self.round_trips} round trips "
+            f"({self.rows_per_round_trip:.1f} rows/round trip), "
+            f"{self.lookups_skipped} lookups skipped by link filter"
+        )
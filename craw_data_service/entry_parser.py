@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Normalize feed entries into article rows.
+
+The description HTML of each entry is parsed exactly once. The same tree
+yields the fallback image URL and the description text with the first
+<img> removed. lxml is used when available (it ships with trafilatura),
+otherwise BeautifulSoup's html.parser.
+
+`python entry_parser.py bench <descriptions.json>` times normalize_entry
+against the previous BeautifulSoup pipeline (tests/fixtures/descriptions.json
+is a small corpus of real-world feed entries).
+"""
+import hashlib
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass
+from html import unescape
+from typing import Optional, Tuple
+
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:  # pragma: no cover - lxml không bắt buộc
+    from bs4 import BeautifulSoup
+    HAS_LXML = False
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif")
+NON_TEXT_TAGS = ("script", "style", "template")  # BeautifulSoup's get_text() bỏ qua các thẻ này
+IMAGE_URL_RE = re.compile(r'(https?://[^\s"\'<>]+?\.(?:jpg|jpeg|png|webp|gif))', re.IGNORECASE)
+
+
+@dataclass
+class NormalizedEntry:
+    title_raw: str
+    title: str = ""
+    link: str = ""
+    pub_date: str = ""
+    description: str = ""
+    image_url: Optional[str] = None
+    link_md5: Optional[str] = None
+    skip_reason: Optional[str] = None
+
+
+def calculate_md5(text):
+    """Calculate MD5 hash of a given text."""
+    if not text:
+        return None
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
+
+
+def _is_image(url) -> bool:
+    return bool(url) and url.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def image_from_fields(entry) -> Optional[str]:
+    """Tìm ảnh trong các trường media của entry (không cần parse HTML)."""
+    # 1. media:content (chuẩn quốc tế)
+    media_content = entry.get("media_content", [])
+    if isinstance(media_content, list) and media_content:
+        url = media_content[0].get("url")
+        if url:
+            return url
+
+    # 2. media:thumbnail
+    media_thumb = entry.get("media_thumbnail", [])
+    if isinstance(media_thumb, list) and media_thumb:
+        url = media_thumb[0].get("url")
+        if url:
+            return url
+
+    # 3. enclosure (hay gặp ở nhiều báo)
+    enclosure = entry.get("enclosures", [])
+    if isinstance(enclosure, list) and enclosure:
+        url = enclosure[0].get("href") or enclosure[0].get("url")
+        if _is_image(url):
+            return url
+
+    # 4. Browse các trường có chứa "url"
+    for k, v in entry.items():
+        if isinstance(v, list):
+            for sub in v:
+                if isinstance(sub, dict) and "url" in sub and _is_image(sub["url"]):
+                    return sub["url"]
+        elif isinstance(v, dict) and "url" in v and _is_image(v["url"]):
+            return v["url"]
+
+    return None
+
+
+def _text_content(root) -> str:
+    """text_content() của lxml, bỏ nội dung script/style như get_text() của BeautifulSoup."""
+    for element in root.iter(*NON_TEXT_TAGS):
+        element.drop_tree()  # drop_tree giữ lại tail (phần text phía sau thẻ)
+    return root.text_content()
+
+
+def parse_description(description_html: str) -> Tuple[Optional[str], str]:
+    """
+    Parse description một lần, trả về (ảnh đầu tiên có đuôi ảnh hợp lệ,
+    text của description sau khi bỏ thẻ <img> đầu tiên).
+    """
+    if HAS_LXML:
+        try:
+            root = lxml.html.fragment_fromstring(description_html, create_parent="div")
+        except Exception:
+            return None, description_html
+        imgs = root.findall(".//img")
+        image_url = next((img.get("src") for img in imgs if _is_image(img.get("src"))), None)
+        if imgs:
+            imgs[0].drop_tree()  # Giữ lại phần text phía sau thẻ img
+        return image_url, _text_content(root)
+
+    soup = BeautifulSoup(description_html, "html.parser")
+    imgs = soup.find_all("img")
+    image_url = next((img.get("src") for img in imgs if _is_image(img.get("src"))), None)
+    if imgs:
+        imgs[0].decompose()
+    return image_url, soup.get_text()
+
+
+def _strip_tags(text: str) -> str:
+    if HAS_LXML:
+        try:
+            return _text_content(lxml.html.fragment_fromstring(text, create_parent="div"))
+        except Exception:
+            return text
+    return BeautifulSoup(text, "html.parser").text
+
+
+def clean_html_entities(text):
+    if not text:
+        return ""
+    # Chỉ parse lại khi còn thẻ HTML (vd. &lt;b&gt; vừa được giải mã thành <b>)
+    text = _strip_tags(text) if "<" in text else unescape(text)
+    return unescape(unescape(text.strip()))
+
+
+def normalize_entry(entry) -> NormalizedEntry:
+    """Chuẩn hóa một entry feedparser; `skip_reason` khác None nếu phải bỏ qua."""
+    item = NormalizedEntry(title_raw=entry.get("title", ""))
+    item.link = entry.get("link", "")
+    item.pub_date = entry.get("published", "")
+    description_html = entry.get("description", "")
+
+    if not item.link or not description_html:
+        item.skip_reason = "missing link/description"
+        return item
+
+    item.link_md5 = calculate_md5(item.link)
+    if not item.link_md5:
+        item.skip_reason = "could not generate MD5"
+        return item
+
+    html_image, description_text = parse_description(description_html)
+    item.image_url = image_from_fields(entry) or html_image
+    if not item.image_url:
+        # Regex: bắt ảnh nếu mô tả lỗi hoặc HTML không hợp lệ
+        match = IMAGE_URL_RE.search(description_html)
+        item.image_url = match.group(1) if match else None
+    if not item.image_url:
+        item.skip_reason = "no image"
+        return item
+
+    item.description = clean_html_entities(description_text)
+    item.title = clean_html_entities(item.title_raw)
+    return item
+
+
+def _legacy_normalize(entry) -> NormalizedEntry:
+    """Pipeline cũ (BeautifulSoup parse description tới ba lần), chỉ dùng để so sánh"""
+    from bs4 import BeautifulSoup
+
+    def clean(text):
+        if not text:
+            return ""
+        return unescape(unescape(BeautifulSoup(text, "html.parser").text.strip()))
+
+    item = NormalizedEntry(title_raw=entry.get("title", ""))
+    item.link = entry.get("link", "")
+    item.pub_date = entry.get("published", "")
+    description_html = entry.get("description", "")
+    if not item.link or not description_html:
+        item.skip_reason = "missing link/description"
+        return item
+    item.link_md5 = calculate_md5(item.link)
+
+    item.image_url = image_from_fields(entry)
+    if not item.image_url:
+        srcs = [img.get("src") for img in BeautifulSoup(description_html, "html.parser").find_all("img")]
+        item.image_url = next((src for src in srcs if _is_image(src)), None)
+    if not item.image_url:
+        match = IMAGE_URL_RE.search(description_html)
+        item.image_url = match.group(1) if match else None
+    if not item.image_url:
+        item.skip_reason = "no image"
+        return item
+
+    soup = BeautifulSoup(description_html, "html.parser")
+    if soup.find("img"):
+        soup.find("img").decompose()
+    item.description = clean(soup.get_text())
+    item.title = clean(item.title_raw)
+    return item
+
+
+def benchmark(corpus_path: str, seconds: float = 2.0) -> None:
+    """In entries/sec của normalize_entry và của pipeline cũ trên một corpus JSON"""
+    with open(corpus_path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    for label, normalize in (("single-parse", normalize_entry), ("legacy", _legacy_normalize)):
+        done = 0
+        started = time.perf_counter()
+        while time.perf_counter() - started < seconds:
+            for entry in entries:
+                normalize(entry)
+            done += len(entries)
+        elapsed = time.perf_counter() - started
+        print(f"{label}: {done / elapsed:,.0f} entries/sec ({'lxml' if HAS_LXML else 'html.parser'})")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "bench":
+        benchmark(sys.argv[2])
+    else:
+        print("Usage: python entry_parser.py bench <descriptions.json>")
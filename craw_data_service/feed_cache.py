@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Conditional GET state for RSS feeds, keyed by rss.id.
+
+For each feed we remember the ETag, Last-Modified and an MD5 of the body we
+last processed. The next crawl sends If-None-Match / If-Modified-Since and
+skips parsing on a 304 or when the body is byte-for-byte identical. New
+validators sent with an unchanged feed are saved too, so the next request
+can still get a 304.
+"""
+import hashlib
+from typing import Dict, Iterable, Optional
+
+from kv_store import open_store
+
+STATS_KEY = "__stats__"
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.md5(content).hexdigest()
+
+
+class FeedCache:
+    def __init__(self, store=None):
+        self.store = store if store is not None else open_store("feed_state")
+        self.states: Dict[str, Dict] = {}
+        self.refreshed: Dict[str, Dict] = {}  # Feed không đổi nhưng có ETag/Last-Modified mới
+        self.not_modified = 0   # 304 từ server
+        self.unchanged = 0      # 200 nhưng nội dung giống lần trước
+        self.misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self.not_modified + self.unchanged
+
+    def load(self, rss_ids: Iterable) -> None:
+        """Nạp trạng thái của các feed sắp crawl bằng một lần đọc."""
+        self.states = self.store.get_many(str(rss_id) for rss_id in rss_ids)
+        self.refreshed = {}
+
+    def request_headers(self, rss_id) -> Dict[str, str]:
+        state = self.states.get(str(rss_id)) or {}
+        headers = {}
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+        return headers
+
+    def check(self, rss_id, status_code: int, headers, content: bytes) -> Optional[Dict]:
+        """
+        Trả về None nếu feed không đổi (304 hoặc cùng nội dung), ngược lại
+        trả về trạng thái mới cần lưu sau khi xử lý xong feed.
+        """
+        previous = self.states.get(str(rss_id)) or {}
+        if status_code == 304:
+            self.not_modified += 1
+            # 304 có thể không gửi lại validator, chỉ cập nhật cái server gửi
+            self._refresh(rss_id, previous, headers.get("etag") or previous.get("etag"),
+                          headers.get("last-modified") or previous.get("last_modified"))
+            return None
+
+        digest = content_hash(content)
+        if previous.get("content_hash") == digest:
+            self.unchanged += 1
+            # Không có gì để xử lý, nhưng ETag/Last-Modified cũ có thể không còn khớp với server
+            self._refresh(rss_id, previous, headers.get("etag"), headers.get("last-modified"))
+            return None
+
+        self.misses += 1
+        return {
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "content_hash": digest,
+        }
+
+    def _refresh(self, rss_id, previous: Dict, etag: Optional[str], last_modified: Optional[str]) -> None:
+        if (etag, last_modified) != (previous.get("etag"), previous.get("last_modified")):
+            self.refreshed[str(rss_id)] = {**previous, "etag": etag, "last_modified": last_modified}
+
+    def commit(self, results: Iterable) -> None:
+        """Lưu trạng thái mới của các feed đã được xử lý thành công."""
+        # Feed không đổi không cần xử lý, validator mới của chúng luôn được lưu
+        updates = dict(self.refreshed)
+        updates.update((str(r.rss_id), r.state) for r in results if r.state)
+
+        totals = self.store.get(STATS_KEY) or {}
+        totals["not_modified"] = totals.get("not_modified", 0) + self.not_modified
+        totals["unchanged"] = totals.get("unchanged", 0) + self.unchanged
+        totals["misses"] = totals.get("misses", 0) + self.misses
+        updates[STATS_KEY] = totals
+
+        self.store.set_many(updates)
+
+    def summary(self) -> str:
+        return (
+            f"Feed cache: {self.hits} hits ({self.not_modified} not modified, "
+            f"{self.unchanged} unchanged), {self.misses} misses"
+        )
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Async RSS crawl engine used by keyword_extractor_systemd.py.
+
+Feeds are downloaded concurrently through one shared httpx connection pool,
+bounded by a global limit and a per-host limit, with a deadline per feed.
+Parsing with feedparser runs in a worker thread so it never blocks the loop.
+With a FeedCache attached, requests are conditional and unchanged feeds are
+returned with `skipped` set instead of being parsed.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import feedparser
+import httpx
+
+DEFAULT_CONCURRENCY = 32    # Số feed tải song song tối đa
+DEFAULT_PER_HOST = 4        # Số kết nối song song tối đa tới cùng một host
+DEFAULT_DEADLINE = 30       # Giây, cho mỗi feed
+DEFAULT_MAX_ENTRIES = 20    # Chỉ giữ 20 entry đầu của mỗi feed
+
+USER_AGENT = "Mozilla/5.0 (compatible; rss-feed-crawler/1.0)"
+
+
+@dataclass
+class FeedResult:
+    rss_id: Any
+    url: str
+    feed: Optional[Any] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    skipped: bool = False           # Feed không đổi kể từ lần crawl trước
+    state: Optional[Dict] = None    # Trạng thái cache cần lưu sau khi xử lý
+
+
+@dataclass
+class CrawlStats:
+    feeds: int = 0
+    ok: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def feeds_per_sec(self) -> float:
+        return self.feeds / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def p95_latency(self) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = max(0, int(round(0.95 * len(ordered))) - 1)
+        return ordered[index]
+
+    def summary(self) -> str:
+        return (
+            f"Crawl: {self.feeds} feeds ({self.ok} ok, {self.failed} failed) "
+            f"in {self.elapsed:.2f}s | {self.feeds_per_sec:.1f} feeds/s | "
+            f"p95 fetch {self.p95_latency * 1000:.0f} ms"
+        )
+
+
+def parse_feed(content: bytes, max_entries: int = DEFAULT_MAX_ENTRIES):
+    """Parse raw feed bytes, keeping only the first `max_entries` entries."""
+    feed = feedparser.parse(content)
+    feed["entries"] = feed.entries[:max_entries]
+    return feed
+
+
+class FeedCrawler:
+    def __init__(self,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 per_host: int = DEFAULT_PER_HOST,
+                 deadline: float = DEFAULT_DEADLINE,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 cache=None):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.deadline = deadline
+        self.max_entries = max_entries
+        self.cache = cache
+        self.stats = CrawlStats()
+        self._global_limit: Optional[asyncio.Semaphore] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.concurrency,
+                                max_keepalive_connections=self.concurrency),
+            timeout=httpx.Timeout(self.deadline),
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+        )
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        return self._host_limits[host]
+
+    async def crawl(self, sources: Iterable[Dict]) -> List[FeedResult]:
+        """
+        Tải và parse tất cả feed trong `sources` (các dòng của bảng `rss`,
+        gồm `id` và `rss_link`). Kết quả trả về theo thứ tự của `sources`.
+        """
+        sources = list(sources)
+        self.stats = CrawlStats(feeds=len(sources))
+        self._global_limit = asyncio.Semaphore(self.concurrency)
+        self._host_limits = {}
+        if self.cache is not None:
+            self.cache.load(source["id"] for source in sources)
+
+        started = time.perf_counter()
+        async with self._create_client() as client:
+            results = await asyncio.gather(
+                *(self._fetch_one(client, source) for source in sources)
+            )
+        self.stats.elapsed = time.perf_counter() - started
+        return list(results)
+
+    async def _download(self, client: httpx.AsyncClient, url: str,
+                        headers: Dict[str, str]) -> httpx.Response:
+        response = await client.get(url, headers=headers)
+        if response.status_code != 304:  # httpx coi 304 là lỗi redirect
+            response.raise_for_status()
+        return response
+
+    async def _fetch_one(self, client: httpx.AsyncClient, source: Dict) -> FeedResult:
+        result = FeedResult(rss_id=source["id"], url=source["rss_link"])
+        headers = self.cache.request_headers(result.rss_id) if self.cache is not None else {}
+
+        # Chờ slot của host trước: feed đang đợi host bận không giữ slot toàn cục
+        async with self._host_limit(result.url), self._global_limit:
+            started = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(
+                    self._download(client, result.url, headers), self.deadline
+                )
+                result.status_code = response.status_code
+            except Exception as e:
+                result.error = str(e) or type(e).__name__
+            finally:
+                result.elapsed = time.perf_counter() - started
+                self.stats.latencies.append(result.elapsed)
+
+        if result.error:
+            self.stats.failed += 1
+            print(f"⚠️ Could not load RSS ({result.url}) in {self.deadline} seconds: {result.error}")
+            return result
+
+        if self.cache is not None:
+            result.state = self.cache.check(result.rss_id, response.status_code,
+                                            response.headers, response.content)
+            if result.state is None:
+                result.skipped = True
+                self.stats.ok += 1
+                return result
+
+        try:
+            result.feed = await asyncio.to_thread(parse_feed, response.content, self.max_entries)
+            self.stats.ok += 1
+        except Exception as e:
+            self.stats.failed += 1
+            result.error = str(e)
+            print(f"⚠️ Could not parse RSS ({result.url}): {e}")
+
+        return result
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Keyword statistics maintained in Redis while the extractor writes.
+
+Hot-keywords leaderboard: one sorted set per publication day,
+`hot_keywords:day:YYYYMMDD`, scoring keyword_id by the number of articles
+tagged with it, plus a `hot_keywords:names` hash of keyword_id -> name.
+The API unions the last N days (optionally time-decayed) and reads the top
+of the union, see app/services/keyword_stats_service.py.
+
+Keyword co-occurrence: `kw_cooc:{keyword_id}` sorted sets scoring each
+neighbour keyword_id by the number of articles tagged with both, plus
+`kw_cooc:df` (keyword_id -> number of articles) and `kw_cooc:articles`
+(total articles) so the API can score neighbours by PMI or Jaccard with a
+single pipelined read. Counts are exact when written; `prune()` trims the
+sets touched since the last prune (`kw_cooc:dirty`) to a buffer of
+KEYWORD_COOC_BUFFER neighbours, well above the top KEYWORD_COOC_MAX_NEIGHBOURS
+the API reads, so a neighbour that starts with count 1 can still climb.
+`kw_cooc:seen` (article_id -> keyword_ids already counted) makes recording
+idempotent per article: retries and backfills only add the keywords an
+article did not have, paired with all of its keywords. After upgrading from
+a version without it, run rebuild-keyword-cooccurrence once.
+"""
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from itertools import permutations
+from typing import Dict, Iterable, Optional
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+HOT_KEYWORDS_WINDOW_DAYS = int(os.getenv("HOT_KEYWORDS_WINDOW_DAYS", 7))
+
+HOT_KEYWORDS_DAY_KEY = "hot_keywords:day:{day}"
+HOT_KEYWORDS_NAMES_KEY = "hot_keywords:names"
+
+KEYWORD_COOC_MAX_NEIGHBOURS = int(os.getenv("KEYWORD_COOC_MAX_NEIGHBOURS", 200))
+KEYWORD_COOC_BUFFER = int(os.getenv("KEYWORD_COOC_BUFFER", 4 * KEYWORD_COOC_MAX_NEIGHBOURS))
+KEYWORD_COOC_KEY = "kw_cooc:{keyword_id}"
+KEYWORD_COOC_DF_KEY = "kw_cooc:df"
+KEYWORD_COOC_ARTICLES_KEY = "kw_cooc:articles"
+KEYWORD_COOC_DIRTY_KEY = "kw_cooc:dirty"
+KEYWORD_COOC_SEEN_KEY = "kw_cooc:seen"
+
+
+def parse_day(pub_date) -> Optional[str]:
+    """'2025-05-20T08:00:00+00:00' -> '20250520', None nếu không đọc được."""
+    if not pub_date:
+        return None
+    try:
+        return datetime.fromisoformat(str(pub_date).replace("Z", "+00:00")).strftime("%Y%m%d")
+    except ValueError:
+        return None
+
+
+class HotKeywordLeaderboard:
+    def __init__(self, url: str = REDIS_URL, window_days: int = HOT_KEYWORDS_WINDOW_DAYS):
+        import redis  # Chỉ cần khi bật leaderboard
+
+        self.redis = redis.from_url(url, decode_responses=True)
+        self.window_days = window_days
+
+    def _oldest_day(self) -> str:
+        oldest = datetime.now(timezone.utc) - timedelta(days=self.window_days)
+        return oldest.strftime("%Y%m%d")
+
+    def record(self, pairs: Iterable[Dict], pub_dates: Dict[int, str]) -> int:
+        """
+        Cộng điểm cho các cặp article_keyword mới ghi. `pairs` gồm article_id,
+        keyword_id, keyword_name; `pub_dates` là article_id -> pub_date.
+        Bài cũ hơn cửa sổ thời gian bị bỏ qua. Trả về số cặp đã ghi nhận.
+        """
+        oldest = self._oldest_day()
+        pipe = self.redis.pipeline(transaction=False)
+        names = {}
+        recorded = 0
+        for pair in pairs:
+            day = parse_day(pub_dates.get(pair["article_id"]))
+            if day is None or day < oldest:
+                continue
+            key = HOT_KEYWORDS_DAY_KEY.format(day=day)
+            pipe.zincrby(key, 1, pair["keyword_id"])
+            # Giữ bucket lâu hơn cửa sổ một ngày để API luôn đủ dữ liệu
+            pipe.expire(key, (self.window_days + 1) * 86400)
+            if pair.get("keyword_name"):
+                names[pair["keyword_id"]] = pair["keyword_name"]
+            recorded += 1
+        if names:
+            pipe.hset(HOT_KEYWORDS_NAMES_KEY, mapping=names)
+        pipe.execute()
+        return recorded
+
+    def rebuild(self, client, page_size: int = 500) -> int:
+        """Dựng lại các bucket trong cửa sổ thời gian từ article/article_keyword."""
+        start = datetime.now(timezone.utc) - timedelta(days=self.window_days)
+        stale = list(self.redis.scan_iter(match=HOT_KEYWORDS_DAY_KEY.format(day="*")))
+        if stale:
+            self.redis.delete(*stale)
+
+        recorded = 0
+        last_id = 0
+        while True:
+            articles = client.table("article") \
+                             .select("article_id,pub_date") \
+                             .gte("pub_date", start.strftime("%Y-%m-%d")) \
+                             .gt("article_id", last_id) \
+                             .order("article_id") \
+                             .limit(page_size) \
+                             .execute().data
+            if not articles:
+                break
+            last_id = articles[-1]["article_id"]
+            pub_dates = {a["article_id"]: a["pub_date"] for a in articles}
+
+            rows = client.table("article_keyword") \
+                         .select("article_id,keyword_id,keyword(keyword_name)") \
+                         .in_("article_id", list(pub_dates)) \
+                         .execute().data
+            pairs = [{
+                "article_id": row["article_id"],
+                "keyword_id": row["keyword_id"],
+                "keyword_name": (row.get("keyword") or {}).get("keyword_name"),
+            } for row in rows]
+            recorded += self.record(pairs, pub_dates)
+
+        print(f"✅ Hot keywords rebuilt: {recorded} article_keyword rows in the last {self.window_days} days")
+        return recorded
+
+
+class KeywordCooccurrence:
+    def __init__(self, url: str = REDIS_URL, buffer: int = KEYWORD_COOC_BUFFER):
+        import redis  # Chỉ cần khi bật co-occurrence
+
+        self.redis = redis.from_url(url, decode_responses=True)
+        self.buffer = buffer
+
+    def record(self, pairs: Iterable[Dict]) -> int:
+        """
+        Cập nhật co-occurrence từ các cặp article_keyword (article_id,
+        keyword_id, keyword_name). Cặp đã ghi nhận trước đó được bỏ qua; keyword
+        mới của một bài được ghép với toàn bộ keyword của bài (cả keyword cũ).
+        Trả về số bài viết có thay đổi.
+        """
+        by_article = defaultdict(set)
+        names = {}
+        for pair in pairs:
+            by_article[pair["article_id"]].add(int(pair["keyword_id"]))
+            if pair.get("keyword_name"):
+                names[pair["keyword_id"]] = pair["keyword_name"]
+        if not by_article:
+            return 0
+
+        article_ids = list(by_article)
+        seen = self.redis.hmget(KEYWORD_COOC_SEEN_KEY, article_ids)
+        pipe = self.redis.pipeline(transaction=False)
+        touched = set()
+        new_articles = 0
+        seen_updates = {}
+        for article_id, counted in zip(article_ids, seen):
+            old = {int(kid) for kid in counted.split(",")} if counted else set()
+            new = by_article[article_id] - old
+            if not new:
+                continue
+            new_articles += not counted
+            for keyword_id in new:
+                pipe.hincrby(KEYWORD_COOC_DF_KEY, keyword_id, 1)
+            for a, b in permutations(new, 2):
+                pipe.zincrby(KEYWORD_COOC_KEY.format(keyword_id=a), 1, b)
+            for a in new:
+                for b in old:
+                    pipe.zincrby(KEYWORD_COOC_KEY.format(keyword_id=a), 1, b)
+                    pipe.zincrby(KEYWORD_COOC_KEY.format(keyword_id=b), 1, a)
+            if len(new | old) > 1:
+                touched |= new | old
+            seen_updates[article_id] = ",".join(str(kid) for kid in sorted(new | old))
+        if new_articles:
+            pipe.incrby(KEYWORD_COOC_ARTICLES_KEY, new_articles)
+        if seen_updates:
+            pipe.hset(KEYWORD_COOC_SEEN_KEY, mapping=seen_updates)
+        # Không cắt ngay ở đây (hàng xóm mới vào với điểm 1 sẽ bị loại ngay), prune() cắt sau
+        if touched:
+            pipe.sadd(KEYWORD_COOC_DIRTY_KEY, *touched)
+        if names:
+            pipe.hset(HOT_KEYWORDS_NAMES_KEY, mapping=names)
+        pipe.execute()
+        return len(seen_updates)
+
+    def prune(self, batch_size: int = 500) -> int:
+        """Cắt các tập đã thay đổi từ lần prune trước về `buffer` hàng xóm. Trả về số tập đã xét."""
+        pruned = 0
+        while True:
+            keyword_ids = self.redis.spop(KEYWORD_COOC_DIRTY_KEY, batch_size)
+            if not keyword_ids:
+                return pruned
+            pipe = self.redis.pipeline(transaction=False)
+            for keyword_id in keyword_ids:
+                pipe.zremrangebyrank(KEYWORD_COOC_KEY.format(keyword_id=keyword_id), 0, -(self.buffer + 1))
+            pipe.execute()
+            pruned += len(keyword_ids)
+
+    def rebuild(self, client, page_size: int = 1000) -> int:
+        """Dựng lại toàn bộ co-occurrence từ bảng article_keyword."""
+        stale = list(self.redis.scan_iter(match=KEYWORD_COOC_KEY.format(keyword_id="*")))
+        for i in range(0, len(stale), 1000):
+            self.redis.delete(*stale[i:i + 1000])
+
+        recorded = 0
+        pending = []
+        last_article, last_keyword = 0, 0
+        while True:
+            rows = client.table("article_keyword") \
+                         .select("article_id,keyword_id,keyword(keyword_name)") \
+                         .or_(f"article_id.gt.{last_article},"
+                              f"and(article_id.eq.{last_article},keyword_id.gt.{last_keyword})") \
+                         .order("article_id").order("keyword_id") \
+                         .limit(page_size) \
+                         .execute().data
+            pending.extend({
+                "article_id": row["article_id"],
+                "keyword_id": row["keyword_id"],
+                "keyword_name": (row.get("keyword") or {}).get("keyword_name"),
+            } for row in rows)
+            if len(rows) < page_size:
+                recorded += self.record(pending)
+                break
+            last_article, last_keyword = rows[-1]["article_id"], rows[-1]["keyword_id"]
+            # Giữ lại bài cuối trang vì có thể còn keyword ở trang sau
+            complete = [p for p in pending if p["article_id"] != last_article]
+            pending = [p for p in pending if p["article_id"] == last_article]
+            recorded += self.record(complete)
+
+        self.prune()
+        print(f"✅ Keyword co-occurrence rebuilt from {recorded} articles")
+        return recorded
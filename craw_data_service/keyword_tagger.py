@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""POS-tagging stage of the keyword extractor.
+
+Titles are tagged with underthesea and filtered down to final keywords in
+the same process, so only short keyword lists cross the process boundary.
+With workers > 1 the batches go to a process pool in which every worker
+loads the underthesea model once, in its initializer.
+
+Each worker holds its own copy of the model, so keep the worker count in
+line with the MemoryLimit of the systemd unit. If a worker dies (e.g. killed
+by the OOM killer) the pool is broken; it is then replaced and the batch
+retried once.
+
+Benchmark titles/sec at several worker counts:
+    python keyword_tagger.py bench titles.txt [1,2,4,8]
+"""
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+STOPWORDS_PATH = os.getenv("STOPWORDS_PATH", "/article_service/vietnamese-stopwords.txt")
+DEFAULT_WORKERS = 1
+DEFAULT_CHUNK_SIZE = 32
+
+_pos_tag = None
+_stopwords = None
+
+
+def _init_worker(stopwords_path: str = STOPWORDS_PATH) -> None:
+    """Nạp stopwords và model underthesea một lần cho mỗi process."""
+    global _pos_tag, _stopwords
+    from underthesea import pos_tag
+
+    with open(stopwords_path, 'r', encoding='utf-8') as f:
+        _stopwords = set(line.strip().lower() for line in f if line.strip())
+    _pos_tag = pos_tag
+    _pos_tag("khởi động mô hình")  # Ép model nạp ngay thay vì ở bài đầu tiên
+
+
+def is_valid_keyword(word):
+    word = word.strip()
+    tokens = word.split()
+    if len(word) <= 1:
+        return False
+    if re.search(r"[^a-zA-Z0-9\sàáảãạâầấẩẫậăằắẳẵặđèéẻẽẹêềếểễệìíỉĩịòóỏõọôồốổỗộơờớởỡợùúủũụưừứửữựỳýỷỹỵ]", word):
+        return False
+    if "'" in word or '"' in word:
+        return False
+    if any(len(token) <= 2 for token in tokens):
+        return False
+    return len(tokens) >= 2
+
+
+def is_stopword(word):
+    return any(token in _stopwords for token in word.lower().split())
+
+
+def extract_keywords(title: str) -> List[str]:
+    """Danh từ (cụm danh từ) hợp lệ, không phải stopword, của một tiêu đề."""
+    if _pos_tag is None:
+        _init_worker()
+
+    pos = _pos_tag(title)
+    keywords = [word for word, tag in pos if tag.startswith("N")]
+    filtered = {
+        word.lower() for word in keywords
+        if is_valid_keyword(word) and not is_stopword(word)
+    }
+    return sorted(filtered)
+
+
+def _tag_batch(titles: List[str]) -> List[List[str]]:
+    return [extract_keywords(title) for title in titles]
+
+
+class KeywordTagger:
+    def __init__(self, workers: int = DEFAULT_WORKERS, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        return self._pool
+
+    def tag(self, titles: List[str]) -> List[List[str]]:
+        """Trả về danh sách từ khóa cho từng tiêu đề, giữ nguyên thứ tự."""
+        if self.workers <= 1:
+            return _tag_batch(titles)
+
+        chunks = [titles[i:i + self.chunk_size] for i in range(0, len(titles), self.chunk_size)]
+        try:
+            return self._map(chunks)
+        except BrokenProcessPool as e:
+            # Một worker đã chết: bỏ pool hỏng, tạo pool mới và thử lại một lần
+            print(f"⚠️ Process pool bị hỏng ({e}), khởi tạo lại và thử lại")
+            self._discard_pool()
+            return self._map(chunks)
+
+    def _map(self, chunks: List[List[str]]) -> List[List[str]]:
+        results = []
+        for batch in self._get_pool().map(_tag_batch, chunks):
+            results.extend(batch)
+        return results
+
+    def _discard_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def benchmark(titles: List[str], worker_counts=(1, 2, 4, 8), chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+    for workers in worker_counts:
+        tagger = KeywordTagger(workers=workers, chunk_size=chunk_size)
+        tagger.tag(titles[:workers * chunk_size])  # Khởi động worker, không tính thời gian nạp model
+        started = time.perf_counter()
+        tagger.tag(titles)
+        elapsed = time.perf_counter() - started
+        tagger.close()
+        print(f"{workers} worker(s): {len(titles) / elapsed:.1f} titles/s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "bench":
+        with open(sys.argv[2], 'r', encoding='utf-8') as f:
+            bench_titles = [line.strip() for line in f if line.strip()]
+        counts = tuple(int(n) for n in sys.argv[3].split(",")) if len(sys.argv) > 3 else (1, 2, 4, 8)
+        benchmark(bench_titles, counts)
+    else:
+        print("Usage: python keyword_tagger.py bench <titles.txt> [1,2,4,8]")
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Bulk keyword and article_keyword writes for the keyword extractor.
+
+For a batch of articles, all candidate keyword_md5s are resolved with
+chunked `in_` queries, missing keywords are inserted in one call, and all
+(article_id, keyword_id) pairs are written with on-conflict-ignore. A
+process-local LRU from keyword_md5 to keyword_id sits in front, so hot
+keywords never reach the database.
+"""
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_CACHE_SIZE = 50_000
+DEFAULT_LOOKUP_SIZE = 200   # Số md5 mỗi câu `in_`
+DEFAULT_CHUNK_SIZE = 500    # Số dòng mỗi lần insert
+
+
+def generate_md5(text):
+    """Tạo mã băm MD5 cho từ khóa"""
+    return hashlib.md5(text.lower().encode('utf-8')).hexdigest()
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.data: "OrderedDict[str, int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[int]:
+        value = self.data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: int) -> None:
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+
+class KeywordWriter:
+    def __init__(self, client, cache_size: int = DEFAULT_CACHE_SIZE,
+                 lookup_size: int = DEFAULT_LOOKUP_SIZE, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.client = client
+        self.cache = LRUCache(cache_size)
+        self.lookup_size = lookup_size
+        self.chunk_size = chunk_size
+        self.round_trips = 0
+        self.articles = 0
+        self.pairs = 0
+        self._pair_upsert = True  # Tắt nếu article_keyword không có unique (article_id, keyword_id)
+
+    def resolve_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        """keyword_name -> keyword_id, tạo keyword mới nếu chưa có."""
+        by_md5 = {generate_md5(name): name for name in names}
+        ids: Dict[str, int] = {}
+        missing = []
+        for md5 in by_md5:
+            keyword_id = self.cache.get(md5)
+            if keyword_id is None:
+                missing.append(md5)
+            else:
+                ids[md5] = keyword_id
+
+        for i in range(0, len(missing), self.lookup_size):
+            resp = self.client.table("keyword") \
+                              .select("keyword_id,keyword_md5") \
+                              .in_("keyword_md5", missing[i:i + self.lookup_size]) \
+                              .execute()
+            self.round_trips += 1
+            ids.update((row["keyword_md5"], row["keyword_id"]) for row in resp.data)
+
+        new_rows = [{"keyword_name": by_md5[md5], "keyword_md5": md5}
+                    for md5 in missing if md5 not in ids]
+        for i in range(0, len(new_rows), self.chunk_size):
+            resp = self.client.table("keyword").insert(new_rows[i:i + self.chunk_size]).execute()
+            self.round_trips += 1
+            ids.update((row["keyword_md5"], row["keyword_id"]) for row in resp.data)
+
+        for md5 in missing:
+            if md5 in ids:
+                self.cache.put(md5, ids[md5])
+        return {by_md5[md5]: keyword_id for md5, keyword_id in ids.items()}
+
+    def _insert_pairs(self, pairs: List[Dict]) -> List[Dict]:
+        if self._pair_upsert:
+            try:
+                resp = self.client.table("article_keyword") \
+                                  .upsert(pairs, on_conflict="article_id,keyword_id", ignore_duplicates=True) \
+                                  .execute()
+                self.round_trips += 1
+                return resp.data
+            except Exception as e:
+                self.round_trips += 1
+                self._pair_upsert = False
+                print(f"⚠️ article_keyword upsert unavailable, falling back to select + insert: {e}")
+
+        # Fallback: lọc các cặp đã tồn tại rồi insert phần còn lại
+        resp = self.client.table("article_keyword") \
+                          .select("article_id,keyword_id") \
+                          .in_("article_id", sorted({p["article_id"] for p in pairs})) \
+                          .execute()
+        self.round_trips += 1
+        existing = {(row["article_id"], row["keyword_id"]) for row in resp.data}
+        new_pairs = [p for p in pairs if (p["article_id"], p["keyword_id"]) not in existing]
+        if not new_pairs:
+            return []
+        resp = self.client.table("article_keyword").insert(new_pairs).execute()
+        self.round_trips += 1
+        return resp.data
+
+    def write(self, article_keywords: Dict[int, List[str]]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Ghi từ khóa cho một lô bài viết ({article_id: [keyword, ...]}).
+        Trả về (các cặp article_keyword mới được thêm, tất cả các cặp của lô),
+        đều kèm keyword_name.
+        """
+        ids = self.resolve_ids({kw for keywords in article_keywords.values() for kw in keywords})
+        pairs = [
+            {"article_id": article_id, "keyword_id": ids[kw]}
+            for article_id, keywords in article_keywords.items()
+            for kw in set(keywords) if kw in ids
+        ]
+
+        inserted = []
+        for i in range(0, len(pairs), self.chunk_size):
+            inserted.extend(self._insert_pairs(pairs[i:i + self.chunk_size]))
+
+        names = {keyword_id: name for name, keyword_id in ids.items()}
+        for row in inserted + pairs:
+            row["keyword_name"] = names.get(row["keyword_id"])
+
+        self.articles += len(article_keywords)
+        self.pairs += len(pairs)
+        return inserted, pairs
+
+    def summary(self) -> str:
+        per_article = self.round_trips / self.articles if self.articles else 0.0
+        # Cách cũ: select + insert cho keyword và cho article_keyword, tối đa 4 lần/cặp
+        legacy = 4 * self.pairs / self.articles if self.articles else 0.0
+        hit_total = self.cache.hits + self.cache.misses
+        hit_rate = self.cache.hits / hit_total if hit_total else 0.0
+        return (
+            f"Keyword writer: {self.round_trips} round trips for {self.articles} articles "
+            f"({per_article:.2f}/article, previously up to {legacy:.2f}/article), "
+            f"keyword cache hit rate {hit_rate:.1%}"
+        )
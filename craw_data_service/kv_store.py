@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Small key/value stores for crawler state that must survive restarts.
+
+Two backends share one interface and store JSON values under a namespace:
+- SQLiteStore: a local file next to the scripts (default).
+- RedisStore: same key layout and JSON encoding as app/core/redis.py.
+
+The backend is chosen with CRAWLER_STATE_BACKEND ("sqlite" or "redis").
+"""
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "crawler_state.db")
+
+STATE_BACKEND = os.getenv("CRAWLER_STATE_BACKEND", "sqlite")
+STATE_PATH = os.getenv("CRAWLER_STATE_PATH", DEFAULT_STATE_PATH)
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+
+
+class SQLiteStore:
+    def __init__(self, path: str, namespace: str):
+        self.namespace = namespace
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self.conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self.conn.execute(
+            "SELECT value FROM kv WHERE namespace = ? AND key = ?",
+            (self.namespace, str(key)),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = [str(k) for k in keys]
+        found = {}
+        # SQLite giới hạn số tham số mỗi câu lệnh, nên chia nhỏ danh sách key
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT key, value FROM kv WHERE namespace = ? AND key IN ({placeholders})",
+                (self.namespace, *chunk),
+            ).fetchall()
+            found.update((k, json.loads(v)) for k, v in rows)
+        return found
+
+    def set(self, key: str, value: Any) -> None:
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[str, Any]) -> None:
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO kv (namespace, key, value) VALUES (?, ?, ?)",
+            [(self.namespace, str(k), json.dumps(v, default=str)) for k, v in items.items()],
+        )
+        self.conn.commit()
+
+    def delete(self, *keys: str) -> None:
+        self.conn.executemany(
+            "DELETE FROM kv WHERE namespace = ? AND key = ?",
+            [(self.namespace, str(k)) for k in keys],
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class RedisStore:
+    def __init__(self, url: str, namespace: str, ttl: Optional[int] = None):
+        import redis  # Chỉ cần khi dùng backend redis
+
+        self.namespace = namespace
+        self.ttl = ttl
+        self.redis = redis.from_url(url, decode_responses=True)
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.redis.get(self._key(key))
+        return json.loads(value) if value else None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = [str(k) for k in keys]
+        if not keys:
+            return {}
+        values = self.redis.mget([self._key(k) for k in keys])
+        return {k: json.loads(v) for k, v in zip(keys, values) if v}
+
+    def set(self, key: str, value: Any) -> None:
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[str, Any]) -> None:
+        pipe = self.redis.pipeline()
+        for k, v in items.items():
+            json_value = json.dumps(v, default=str)
+            if self.ttl:
+                pipe.setex(self._key(k), self.ttl, json_value)
+            else:
+                pipe.set(self._key(k), json_value)
+        pipe.execute()
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.redis.delete(*(self._key(k) for k in keys))
+
+    def close(self) -> None:
+        self.redis.close()
+
+
+def open_store(namespace: str, ttl: Optional[int] = None):
+    """Mở store theo cấu hình CRAWLER_STATE_BACKEND."""
+    if STATE_BACKEND == "redis":
+        return RedisStore(REDIS_URL, namespace, ttl=ttl)
+    return SQLiteStore(STATE_PATH, namespace)
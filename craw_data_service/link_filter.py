@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Persistent Bloom filter of known `link_article_md5` values.
+
+An md5 that is not in the filter has definitely never been stored, so the
+crawler can insert it without asking the database. Anything the filter
+reports as possibly seen is still checked against `article` in a batch.
+
+Sizing: m = -n*ln(p) / ln(2)^2 bits and k = m/n*ln(2) hash functions.
+The default 5 million links at a 1% false-positive rate take about 6 MB.
+
+While a crawl writes articles the filter is marked dirty (`<path>.dirty`);
+`save()` clears the mark. A run killed in between leaves the mark behind, the
+file on disk may then miss stored links, so it is not loaded again until
+`rebuild-link-filter` replaces it.
+"""
+import math
+import os
+import struct
+from typing import Iterable
+
+DEFAULT_CAPACITY = 5_000_000
+DEFAULT_ERROR_RATE = 0.01
+DEFAULT_FILTER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "known_links.bloom")
+
+LINK_FILTER_PATH = os.getenv("LINK_FILTER_PATH", DEFAULT_FILTER_PATH)
+LINK_FILTER_CAPACITY = int(os.getenv("LINK_FILTER_CAPACITY", DEFAULT_CAPACITY))
+
+_MAGIC = b"BLM1"
+DIRTY_SUFFIX = ".dirty"
+_HEADER = struct.Struct("<4sQQQQ")  # magic, m bits, k hashes, count, capacity
+
+
+class BloomFilter:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE):
+        self.capacity = capacity
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, md5_hex: str):
+        # md5 đã phân bố đều, dùng trực tiếp hai nửa làm double hashing
+        digest = bytes.fromhex(md5_hex)
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, md5_hex: str) -> None:
+        for pos in self._positions(md5_hex):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def update(self, md5s: Iterable[str]) -> None:
+        for md5_hex in md5s:
+            self.add(md5_hex)
+
+    def __contains__(self, md5_hex: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(md5_hex))
+
+    @property
+    def error_rate(self) -> float:
+        """Tỉ lệ dương tính giả ước tính với số phần tử hiện tại."""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+    @property
+    def is_saturated(self) -> bool:
+        return self.count > self.capacity
+
+    def save(self, path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.size, self.hashes, self.count, self.capacity))
+            f.write(self.bits)
+        os.replace(tmp_path, path)  # Ghi nguyên tử, không để lại file hỏng khi bị kill
+        if os.path.exists(path + DIRTY_SUFFIX):
+            os.remove(path + DIRTY_SUFFIX)
+
+    @staticmethod
+    def mark_dirty(path: str) -> None:
+        """Đánh dấu file filter có thể thiếu link cho tới lần save() tiếp theo."""
+        with open(path + DIRTY_SUFFIX, "w") as f:
+            f.write("")
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        with open(path, "rb") as f:
+            magic, size, hashes, count, capacity = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"Not a Bloom filter file: {path}")
+            bloom = cls.__new__(cls)
+            bloom.capacity = capacity
+            bloom.size = size
+            bloom.hashes = hashes
+            bloom.count = count
+            bloom.bits = bytearray(f.read())
+        if len(bloom.bits) != (size + 7) // 8:
+            raise ValueError(f"Truncated Bloom filter file: {path}")
+        return bloom
+
+
+def load_link_filter(path: str = LINK_FILTER_PATH):
+    """Nạp filter từ file, trả về None nếu chưa có, file hỏng hoặc bị đánh dấu dirty (cần rebuild)."""
+    if os.path.exists(path + DIRTY_SUFFIX):
+        print(f"⚠️ Link filter at {path} was not saved after the last crawl and may miss links; "
+              f"checking every link against the database until `rebuild-link-filter` is run")
+        return None
+    try:
+        bloom = BloomFilter.load(path)
+    except FileNotFoundError:
+        print(f"⚠️ Link filter not found at {path}, run `rebuild-link-filter` to create it")
+        return None
+    except Exception as e:
+        print(f"⚠️ Could not load link filter ({path}): {e}")
+        return None
+    if bloom.is_saturated:
+        print(f"⚠️ Link filter holds {bloom.count} links (capacity {bloom.capacity}), "
+              f"estimated false-positive rate {bloom.error_rate:.2%}; consider a rebuild")
+    return bloom
+
+
+def rebuild_link_filter(client, path: str = LINK_FILTER_PATH,
+                        capacity: int = LINK_FILTER_CAPACITY, page_size: int = 1000) -> BloomFilter:
+    """Dựng lại filter từ toàn bộ bảng `article` (phân trang theo article_id)."""
+    # Chừa chỗ cho số bài viết tăng gấp đôi trước khi filter bị bão hòa
+    total = client.table("article").select("article_id", count="exact").limit(1).execute().count or 0
+    bloom = BloomFilter(capacity=max(capacity, 2 * total))
+    last_id = 0
+    while True:
+        resp = client.table("article") \
+                     .select("article_id,link_article_md5") \
+                     .gt("article_id", last_id) \
+                     .order("article_id") \
+                     .limit(page_size) \
+                     .execute()
+        rows = resp.data
+        if not rows:
+            break
+        bloom.update(row["link_article_md5"] for row in rows if row.get("link_article_md5"))
+        last_id = rows[-1]["article_id"]
+
+    bloom.save(path)
+    print(f"✅ Link filter rebuilt: {bloom.count} links, {len(bloom.bits) / 1024 / 1024:.1f} MB, "
+          f"estimated false-positive rate {bloom.error_rate:.2%}")
+    return bloom
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""In-memory rss_id -> newspaper metadata map.
+
+Only a few hundred feeds exist, so the whole `rss` and `newspaper` tables
+are loaded with two queries and refreshed when the TTL expires, instead of
+two lookups per article. Unknown rss_ids trigger an early refresh, at most
+once per `min_refresh_interval`, so newly added feeds are picked up.
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+DEFAULT_TTL = 3600                  # Giây
+DEFAULT_MIN_REFRESH_INTERVAL = 60   # Giây giữa hai lần refresh do cache miss
+
+
+@dataclass
+class SourceInfo:
+    rss_id: int
+    newspaper_id: Optional[int] = None
+    is_vn: bool = True
+    newspaper: Dict[str, Any] = field(default_factory=dict)  # Toàn bộ dòng newspaper
+
+
+class SourceLookup:
+    def __init__(self, client, ttl: float = DEFAULT_TTL,
+                 min_refresh_interval: float = DEFAULT_MIN_REFRESH_INTERVAL):
+        self.client = client
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.sources: Dict[int, SourceInfo] = {}
+        self.loaded_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def refresh(self) -> None:
+        """Nạp lại toàn bộ map bằng hai truy vấn."""
+        newspapers = self.client.table("newspaper").select("*").execute().data
+        by_newspaper = {row["newspaper_id"]: row for row in newspapers}
+
+        rss_rows = self.client.table("rss").select("id,newspaper_id").execute().data
+        sources = {}
+        for row in rss_rows:
+            newspaper = by_newspaper.get(row.get("newspaper_id")) or {}
+            sources[row["id"]] = SourceInfo(
+                rss_id=row["id"],
+                newspaper_id=row.get("newspaper_id"),
+                is_vn=newspaper.get("is_vn", True),
+                newspaper=newspaper,
+            )
+
+        self.sources = sources
+        self.loaded_at = time.monotonic()
+        self.refreshes += 1
+
+    def invalidate(self) -> None:
+        """Buộc lần tra cứu tiếp theo nạp lại dữ liệu."""
+        self.loaded_at = 0.0
+
+    def _age(self) -> float:
+        return time.monotonic() - self.loaded_at
+
+    def get(self, rss_id) -> Optional[SourceInfo]:
+        if not self.loaded_at or self._age() > self.ttl:
+            self.refresh()
+
+        info = self.sources.get(rss_id)
+        if info is not None:
+            self.hits += 1
+            return info
+
+        self.misses += 1
+        if self._age() > self.min_refresh_interval:
+            self.refresh()
+            return self.sources.get(rss_id)
+        return None
+
+    def is_vn(self, rss_id) -> Optional[bool]:
+        info = self.get(rss_id)
+        return info.is_vn if info is not None else None
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"Source lookup: {len(self.sources)} feeds, hit rate {self.hit_rate:.1%} "
+            f"({self.hits} hits, {self.misses} misses, {self.refreshes} refreshes)"
+        )
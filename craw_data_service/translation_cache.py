@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Content-addressed translation cache for non-Vietnamese titles.
+
+Translations are stored under sha256(target language + source text) in the
+crawler kv_store (SQLite file or Redis), so a title is translated at most
+once. Cache misses are sent to the backend in batches. Failed calls are
+retried with exponential backoff and full jitter; texts still untranslated
+after the retries come back as None so the caller can retry them later.
+
+TRANSLATOR_BACKEND=fake swaps GoogleTranslator for an offline stand-in.
+"""
+import hashlib
+import os
+import random
+import time
+from typing import Dict, List, Optional
+
+from kv_store import open_store
+
+TRANSLATOR_BACKEND = os.getenv("TRANSLATOR_BACKEND", "google")
+DEFAULT_RETRIES = 3
+DEFAULT_BASE_DELAY = 1.0    # Giây
+DEFAULT_MAX_DELAY = 30.0    # Giây
+DEFAULT_BATCH_SIZE = 20
+
+
+def translation_key(text: str, target: str) -> str:
+    return hashlib.sha256(f"{target}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class FakeTranslator:
+    """Backend giả, không gọi mạng: trả về văn bản gắn tiền tố ngôn ngữ đích."""
+
+    def __init__(self, source: str = "auto", target: str = "vi"):
+        self.target = target
+        self.calls = 0
+
+    def translate(self, text: str) -> str:
+        self.calls += 1
+        return f"[{self.target}] {text}"
+
+    def translate_batch(self, batch: List[str]) -> List[str]:
+        self.calls += 1
+        return [f"[{self.target}] {text}" for text in batch]
+
+
+def create_backend(target: str = "vi"):
+    if TRANSLATOR_BACKEND == "fake":
+        return FakeTranslator(source="auto", target=target)
+    from deep_translator import GoogleTranslator
+    return GoogleTranslator(source="auto", target=target)
+
+
+def backoff_delay(attempt: int, base_delay: float = DEFAULT_BASE_DELAY,
+                  max_delay: float = DEFAULT_MAX_DELAY) -> float:
+    """Exponential backoff với full jitter: ngẫu nhiên trong [0, base * 2^attempt]."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class CachedTranslator:
+    def __init__(self, backend=None, store=None, target: str = "vi",
+                 retries: int = DEFAULT_RETRIES, base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.backend = backend if backend is not None else create_backend(target)
+        self.store = store if store is not None else open_store("translation")
+        self.target = target
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+
+    def _call_backend(self, batch: List[str]) -> List[str]:
+        for attempt in range(self.retries):
+            try:
+                if hasattr(self.backend, "translate_batch"):
+                    return self.backend.translate_batch(batch)
+                return [self.backend.translate(text) for text in batch]
+            except Exception as e:
+                print(f"⚠️ Lỗi dịch: {e}")
+                if attempt < self.retries - 1:
+                    time.sleep(backoff_delay(attempt, self.base_delay, self.max_delay))
+        raise RuntimeError(f"Translation failed after {self.retries} attempts")
+
+    def translate_many(self, texts: List[str]) -> List[Optional[str]]:
+        """Dịch danh sách văn bản; văn bản dịch lỗi (hết số lần thử) trả về None và không cache."""
+        keys = [translation_key(text, self.target) for text in texts]
+        cached = self.store.get_many(set(keys))
+        self.hits += sum(1 for key in keys if key in cached)
+
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached:
+                pending.setdefault(key, text)
+        self.misses += len(pending)
+
+        items = list(pending.items())
+        for i in range(0, len(items), self.batch_size):
+            chunk = items[i:i + self.batch_size]
+            try:
+                translated = self._call_backend([text for _, text in chunk])
+            except Exception:
+                self.failures += len(chunk)
+                continue
+            fresh = {key: result for (key, _), result in zip(chunk, translated) if result}
+            self.store.set_many(fresh)
+            cached.update(fresh)
+
+        return [cached.get(key) for key in keys]
+
+    def translate(self, text: str) -> Optional[str]:
+        return self.translate_many([text])[0]
+
+    def summary(self) -> str:
+        return (
+            f"Translation cache: {self.hits} hits, {self.misses} misses, "
+            f"{self.failures} failed translations"
+        )
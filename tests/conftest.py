@@ -0,0 +1,35 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "tests", "fixtures")
+
+# The crawler scripts import their siblings directly (run from craw_data_service/)
+sys.path.insert(0, os.path.join(ROOT, "craw_data_service"))
+sys.path.insert(0, ROOT)
+
+# app.core.config / the crawler create Supabase clients at import time; no request
+# ever reaches this URL, tests swap in fakes
+os.environ.setdefault("SUPABASE_URL", "http://localhost:1")
+os.environ.setdefault(
+    "SUPABASE_KEY",
+    "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJyb2xlIjoiYW5vbiJ9."
+    "MLy4OEqLi-Ium1uLT7hrWCBysJW70V5aC5j_HwYsnuQ"
+)
+# Crawler modules open their kv_store at import time; keep it out of the repo
+os.environ.setdefault("CRAWLER_STATE_PATH", os.path.join(tempfile.mkdtemp(), "crawler_state.db"))
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """fakeredis behind the app's global RedisClient (fresh, empty server per test)"""
+    import fakeredis
+    from app.core.redis import redis_client
+
+    server = fakeredis.FakeServer()
+    client = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(redis_client, "redis", client)
+    return client
@@ -0,0 +1,293 @@
+"""In-memory stand-ins for the Supabase client used by the crawler and the API.
+
+Only the PostgREST builder calls the code under test makes are supported:
+select/insert/upsert/delete with eq/neq/in_/gt/gte/lt/lte filters, `or_`
+and `params.add("and", ...)` logic trees (eq/neq/gt/gte/lt/lte/ilike,
+nested and()/or()), order,
+limit/range and `count`. Every execute() is recorded in `calls` so tests can
+count round trips. MemoryStore replaces the crawler's kv_store backends.
+StandInClient answers every query with an empty result
+after a fixed latency, for load tests.
+"""
+import json
+import re
+import time
+from copy import deepcopy
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+OPERATORS = {
+    "eq": lambda v, x: v is not None and str(v) == x,
+    "neq": lambda v, x: v is None or str(v) != x,
+    "gt": lambda v, x: v is not None and _typed(v, x) < v,
+    "gte": lambda v, x: v is not None and _typed(v, x) <= v,
+    "lt": lambda v, x: v is not None and _typed(v, x) > v,
+    "lte": lambda v, x: v is not None and _typed(v, x) >= v,
+    "ilike": lambda v, x: v is not None and re.fullmatch(
+        ".*".join(map(re.escape, x.split("%"))), str(v), re.IGNORECASE | re.DOTALL) is not None,
+}
+
+
+def _typed(value, text: str):
+    """PostgREST filter values are text; compare them as the column's type"""
+    return type(value)(text) if isinstance(value, (int, float)) else text
+
+
+def _split(conditions: str) -> List[str]:
+    """Split on top-level commas: "a.eq.1,and(b.gt.2,c.lt.3)" -> ["a.eq.1", "and(b.gt.2,c.lt.3)"]"""
+    parts, depth, current = [], 0, ""
+    for ch in conditions:
+        if ch == "," and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        depth += (ch == "(") - (ch == ")")
+        current += ch
+    return parts + [current] if current else parts
+
+
+def _condition(text: str):
+    """Predicate on a row for one PostgREST logic-tree condition"""
+    for logic, combine in (("and(", all), ("or(", any)):
+        if text.startswith(logic):
+            inner = [_condition(part) for part in _split(text[len(logic):-1])]
+            return lambda row: combine(predicate(row) for predicate in inner)
+    column, op, value = text.split(".", 2)
+    value = value.strip('"')
+    return lambda row: OPERATORS[op](row.get(column), value)
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeParams:
+    """`query.params`: a top-level and=(...)/or=(...) parameter becomes a filter"""
+
+    def __init__(self, query: "FakeQuery"):
+        self.query = query
+
+    def add(self, key, value):
+        self.query.filters.append((None, _condition(f"{key}{value}")))
+        return self
+
+
+class FakeQuery:
+    def __init__(self, db: "FakeSupabase", table: str):
+        self.db = db
+        self.table = table
+        self.op = "select"
+        self.rows: List[Dict] = []
+        self.filters = []
+        self.orders = []
+        self.offset = 0
+        self.max_rows: Optional[int] = None
+        self.count = None
+        self.head = False
+        self.on_conflict: List[str] = []
+        self.params = FakeParams(self)
+
+    # ---- Operations ----
+
+    def select(self, *columns, count=None, head=False):
+        self.op = "select"
+        self.count = count
+        self.head = head
+        return self
+
+    def insert(self, rows, **kwargs):
+        self.op = "insert"
+        self.rows = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def upsert(self, rows, on_conflict="", ignore_duplicates=False, **kwargs):
+        self.op = "upsert"
+        self.rows = rows if isinstance(rows, list) else [rows]
+        self.on_conflict = [c for c in on_conflict.split(",") if c]
+        return self
+
+    def delete(self):
+        self.op = "delete"
+        return self
+
+    # ---- Filters and modifiers ----
+
+    def _filter(self, column, predicate):
+        self.filters.append((column, predicate))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, lambda v: v == value)
+
+    def neq(self, column, value):
+        return self._filter(column, lambda v: v != value)
+
+    def in_(self, column, values):
+        values = set(values)
+        return self._filter(column, lambda v: v in values)
+
+    def gt(self, column, value):
+        return self._filter(column, lambda v: v is not None and v > value)
+
+    def gte(self, column, value):
+        return self._filter(column, lambda v: v is not None and v >= value)
+
+    def lt(self, column, value):
+        return self._filter(column, lambda v: v is not None and v < value)
+
+    def lte(self, column, value):
+        return self._filter(column, lambda v: v is not None and v <= value)
+
+    def or_(self, conditions):
+        predicate = _condition(f"or({conditions})")
+        self.filters.append((None, predicate))
+        return self
+
+    def order(self, column, desc=False, **kwargs):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, n):
+        self.max_rows = n
+        return self
+
+    def range(self, start, end):
+        self.offset = start
+        self.max_rows = end - start + 1
+        return self
+
+    # ---- Execution ----
+
+    def _matches(self, row) -> bool:
+        return all(predicate(row) if column is None else predicate(row.get(column))
+                   for column, predicate in self.filters)
+
+    def execute(self) -> FakeResponse:
+        self.db.calls.append((self.table, self.op))
+        if self.db.fail is not None and self.db.fail(self):
+            raise Exception(f"fake {self.op} on {self.table} failed")
+        table = self.db.tables.setdefault(self.table, [])
+
+        if self.op in ("insert", "upsert"):
+            return FakeResponse(self.db._write(self.table, self.rows, self.op, self.on_conflict))
+        if self.op == "delete":
+            removed = [row for row in table if self._matches(row)]
+            table[:] = [row for row in table if not self._matches(row)]
+            return FakeResponse(removed)
+
+        rows = [row for row in table if self._matches(row)]
+        for column, desc in reversed(self.orders):
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+        total = len(rows)
+        end = None if self.max_rows is None else self.offset + self.max_rows
+        rows = rows[self.offset:end]
+        return FakeResponse([] if self.head else deepcopy(rows), total if self.count else None)
+
+
+class FakeSupabase:
+    """
+    Tables are lists of dicts. `unique` maps a table to the columns of a
+    unique index: inserting a duplicate raises like PostgREST would (409).
+    `serial` maps a table to its identity column, filled in on insert.
+    `fail(query)` returning True makes that execute() raise.
+    """
+
+    def __init__(self, tables: Optional[Dict[str, List[Dict]]] = None,
+                 unique: Optional[Dict[str, List[str]]] = None,
+                 serial: Optional[Dict[str, str]] = None):
+        self.tables = deepcopy(tables) if tables else {}
+        self.unique = unique or {}
+        self.serial = serial or {}
+        self.calls = []
+        self.fail = None
+        self.rpcs = {}
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def rpc(self, name: str, params: Optional[Dict] = None):
+        db = self
+
+        class _Rpc:
+            def execute(self):
+                db.calls.append((name, "rpc"))
+                return FakeResponse(db.rpcs[name](**(params or {})))
+        return _Rpc()
+
+    def count(self, table: str, op: str) -> int:
+        return sum(1 for call in self.calls if call == (table, op))
+
+    def _write(self, table: str, rows: List[Dict], op: str, on_conflict: List[str]) -> List[Dict]:
+        stored = self.tables.setdefault(table, [])
+        columns = on_conflict or self.unique.get(table)
+        if columns:
+            seen = {tuple(row.get(c) for c in columns) for row in stored}
+            keys = [tuple(row.get(c) for c in columns) for row in rows]
+            if op == "insert" and (len(set(keys)) < len(keys) or seen.intersection(keys)):
+                raise Exception(f"duplicate key value violates unique constraint on {table}")
+            rows = [row for row, key in zip(rows, keys) if key not in seen]
+        written = deepcopy(rows)
+        column = self.serial.get(table)
+        if column:
+            next_id = max((row.get(column) or 0 for row in stored), default=0)
+            for row in written:
+                if row.get(column) is None:
+                    next_id += 1
+                    row[column] = next_id
+        stored.extend(written)
+        return written
+
+
+class MemoryStore:
+    """kv_store interface (SQLiteStore/RedisStore) over a dict, values JSON-round-tripped"""
+
+    def __init__(self):
+        self.data: Dict[str, str] = {}
+
+    def get(self, key):
+        value = self.data.get(str(key))
+        return json.loads(value) if value is not None else None
+
+    def get_many(self, keys):
+        return {str(k): json.loads(self.data[str(k)]) for k in keys if str(k) in self.data}
+
+    def set(self, key, value) -> None:
+        self.set_many({key: value})
+
+    def set_many(self, items) -> None:
+        self.data.update((str(k), json.dumps(v, default=str)) for k, v in items.items())
+
+    def delete(self, *keys) -> None:
+        for key in keys:
+            self.data.pop(str(key), None)
+
+    def close(self) -> None:
+        pass
+
+
+class StandInQuery:
+    """Query builder stand-in: chained calls return itself, execute() sleeps"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.params = None
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        time.sleep(self.latency)
+        return SimpleNamespace(data=[], count=0)
+
+
+class StandInClient:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def table(self, name: str) -> StandInQuery:
+        return StandInQuery(self.latency)
+
+    def rpc(self, name: str, params: Optional[Dict] = None) -> StandInQuery:
+        return StandInQuery(self.latency)
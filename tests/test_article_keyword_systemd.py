@@ -0,0 +1,127 @@
+from types import SimpleNamespace
+
+import pytest
+
+import article_keyword_systemd as extractor
+from fakes import FakeSupabase, MemoryStore
+from keyword_writer import KeywordWriter
+from translation_cache import CachedTranslator, FakeTranslator
+
+
+class FakeSourceLookup:
+    """rss_id 1 is a Vietnamese paper, rss_id 2 a foreign one"""
+
+    def get(self, rss_id):
+        return SimpleNamespace(is_vn=rss_id == 1)
+
+    def summary(self):
+        return "sources: fake"
+
+
+class FakeTagger:
+    def tag(self, titles):
+        return [[title.lower()] for title in titles]
+
+
+class DownTranslator(FakeTranslator):
+    def translate_batch(self, batch):
+        raise ConnectionError("translation API unreachable")
+
+
+def articles(ids, rss_id=1):
+    return [{"article_id": i, "title": f"Tin số {i}", "rss_id": rss_id, "pub_date": "2025-06-01"} for i in ids]
+
+
+@pytest.fixture
+def env(monkeypatch):
+    db = FakeSupabase({"article": articles(range(1, 6)) + articles(range(6, 8), rss_id=2)},
+                      unique={"keyword": ["keyword_md5"], "article_keyword": ["article_id", "keyword_id"]},
+                      serial={"keyword": "keyword_id"})
+    monkeypatch.setattr(extractor, "supabase", db)
+    monkeypatch.setattr(extractor, "checkpoint_store", MemoryStore())
+    monkeypatch.setattr(extractor, "source_lookup", FakeSourceLookup())
+    monkeypatch.setattr(extractor, "tagger", FakeTagger())
+    monkeypatch.setattr(extractor, "keyword_writer", KeywordWriter(db))
+    monkeypatch.setattr(extractor, "translator", CachedTranslator(backend=FakeTranslator(), store=MemoryStore()))
+    monkeypatch.setattr(extractor, "leaderboard", None)
+    monkeypatch.setattr(extractor, "cooccurrence", None)
+    return db
+
+
+def tagged(db):
+    return {row["article_id"] for row in db.tables.get("article_keyword", [])}
+
+
+def test_untranslated_titles_go_to_the_failed_list(env, monkeypatch):
+    monkeypatch.setattr(extractor, "translator", CachedTranslator(
+        backend=DownTranslator(), store=MemoryStore(), retries=1))
+
+    failed = extractor.process_articles(articles([1, 2]) + articles([6, 7], rss_id=2))
+
+    assert sorted(failed) == [6, 7]
+    # Foreign titles are not tagged in their original language
+    assert tagged(env) == {1, 2}
+
+
+@pytest.fixture
+def small_pages(monkeypatch):
+    fetch = extractor.fetch_article_page
+    monkeypatch.setattr(extractor, "fetch_article_page",
+                        lambda after_id, until_id=None: fetch(after_id, until_id, page_size=2))
+
+
+def test_checkpoint_resumes_after_a_crash_mid_range(env, small_pages):
+    # The third page fetch fails, as if the process died there
+    env.fail = lambda query: query.table == "article" and env.count("article", "select") == 3
+
+    with pytest.raises(Exception, match="fake select on article failed"):
+        extractor.extract_keywords_from_articles()
+
+    assert extractor.checkpoint_store.get(extractor.CHECKPOINT_KEY) == 4
+    assert tagged(env) == {1, 2, 3, 4}
+
+    env.fail = None
+    env.calls.clear()
+    extractor.extract_keywords_from_articles()
+
+    assert extractor.checkpoint_store.get(extractor.CHECKPOINT_KEY) == 7
+    assert tagged(env) == {1, 2, 3, 4, 5, 6, 7}
+    # Resumed after article 4 rather than from the start: 5-6, 7, then an empty page
+    assert env.count("article", "select") == 3
+
+
+def test_failed_articles_are_dropped_after_max_retries(env, monkeypatch):
+    extractor.checkpoint_store.set(extractor.FAILED_KEY, {"6": extractor.MAX_RETRIES - 1, "7": 0})
+    monkeypatch.setattr(extractor, "translator", CachedTranslator(
+        backend=DownTranslator(), store=MemoryStore(), retries=1))
+
+    extractor.retry_failed_articles()
+
+    # 6 has used up its retries, 7 is kept with one more attempt counted
+    assert extractor.checkpoint_store.get(extractor.FAILED_KEY) == {"7": 1}
+
+    monkeypatch.setattr(extractor, "translator", CachedTranslator(backend=FakeTranslator(), store=MemoryStore()))
+    extractor.retry_failed_articles()
+
+    assert extractor.checkpoint_store.get(extractor.FAILED_KEY) == {}
+    assert tagged(env) == {7}
+
+
+def test_new_failures_are_kept_for_the_next_run(env, small_pages, monkeypatch):
+    monkeypatch.setattr(extractor, "translator", CachedTranslator(
+        backend=DownTranslator(), store=MemoryStore(), retries=1))
+
+    extractor.extract_keywords_from_articles()
+
+    assert extractor.checkpoint_store.get(extractor.CHECKPOINT_KEY) == 7
+    assert extractor.checkpoint_store.get(extractor.FAILED_KEY) == {"7": 0, "6": 0}
+
+
+def test_backfill_reprocesses_a_range_without_moving_the_checkpoint(env, small_pages):
+    extractor.checkpoint_store.set(extractor.CHECKPOINT_KEY, 7)
+
+    extractor.backfill(2, 5)
+
+    assert tagged(env) == {2, 3, 4, 5}
+    assert extractor.checkpoint_store.get(extractor.CHECKPOINT_KEY) == 7
+    assert extractor.checkpoint_store.get(extractor.FAILED_KEY) is None
@@ -0,0 +1,62 @@
+import hashlib
+
+from article_writer import ArticleWriter
+from fakes import FakeSupabase
+
+
+def article(n, rss_id=1):
+    link = f"https://vnexpress.net/bai-viet-{n}.html"
+    return {
+        "title": f"Bài viết {n}",
+        "link": link,
+        "image_url": None,
+        "description": "",
+        "pub_date": "2025-03-03T08:00:00+07:00",
+        "rss_id": rss_id,
+        "link_article_md5": hashlib.md5(link.encode()).hexdigest()
+    }
+
+
+def test_write_skips_existing_and_batches_inserts():
+    db = FakeSupabase({"article": [article(0), article(1)]})
+    writer = ArticleWriter(db, chunk_size=3, lookup_size=4)
+
+    written = writer.write([article(n) for n in range(8)])
+
+    assert [row["title"] for row in written] == [f"Bài viết {n}" for n in range(2, 8)]
+    assert len(db.tables["article"]) == 8
+    # 8 md5s in lookups of 4, 6 new rows in inserts of 3
+    assert db.count("article", "select") == 2
+    assert db.count("article", "insert") == 2
+    assert writer.rows_written == 6 and writer.round_trips == 4
+    assert writer.rows_per_round_trip == 1.5
+
+
+def test_duplicate_links_in_one_window_are_written_once():
+    db = FakeSupabase()
+    writer = ArticleWriter(db)
+
+    written = writer.write([article(1, rss_id=1), article(1, rss_id=2), article(2)])
+
+    assert [row["rss_id"] for row in written] == [1, 1]
+    assert len(db.tables["article"]) == 2
+
+
+def test_failed_chunk_is_recorded_and_others_still_written():
+    db = FakeSupabase()
+    inserts = []
+
+    def fail_second_insert(query):
+        if query.op == "insert":
+            inserts.append(query)
+            return len(inserts) == 2
+        return False
+
+    db.fail = fail_second_insert
+    writer = ArticleWriter(db, chunk_size=2)
+
+    written = writer.write([article(n, rss_id=n) for n in range(6)])
+
+    assert [row["rss_id"] for row in written] == [0, 1, 4, 5]
+    assert [row["rss_id"] for row in writer.failed_rows] == [2, 3]
+    assert len(db.tables["article"]) == 4
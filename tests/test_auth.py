@@ -0,0 +1,54 @@
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt import PyJWK
+from jwt.algorithms import RSAAlgorithm
+
+from app.dependencies import auth
+from app.dependencies.auth import _verify_locally
+
+CLAIMS = {"sub": "user-1", "aud": "authenticated", "exp": int(time.time()) + 600}
+PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+class FakeJWKSClient:
+    def __init__(self, jwk: dict):
+        self.jwk = PyJWK.from_dict(jwk)
+
+    def get_signing_key_from_jwt(self, token):
+        return self.jwk
+
+
+@pytest.fixture
+def jwks(monkeypatch):
+    jwk = {**RSAAlgorithm.to_jwk(PRIVATE_KEY.public_key(), as_dict=True), "alg": "RS256", "kid": "k1"}
+    monkeypatch.setattr(auth, "_jwks_client", FakeJWKSClient(jwk))
+
+
+def test_hs256_token_verifies_with_the_secret(monkeypatch):
+    monkeypatch.setattr(auth, "SUPABASE_JWT_SECRET", "s" * 32)
+    token = jwt.encode(CLAIMS, "s" * 32, algorithm="HS256")
+    assert _verify_locally(token)["sub"] == "user-1"
+
+
+def test_jwks_token_verifies_with_the_key_algorithm(jwks):
+    token = jwt.encode(CLAIMS, PRIVATE_KEY, algorithm="RS256", headers={"kid": "k1"})
+    assert _verify_locally(token)["sub"] == "user-1"
+
+
+@pytest.mark.parametrize("alg", ["none", "PS256", "RS512"])
+def test_algorithm_is_not_taken_from_the_token_header(jwks, alg):
+    key = None if alg == "none" else PRIVATE_KEY
+    token = jwt.encode(CLAIMS, key, algorithm=alg, headers={"kid": "k1"})
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        _verify_locally(token)
+
+
+def test_symmetric_jwks_key_is_rejected(monkeypatch):
+    jwk = {"kty": "oct", "k": "c2VjcmV0LXNlY3JldC1zZWNyZXQtc2VjcmV0", "alg": "HS512", "kid": "k1"}
+    monkeypatch.setattr(auth, "_jwks_client", FakeJWKSClient(jwk))
+    token = jwt.encode(CLAIMS, "secret-secret-secret-secret-1234", algorithm="HS512")
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        _verify_locally(token)
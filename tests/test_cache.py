@@ -0,0 +1,121 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from app.core.cache import cache
+from app.services import recommend_service
+from app.services.recommend_service import RecommendService
+from fakes import FakeSupabase
+
+
+def test_concurrent_misses_share_one_load(fake_redis):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"articles": [1, 2, 3]}
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_load("t:page", loader, ttl=60) for _ in range(20)))
+
+    results = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert all(result == {"articles": [1, 2, 3]} for result in results)
+
+
+def test_stale_entry_is_served_while_one_refresh_runs(fake_redis):
+    calls = []
+
+    async def main():
+        release = asyncio.Event()
+
+        async def loader():
+            calls.append(1)
+            await release.wait()
+            return "fresh"
+
+        # An entry past its ttl but still within stale_ttl
+        await cache.client.set("t:stale", {"value": "stale", "expires_at": time.time() - 1}, 60)
+        readers = await asyncio.gather(*(cache.get_or_load("t:stale", loader, ttl=60, stale_ttl=60)
+                                         for _ in range(5)))
+        release.set()
+        await asyncio.sleep(0.01)
+        return readers, await cache.get_or_load("t:stale", loader, ttl=60, stale_ttl=60)
+
+    readers, after = asyncio.run(main())
+
+    assert readers == ["stale"] * 5
+    assert after == "fresh"
+    assert len(calls) == 1
+
+
+def test_cache_if_false_is_not_stored(fake_redis):
+    async def main():
+        await cache.get_or_load("t:partial", lambda: asyncio.sleep(0, "partial"), ttl=60,
+                                cache_if=lambda value: value != "partial")
+        return await fake_redis.exists("t:partial")
+
+    assert asyncio.run(main()) == 0
+
+
+def hot_articles_db():
+    today = datetime.now()
+    return FakeSupabase({"article": [
+        {"article_id": i, "title": f"Bài {i}", "link": f"https://vnexpress.net/{i}.html",
+         "image_url": None, "description": "", "rss_id": 1,
+         "pub_date": (today - timedelta(days=i)).strftime("%Y-%m-%d %H:%M:%S")}
+        for i in range(1, 31)
+    ]})
+
+
+def test_hot_articles_are_cached_per_page_and_reset_invalidates(fake_redis, monkeypatch):
+    db = hot_articles_db()
+    monkeypatch.setattr(recommend_service, "supabase", db)
+
+    async def main():
+        first = await RecommendService.get_hot_articles(page=1, page_size=10)
+        queries = len(db.calls)
+        again = await RecommendService.get_hot_articles(page=1, page_size=10)
+        cached_queries = len(db.calls) - queries
+        page_two = await RecommendService.get_hot_articles(page=2, page_size=10)
+
+        db.tables["article"] = db.tables["article"][:5]
+        await RecommendService.reset_recommendation_cache()
+        after_reset = await RecommendService.get_hot_articles(page=1, page_size=10)
+        return first, again, cached_queries, page_two, after_reset
+
+    first, again, cached_queries, page_two, after_reset = asyncio.run(main())
+
+    assert [a["article_id"] for a in first["articles"]] == list(range(1, 11))
+    assert first["has_more"] and first["total"] == 30
+    assert again == first and cached_queries == 0
+    assert [a["article_id"] for a in page_two["articles"]] == list(range(11, 21))
+    # The reset dropped both the cached page and the cached total
+    assert [a["article_id"] for a in after_reset["articles"]] == list(range(1, 6))
+    assert after_reset["total"] == 5 and not after_reset["has_more"]
+
+
+def test_invalidate_wins_over_a_running_load(fake_redis):
+    async def main():
+        release = asyncio.Event()
+
+        async def slow_loader():
+            await release.wait()
+            return "before reset"
+
+        reader = asyncio.create_task(cache.get_or_load("t:inv:1", slow_loader, ttl=60))
+        await asyncio.sleep(0.01)
+        await cache.invalidate("t:inv:")
+        release.set()
+        first = await reader
+        stored = await fake_redis.exists("t:inv:1")
+        after = await cache.get_or_load("t:inv:1", lambda: asyncio.sleep(0, "after reset"), ttl=60)
+        return first, stored, after
+
+    first, stored, after = asyncio.run(main())
+
+    assert first == "before reset"
+    assert stored == 0
+    assert after == "after reset"
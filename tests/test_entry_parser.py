@@ -0,0 +1,35 @@
+import json
+import os
+
+import pytest
+
+from conftest import FIXTURES
+from entry_parser import _legacy_normalize, normalize_entry, parse_description
+
+with open(os.path.join(FIXTURES, "descriptions.json"), encoding="utf-8") as f:
+    ENTRIES = json.load(f)
+
+# Unterminated tag: lxml recovers it as an <img> (then removed), html.parser keeps it as text
+PARSER_DEPENDENT = {"https://zingnews.vn/cong-nghe-post1530.html"}
+
+
+@pytest.mark.parametrize("entry", ENTRIES, ids=[entry["title"] for entry in ENTRIES])
+def test_matches_legacy_pipeline(entry):
+    if entry["link"] in PARSER_DEPENDENT:
+        pytest.skip("output depends on the HTML parser's error recovery")
+    assert normalize_entry(entry) == _legacy_normalize(entry)
+
+
+def test_script_and_style_are_not_description_text():
+    image_url, text = parse_description(
+        '<script>var a=1;</script><img src="https://x.vn/a.jpg"><style>p{}</style>Sau script'
+    )
+    assert image_url == "https://x.vn/a.jpg"
+    assert text == "Sau script"
+
+
+def test_skip_reasons():
+    by_title = {entry["title"]: normalize_entry(entry) for entry in ENTRIES}
+    assert by_title["Không có ảnh"].skip_reason == "no image"
+    assert by_title["Thiếu link"].skip_reason == "missing link/description"
+    assert by_title["Ảnh qua enclosure"].image_url == "https://media.laodong.vn/luong.jpg"
@@ -0,0 +1,98 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+
+from app.core.redis import redis_client
+from app.services import extract_service
+from app.services.extract_service import ExtractionCache
+
+URL = "https://vnexpress.net/gia-vang-4870000.html"
+
+
+def counting_extractor(monkeypatch, result, delay=0.0):
+    calls = []
+    lock = threading.Lock()
+
+    def extract_article(url):
+        with lock:
+            calls.append(url)
+        time.sleep(delay)
+        return result
+
+    monkeypatch.setattr(extract_service, "extract_article", extract_article)
+    return calls
+
+
+def article():
+    return {"title": "Giá vàng", "text": "Nội dung", "author": None, "pubDate": None, "images": []}
+
+
+def test_concurrent_requests_share_one_download(fake_redis, monkeypatch):
+    calls = counting_extractor(monkeypatch, article(), delay=0.05)
+    cache = ExtractionCache(redis_client)
+
+    async def main():
+        return await asyncio.gather(*(cache.get(URL) for _ in range(10)))
+
+    results = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert all(result == article() for result in results)
+
+
+def test_results_are_shared_through_redis(fake_redis, monkeypatch):
+    calls = counting_extractor(monkeypatch, article())
+
+    async def main():
+        await ExtractionCache(redis_client).get(URL)
+        # Another worker process: empty local cache, same Redis
+        return await ExtractionCache(redis_client).get(URL)
+
+    assert asyncio.run(main()) == article()
+    assert len(calls) == 1
+
+
+def test_failed_extraction_is_cached_negatively(fake_redis, monkeypatch):
+    calls = counting_extractor(monkeypatch, None)
+    cache = ExtractionCache(redis_client)
+
+    async def main():
+        return [await cache.get(URL) for _ in range(3)]
+
+    assert asyncio.run(main()) == [None, None, None]
+    assert len(calls) == 1
+    # Failures stay local: another process retries the URL
+    assert asyncio.run(fake_redis.keys("extract:*")) == []
+
+
+def test_oversized_results_stay_in_process(fake_redis, monkeypatch):
+    monkeypatch.setattr(extract_service, "EXTRACT_CACHE_MAX_BYTES", 10)
+    calls = counting_extractor(monkeypatch, article())
+    cache = ExtractionCache(redis_client)
+
+    async def main():
+        first = await cache.get(URL)
+        return first, await cache.get(URL), await fake_redis.keys("extract:*")
+
+    first, second, keys = asyncio.run(main())
+
+    assert first == second == article()
+    assert len(calls) == 1 and keys == []
+
+
+def test_entries_from_an_older_format_are_not_read(fake_redis, monkeypatch):
+    calls = counting_extractor(monkeypatch, article())
+    digest = hashlib.sha256(URL.encode("utf-8")).hexdigest()
+
+    async def main():
+        # Written before "text" became markdown, under the unversioned key
+        await fake_redis.set(f"extract:{digest}", json.dumps({"title": "Giá vàng", "text": "plain"}))
+        result = await ExtractionCache(redis_client).get(URL)
+        return result, await fake_redis.keys("extract:v*")
+
+    result, keys = asyncio.run(main())
+
+    assert result == article() and len(calls) == 1
+    assert keys == [f"extract:v{extract_service.EXTRACT_FORMAT_VERSION}:{digest}"]
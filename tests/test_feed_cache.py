@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+from fakes import MemoryStore
+from feed_cache import FeedCache, content_hash
+
+BODY = b"<rss><channel><item><title>Tin</title></item></channel></rss>"
+
+
+def cache_with(state):
+    store = MemoryStore()
+    store.set("1", state)
+    cache = FeedCache(store)
+    cache.load([1])
+    return store, cache
+
+
+def test_unchanged_feed_with_new_validators_saves_them():
+    store, cache = cache_with({"etag": '"v1"', "last_modified": "Mon, 02 Jun 2025 08:00:00 GMT",
+                               "content_hash": content_hash(BODY)})
+
+    # Same body, but the server now identifies it with another ETag
+    assert cache.check(1, 200, {"etag": '"v2"', "last-modified": "Tue, 03 Jun 2025 08:00:00 GMT"}, BODY) is None
+    cache.commit([SimpleNamespace(rss_id=1, state=None)])
+
+    assert store.get("1") == {"etag": '"v2"', "last_modified": "Tue, 03 Jun 2025 08:00:00 GMT",
+                              "content_hash": content_hash(BODY)}
+    assert cache.unchanged == 1
+
+    cache.load([1])
+    assert cache.request_headers(1) == {"If-None-Match": '"v2"',
+                                        "If-Modified-Since": "Tue, 03 Jun 2025 08:00:00 GMT"}
+
+
+def test_not_modified_keeps_validators_the_server_did_not_resend():
+    store, cache = cache_with({"etag": '"v1"', "last_modified": "Mon, 02 Jun 2025 08:00:00 GMT",
+                               "content_hash": content_hash(BODY)})
+
+    assert cache.check(1, 304, {"etag": '"v2"'}, b"") is None
+    cache.commit([])
+
+    assert store.get("1")["etag"] == '"v2"'
+    assert store.get("1")["last_modified"] == "Mon, 02 Jun 2025 08:00:00 GMT"
+
+
+def test_unchanged_validators_are_not_rewritten():
+    state = {"etag": '"v1"', "last_modified": None, "content_hash": content_hash(BODY)}
+    _, cache = cache_with(state)
+
+    assert cache.check(1, 200, {"etag": '"v1"'}, BODY) is None
+    assert cache.check(1, 304, {}, b"") is None
+    assert cache.refreshed == {}
+
+
+def test_changed_feed_returns_the_state_to_save_after_processing():
+    store, cache = cache_with({"etag": '"v1"', "last_modified": None, "content_hash": "old"})
+
+    state = cache.check(1, 200, {"etag": '"v2"'}, BODY)
+
+    assert state == {"etag": '"v2"', "last_modified": None, "content_hash": content_hash(BODY)}
+    # Not saved until the feed has been processed
+    cache.commit([])
+    assert store.get("1")["content_hash"] == "old"
+    cache.commit([SimpleNamespace(rss_id=1, state=state)])
+    assert store.get("1") == state
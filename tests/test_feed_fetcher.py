@@ -0,0 +1,91 @@
+import asyncio
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from conftest import FIXTURES
+from feed_fetcher import FeedCrawler
+
+SLOW_SECONDS = 0.3
+
+with open(os.path.join(FIXTURES, "feeds", "vnexpress.xml"), "rb") as f:
+    FEED = f.read()
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """/feed/<n> serves the fixture feed, /slow/<n> the same after SLOW_SECONDS, /missing 404"""
+
+    def do_GET(self):
+        self.server.arrivals.append((self.headers["Host"], self.path, time.perf_counter()))
+        if self.path.startswith("/slow/"):
+            time.sleep(SLOW_SECONDS)
+        elif not self.path.startswith("/feed/"):
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(FEED)))
+        self.end_headers()
+        self.wfile.write(FEED)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    httpd.arrivals = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def sources(host, paths, start=0):
+    return [{"id": start + i, "rss_link": f"http://{host}{path}"} for i, path in enumerate(paths)]
+
+
+def test_crawl_parses_fixture_feeds_in_order(server):
+    host = f"127.0.0.1:{server.server_port}"
+    feeds = sources(host, [f"/feed/{i}" for i in range(10)] + ["/missing"])
+    crawler = FeedCrawler(concurrency=4, per_host=2, deadline=5)
+
+    results = asyncio.run(crawler.crawl(feeds))
+
+    assert [r.rss_id for r in results] == list(range(11))
+    assert all(len(r.feed.entries) == 3 for r in results[:10])
+    assert results[0].feed.entries[0].title == "Hà Nội mở rộng tuyến đường sắt đô thị"
+    assert results[10].feed is None and "404" in results[10].error
+    assert (crawler.stats.ok, crawler.stats.failed) == (10, 1)
+    assert crawler.stats.feeds_per_sec > 0 and crawler.stats.p95_latency > 0
+
+
+def test_deadline_fails_only_the_slow_feed(server):
+    host = f"127.0.0.1:{server.server_port}"
+    crawler = FeedCrawler(concurrency=4, per_host=4, deadline=SLOW_SECONDS / 3)
+
+    results = asyncio.run(crawler.crawl(sources(host, ["/slow/0", "/feed/1"])))
+
+    assert results[0].error and results[0].feed is None
+    assert results[1].error is None and results[1].feed is not None
+
+
+def test_busy_host_does_not_starve_other_hosts(server):
+    port = server.server_port
+    busy = sources(f"127.0.0.1:{port}", [f"/slow/{i}" for i in range(16)])
+    other = sources(f"localhost:{port}", ["/slow/a", "/slow/b"], start=100)
+    crawler = FeedCrawler(concurrency=8, per_host=2, deadline=10)
+
+    started = time.perf_counter()
+    results = asyncio.run(crawler.crawl(busy + other))
+
+    assert all(r.feed is not None for r in results)
+    # Feeds queued on the busy host hold no global slot, so the other host starts at once
+    other_arrivals = [t - started for host, _, t in server.arrivals if host.startswith("localhost")]
+    assert len(other_arrivals) == 2
+    assert max(other_arrivals) < SLOW_SECONDS
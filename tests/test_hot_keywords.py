@@ -0,0 +1,36 @@
+import asyncio
+from datetime import datetime, timezone
+
+from app.services import recommend_service
+from app.services.keyword_stats_service import HOT_KEYWORDS_DAY_KEY, HOT_KEYWORDS_NAMES_KEY
+from app.services.recommend_service import RecommendService
+from fakes import FakeSupabase
+
+
+def test_leaderboard_is_read_without_touching_the_database(fake_redis, monkeypatch):
+    db = FakeSupabase()
+    monkeypatch.setattr(recommend_service, "supabase", db)
+
+    async def main():
+        day = datetime.now(timezone.utc).strftime("%Y%m%d")
+        await fake_redis.zadd(HOT_KEYWORDS_DAY_KEY.format(day=day), {"1": 5, "2": 9, "3": 1})
+        await fake_redis.hset(HOT_KEYWORDS_NAMES_KEY, mapping={"1": "hà nội", "2": "giá vàng", "3": "bóng đá"})
+        return await RecommendService.get_hot_keywords(limit=2)
+
+    result = asyncio.run(main())
+
+    assert [k["keyword_name"] for k in result["keywords"]] == ["giá vàng", "hà nội"]
+    assert db.calls == []
+
+
+def test_empty_leaderboard_uses_the_server_side_rpc_only(fake_redis, monkeypatch):
+    db = FakeSupabase()
+    db.rpcs["get_hot_keywords"] = lambda limit_count: [
+        {"keyword_id": i, "keyword_name": f"kw {i}", "count": 100 - i} for i in range(limit_count)
+    ]
+    monkeypatch.setattr(recommend_service, "supabase", db)
+
+    result = asyncio.run(RecommendService.get_hot_keywords(limit=3))
+
+    assert result["total"] == 3
+    assert db.calls == [("get_hot_keywords", "rpc")]
@@ -0,0 +1,60 @@
+import asyncio
+
+import fakeredis
+
+from app.services.keyword_stats_service import KeywordCooccurrence as CooccurrenceReader
+from app.core.redis import redis_client
+from keyword_stats import KEYWORD_COOC_DIRTY_KEY, KeywordCooccurrence
+
+
+def writer(server, buffer):
+    cooccurrence = KeywordCooccurrence.__new__(KeywordCooccurrence)
+    cooccurrence.redis = fakeredis.FakeRedis(server=server, decode_responses=True)
+    cooccurrence.buffer = buffer
+    return cooccurrence
+
+
+def articles(start, keyword_ids, n):
+    return [{"article_id": start + i, "keyword_id": kid, "keyword_name": f"kw {kid}"}
+            for i in range(n) for kid in keyword_ids]
+
+
+def test_late_strong_neighbour_is_not_trimmed_away(fake_redis):
+    cooccurrence = writer(fake_redis.connection_pool.connection_kwargs["server"], buffer=12)
+    # Keyword 1 first meets 2, 3 and 4 twice each, then 5 in five later articles
+    cooccurrence.record(articles(100, [1, 2], 2) + articles(200, [1, 3], 2) + articles(300, [1, 4], 2))
+    for i in range(5):
+        cooccurrence.record(articles(400 + i, [1, 5], 1))
+    assert cooccurrence.prune() > 0
+    assert cooccurrence.redis.scard(KEYWORD_COOC_DIRTY_KEY) == 0
+
+    reader = CooccurrenceReader(redis_client, min_count=1, max_neighbours=3)
+    related = asyncio.run(reader.related(1, limit=3))
+
+    assert related[0] == {"keyword_id": 5, "keyword_name": "kw 5", "count": 5, "score": 5}
+
+
+def test_prune_cuts_dirty_sets_to_the_buffer(fake_redis):
+    cooccurrence = writer(fake_redis.connection_pool.connection_kwargs["server"], buffer=2)
+    cooccurrence.record(articles(100, [1, 2, 3, 4], 1) + articles(200, [1, 2], 3))
+
+    # Nothing is trimmed while recording
+    assert cooccurrence.redis.zcard("kw_cooc:1") == 3
+    cooccurrence.prune()
+    assert cooccurrence.redis.zcard("kw_cooc:1") == 2
+    assert cooccurrence.redis.zrevrange("kw_cooc:1", 0, 0, withscores=True) == [("2", 4.0)]
+
+
+def test_recording_is_idempotent_per_article(fake_redis):
+    cooccurrence = writer(fake_redis.connection_pool.connection_kwargs["server"], buffer=12)
+    r = cooccurrence.redis
+    cooccurrence.record(articles(1, [1, 2], 1))
+    # A retry or backfill of the same article changes nothing
+    assert cooccurrence.record(articles(1, [1, 2], 1)) == 0
+    # A keyword added later is paired with the ones the article already had
+    cooccurrence.record(articles(1, [3], 1))
+
+    assert r.get("kw_cooc:articles") == "1"
+    assert r.hgetall("kw_cooc:df") == {"1": "1", "2": "1", "3": "1"}
+    assert r.zrevrange("kw_cooc:3", 0, -1, withscores=True) == [("2", 1.0), ("1", 1.0)]
+    assert r.zscore("kw_cooc:1", "2") == 1 and r.zscore("kw_cooc:1", "3") == 1
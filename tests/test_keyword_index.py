@@ -0,0 +1,128 @@
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+
+from app.services import keyword_index as keyword_index_module
+from app.services.keyword_index import KeywordIndex, _Tables, pub_timestamp
+from fakes import FakeSupabase
+
+
+def corpus(articles):
+    """Article i is tagged with keyword i % 3 and keyword 10 + i % 2"""
+    return {
+        "article": [{"article_id": i, "pub_date": f"2025-03-{i:02d}T08:00:00+07:00"} for i in articles],
+        "article_keyword": [row for i in articles
+                            for row in ({"article_id": i, "keyword_id": i % 3},
+                                        {"article_id": i, "keyword_id": 10 + i % 2})],
+    }
+
+
+def test_full_load_applies_page_by_page(monkeypatch):
+    db = FakeSupabase(corpus(range(1, 21)))
+    monkeypatch.setattr(keyword_index_module, "supabase", db)
+    applied = []
+    apply = _Tables.apply
+    monkeypatch.setattr(_Tables, "apply", lambda self, rows, pub_dates: (
+        applied.append(len(rows)), apply(self, rows, pub_dates)))
+    index = KeywordIndex(page_size=7)
+
+    asyncio.run(index.refresh(full=True))
+
+    # 40 postings in pages of 7: never more than one page held before applying
+    assert applied == [7, 7, 7, 7, 7, 5]
+    assert list(index.postings(0)) == [3, 6, 9, 12, 15, 18]
+    assert index.stats()["postings"] == 40 and index.stats()["articles"] == 20
+    assert index._tables.pub_ts_of(20) == pub_timestamp("2025-03-20T08:00:00+07:00")
+    ids, total = index.top_by_date([0, 1], limit=3)
+    assert ids == [19, 18, 16] and total == 13
+
+
+def test_incremental_refresh_continues_after_the_high_water_mark(monkeypatch):
+    db = FakeSupabase(corpus(range(1, 11)))
+    monkeypatch.setattr(keyword_index_module, "supabase", db)
+    index = KeywordIndex(page_size=4, full_reload_interval=3600)
+
+    async def main():
+        await index.refresh(full=True)
+        new = corpus(range(11, 16))
+        db.tables["article"] += new["article"]
+        db.tables["article_keyword"] += new["article_keyword"]
+        return await index.refresh()
+
+    refresh = asyncio.run(main())
+
+    assert not refresh["full"] and refresh["postings_added"] == 10
+    assert list(index.postings(11)) == [1, 3, 5, 7, 9, 11, 13, 15]
+    assert index._tables.pub_ts_of(15) == pub_timestamp("2025-03-15T08:00:00+07:00")
+    ids, _ = index.top_by_relevance([0, 10], limit=2)
+    assert ids == [12, 6]
+
+
+def shuffled_corpus(articles, rng):
+    """Pub dates out of article_id order, several articles per timestamp, 1-3 of 6 keywords each"""
+    return {
+        "article": [{"article_id": i, "pub_date": f"2025-03-{rng.randint(1, 28):02d}T08:00:00+07:00"}
+                    for i in articles],
+        "article_keyword": [{"article_id": i, "keyword_id": kid} for i in articles
+                            for kid in sorted(rng.sample(range(6), rng.randint(1, 3)))],
+    }
+
+
+def brute_force_top(db, keyword_ids, limit, offset=0, before=None, exclude=None, match_all=False):
+    tagged = {}
+    for row in db.tables["article_keyword"]:
+        tagged.setdefault(row["article_id"], set()).add(row["keyword_id"])
+    ts = {row["article_id"]: pub_timestamp(row["pub_date"]) for row in db.tables["article"]}
+    matches = [(ts[aid], aid) for aid, kids in tagged.items() if aid != exclude
+               and (kids >= set(keyword_ids) if match_all else kids & set(keyword_ids))]
+    keyed = sorted((key for key in matches if before is None or key < before), reverse=True)
+    return [aid for _, aid in keyed[offset:offset + limit]], len(matches)
+
+
+def test_top_by_date_matches_a_full_sort(monkeypatch):
+    rng = random.Random(3)
+    db = FakeSupabase(shuffled_corpus(range(1, 201), rng))
+    monkeypatch.setattr(keyword_index_module, "supabase", db)
+    index = KeywordIndex(page_size=37, full_reload_interval=3600)
+
+    async def main():
+        await index.refresh(full=True)
+        # Incremental rows land in date order among the ones already loaded
+        new = shuffled_corpus(range(201, 261), rng)
+        db.tables["article"] += new["article"]
+        db.tables["article_keyword"] += new["article_keyword"]
+        await index.refresh()
+
+    asyncio.run(main())
+
+    for _ in range(200):
+        keyword_ids = rng.sample(range(7), rng.randint(1, 3))  # keyword 6 has no postings
+        kwargs = {"limit": rng.randint(1, 30), "offset": rng.choice([0, 0, 5, 40]),
+                  "exclude": rng.choice([None, rng.randint(1, 260)]), "match_all": rng.random() < 0.3}
+        if rng.random() < 0.4:
+            aid = rng.randint(1, 260)
+            kwargs["before"] = (index._tables.pub_ts_of(aid), aid)
+        expected = brute_force_top(db, keyword_ids, **kwargs)
+        kwargs["exclude_article_id"] = kwargs.pop("exclude")
+        assert index.top_by_date(keyword_ids, **kwargs) == expected
+
+
+def test_top_by_date_stops_after_the_page(monkeypatch):
+    start = datetime(2025, 3, 1, 8, tzinfo=timezone.utc)
+    db = FakeSupabase({
+        "article": [{"article_id": i, "pub_date": (start + timedelta(minutes=i)).isoformat()}
+                    for i in range(1, 2001)],
+        "article_keyword": corpus(range(1, 2001))["article_keyword"],
+    })
+    monkeypatch.setattr(keyword_index_module, "supabase", db)
+    index = KeywordIndex(page_size=1000)
+    asyncio.run(index.refresh(full=True))
+    lookups = []
+    pub_ts_of = _Tables.pub_ts_of
+    monkeypatch.setattr(_Tables, "pub_ts_of", lambda self, aid: (lookups.append(aid), pub_ts_of(self, aid))[1])
+
+    ids, total = index.top_by_date([0, 1, 2], limit=21, count=False)
+
+    assert ids == list(range(2000, 1979, -1)) and total is None
+    # Each keyword's newest articles only, not its ~667 postings
+    assert len(lookups) < 100
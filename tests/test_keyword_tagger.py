@@ -0,0 +1,40 @@
+import multiprocessing
+import os
+
+import pytest
+
+import keyword_tagger
+from keyword_tagger import KeywordTagger
+
+# Workers must inherit the patched module, so they have to be forked
+pytestmark = pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                                reason="needs the fork start method")
+
+CRASH_MARKER = None
+
+
+def _no_model():
+    pass
+
+
+def _crash_once(titles):
+    # The first batch kills its worker, as the OOM killer would
+    if not os.path.exists(CRASH_MARKER):
+        open(CRASH_MARKER, "w").close()
+        os._exit(1)
+    return [[title.lower()] for title in titles]
+
+
+def test_broken_pool_is_replaced_and_batch_retried(tmp_path, monkeypatch):
+    global CRASH_MARKER
+    CRASH_MARKER = str(tmp_path / "crashed")
+    monkeypatch.setattr(keyword_tagger, "_init_worker", _no_model)
+    monkeypatch.setattr(keyword_tagger, "_tag_batch", _crash_once)
+    tagger = KeywordTagger(workers=2, chunk_size=2)
+    try:
+        titles = ["Hà Nội", "Giá Vàng", "Bóng Đá", "Thời Tiết", "Kinh Tế"]
+        assert tagger.tag(titles) == [[title.lower()] for title in titles]
+        # The replacement pool keeps serving later batches
+        assert tagger.tag(["Chứng Khoán"]) == [["chứng khoán"]]
+    finally:
+        tagger.close()
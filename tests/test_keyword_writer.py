@@ -0,0 +1,91 @@
+from benchmarks.keyword_writer import legacy_write
+from fakes import FakeSupabase
+from keyword_writer import KeywordWriter, LRUCache, generate_md5
+
+ARTICLES = {
+    1: ["giá vàng", "ngân hàng"],
+    2: ["giá vàng", "chứng khoán"],
+    3: ["bóng đá", "ngân hàng", "giá vàng"],
+}
+
+
+def keyword_db(**tables):
+    return FakeSupabase(tables, unique={"keyword": ["keyword_md5"], "article_keyword": ["article_id", "keyword_id"]},
+                        serial={"keyword": "keyword_id"})
+
+
+def stored_pairs(db):
+    return sorted((row["article_id"], row["keyword_id"]) for row in db.tables["article_keyword"])
+
+
+def named_pairs(db):
+    names = {row["keyword_id"]: row["keyword_name"] for row in db.tables["keyword"]}
+    return sorted((row["article_id"], names[row["keyword_id"]]) for row in db.tables["article_keyword"])
+
+
+def test_lru_evicts_the_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_batch_resolves_and_writes_in_three_round_trips():
+    db = keyword_db(keyword=[{"keyword_id": 7, "keyword_name": "giá vàng", "keyword_md5": generate_md5("giá vàng")}])
+    writer = KeywordWriter(db)
+
+    inserted, pairs = writer.write(ARTICLES)
+
+    # One in_ lookup, one insert of the 3 new keywords, one pair upsert
+    assert db.calls == [("keyword", "select"), ("keyword", "insert"), ("article_keyword", "upsert")]
+    assert len(db.tables["keyword"]) == 4
+    assert len(inserted) == len(pairs) == 7
+    assert {row["keyword_name"] for row in inserted if row["keyword_id"] == 7} == {"giá vàng"}
+
+
+def test_round_trips_before_and_after():
+    legacy_db, bulk_db = keyword_db(), keyword_db()
+    legacy_write(legacy_db, ARTICLES)
+    writer = KeywordWriter(bulk_db)
+    writer.write(ARTICLES)
+
+    assert named_pairs(legacy_db) == named_pairs(bulk_db)
+    # 7 pairs: 11 keyword selects/inserts + 14 pair selects/inserts, vs 3 calls for the batch
+    assert len(legacy_db.calls) == 25 and len(bulk_db.calls) == 3
+
+    writer.write({4: ["giá vàng", "ngân hàng"], 5: ["chứng khoán"]})
+    # Second batch: all keywords come from the LRU, only the pair upsert is left
+    assert bulk_db.calls[3:] == [("article_keyword", "upsert")]
+    assert writer.round_trips / writer.articles == 4 / 5
+
+
+def test_rewriting_pairs_inserts_nothing():
+    db = keyword_db()
+    writer = KeywordWriter(db)
+    writer.write(ARTICLES)
+
+    inserted, pairs = writer.write({1: ["giá vàng", "ngân hàng", "thời tiết"]})
+
+    assert [row["keyword_name"] for row in inserted] == ["thời tiết"]
+    assert len(pairs) == 3
+    assert len(stored_pairs(db)) == len(set(stored_pairs(db))) == 8
+
+
+def test_fallback_to_select_and_insert_without_a_unique_pair_index():
+    db = keyword_db()
+    db.fail = lambda query: query.table == "article_keyword" and query.op == "upsert"
+    writer = KeywordWriter(db)
+
+    writer.write(ARTICLES)
+    calls = len(db.calls)
+    inserted, _ = writer.write({1: ["giá vàng", "thời tiết"], 4: ["bóng đá"]})
+
+    assert db.count("article_keyword", "upsert") == 1  # not retried after the first failure
+    assert db.calls[calls:] == [("keyword", "select"), ("keyword", "insert"),
+                                ("article_keyword", "select"), ("article_keyword", "insert")]
+    assert sorted((row["article_id"], row["keyword_name"]) for row in inserted) == [(1, "thời tiết"), (4, "bóng đá")]
+    assert len(stored_pairs(db)) == len(set(stored_pairs(db))) == 9
@@ -0,0 +1,26 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.core import database
+from app.core.clients import clients
+from app.core.database import run_query
+from app.main import app
+from fakes import StandInQuery
+
+
+def test_app_can_start_again_after_shutdown(fake_redis):
+    for _ in range(2):
+        with TestClient(app) as client:
+            assert not clients.closed
+            assert not clients.supabase.postgrest.session.is_closed
+            assert database.db_executor is not None
+            assert client.get("/metrics/pools").status_code == 200
+            # Queries still run on the (recreated) pool
+            assert client.portal.call(run_query, StandInQuery(0)).data == []
+        assert clients.closed and database.db_executor is None
+
+    # Scripts and tests outside a lifespan keep working
+    clients.open()
+    database.start_query_pool()
+    assert asyncio.run(run_query(StandInQuery(0))).data == []
@@ -0,0 +1,71 @@
+import asyncio
+import base64
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.main import app
+from app.services import recommend_service
+from app.services.recommend_service import RecommendService
+from fakes import FakeSupabase
+
+
+def raw_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("2025-06-01T08:30:00+00:00", 42)
+    assert decode_cursor(cursor) == ("2025-06-01T08:30:00+00:00", 42)
+
+
+@pytest.mark.parametrize("cursor", [
+    raw_cursor(['2025-06-01",article_id.gt.0,pub_date.gt."2000-01-01', 1]),
+    raw_cursor(["2025-06-01T08:30:00", "1),or(article_id.gt.0"]),
+    raw_cursor(["2025-06-01T08:30:00", True]),
+    raw_cursor([None, 1]),
+    raw_cursor(["2025-06-01T08:30:00"]),
+    "not base64 !",
+])
+def test_crafted_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+    response = TestClient(app).get("/api/v1/recommend/hot-articles", params={"cursor": cursor})
+    assert response.status_code == 400
+
+
+def test_cursor_pages_break_ties_on_article_id(fake_redis, monkeypatch):
+    # Three articles per timestamp: pages of 2 split every group of ties
+    rows = [{"article_id": i, "title": f"Bài {i}", "link": f"https://vnexpress.net/{i}.html",
+             "image_url": None, "description": "", "rss_id": 1,
+             "pub_date": f"2025-06-0{1 + i // 3}T08:00:00+00:00"} for i in range(1, 9)]
+    monkeypatch.setattr(recommend_service, "supabase", FakeSupabase({"article": rows}))
+
+    async def walk():
+        seen, cursor = [], None
+        while True:
+            page = await RecommendService.get_hot_articles(page_size=2, cursor=cursor)
+            seen += [(a["pub_date"], a["article_id"]) for a in page["articles"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return seen, page["has_more"]
+
+    seen, has_more = asyncio.run(walk())
+
+    assert seen == sorted(((r["pub_date"], r["article_id"]) for r in rows), reverse=True)
+    assert not has_more
+
+
+@pytest.mark.parametrize("load", [
+    lambda: RecommendService.get_articles_by_keywords(["không có"], page=1, page_size=10),
+    lambda: RecommendService.get_related_articles_by_article(999, page=1, page_size=10),
+])
+def test_empty_results_have_the_full_page_shape(monkeypatch, load):
+    monkeypatch.setattr(recommend_service, "supabase", FakeSupabase())
+
+    result = asyncio.run(load())
+
+    assert result == {"articles": [], "total": 0, "has_more": False, "next_cursor": None,
+                      "page": 1, "page_size": 10}
@@ -0,0 +1,80 @@
+import asyncio
+
+from app.services import recommend_service
+from app.services.keyword_stats_service import (
+    HOT_KEYWORDS_NAMES_KEY, KEYWORD_COOC_ARTICLES_KEY, KEYWORD_COOC_DF_KEY, keyword_cooccurrence
+)
+from app.services.recommend_service import RecommendService
+from fakes import FakeSupabase
+
+CACHE_KEY = "related_keywords:7:10"
+
+
+def article_db():
+    return FakeSupabase({"article_keyword": [
+        {"article_id": 7, "keyword_id": 1, "keyword": {"keyword_name": "hà nội"}},
+        {"article_id": 7, "keyword_id": 2, "keyword": {"keyword_name": "giá vàng"}},
+    ]})
+
+
+async def seed_cooccurrence(redis):
+    await redis.zadd("kw_cooc:1", {"2": 5, "10": 4, "11": 3})
+    await redis.zadd("kw_cooc:2", {"1": 5, "12": 6})
+    await redis.hset(KEYWORD_COOC_DF_KEY, mapping={"1": 10, "2": 8, "10": 5, "11": 4, "12": 6})
+    await redis.set(KEYWORD_COOC_ARTICLES_KEY, 100)
+    await redis.hset(HOT_KEYWORDS_NAMES_KEY, mapping={"1": "hà nội", "2": "giá vàng", "10": "thời tiết",
+                                                       "11": "giao thông", "12": "chứng khoán"})
+
+
+def test_complete_result_is_merged_and_cached(fake_redis, monkeypatch):
+    monkeypatch.setattr(recommend_service, "supabase", article_db())
+
+    async def main():
+        await seed_cooccurrence(fake_redis)
+        result = await RecommendService.get_related_keywords_by_article(7, limit=10)
+        return result, await fake_redis.exists(CACHE_KEY)
+
+    result, cached = asyncio.run(main())
+
+    assert not result["partial"]
+    # The article's own keywords are never suggested as neighbours
+    assert [kw["keyword_id"] for kw in result["related_keywords"]] == [12, 10, 11]
+    assert cached == 1
+
+
+def test_lookups_within_budget_survive_a_slow_one(fake_redis, monkeypatch):
+    monkeypatch.setattr(recommend_service, "supabase", article_db())
+    monkeypatch.setattr(recommend_service, "RELATED_KEYWORDS_BUDGET_MS", 50)
+    related = keyword_cooccurrence.related
+
+    async def slow_for_keyword_1(keyword_id, limit, scoring):
+        if keyword_id == 1:
+            await asyncio.sleep(1)
+        return await related(keyword_id, limit, scoring)
+
+    monkeypatch.setattr(keyword_cooccurrence, "related", slow_for_keyword_1)
+
+    async def main():
+        await seed_cooccurrence(fake_redis)
+        result = await RecommendService.get_related_keywords_by_article(7, limit=10)
+        return result, await fake_redis.exists(CACHE_KEY)
+
+    result, cached = asyncio.run(main())
+
+    assert result["partial"]
+    assert [kw["keyword_id"] for kw in result["related_keywords"]] == [12]
+    assert cached == 0
+
+
+def test_missing_cooccurrence_data_is_not_cached(fake_redis, monkeypatch):
+    monkeypatch.setattr(recommend_service, "supabase", article_db())
+
+    async def main():
+        result = await RecommendService.get_related_keywords_by_article(7, limit=10)
+        return result, await fake_redis.exists(CACHE_KEY)
+
+    result, cached = asyncio.run(main())
+
+    assert result["partial"] and result["related_keywords"] == []
+    assert [kw["keyword_name"] for kw in result["keywords"]] == ["hà nội", "giá vàng"]
+    assert cached == 0
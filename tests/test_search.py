@@ -0,0 +1,101 @@
+import asyncio
+
+from app.core.text import fold_vietnamese, highlight, remove_stopwords, tokenize
+from app.services import search_backends as search_backends_module
+from app.services.search_backends import Fts5SearchBackend
+from fakes import FakeSupabase
+
+
+def article(article_id, title, description=""):
+    return {"article_id": article_id, "title": title, "link": f"https://example.vn/{article_id}",
+            "image_url": None, "description": description,
+            "pub_date": f"2025-03-{article_id:02d}T08:00:00+07:00", "rss_id": 1}
+
+
+def test_fold_vietnamese_strips_diacritics_and_keeps_length():
+    assert fold_vietnamese("Đà Nẵng") == "da nang"
+    assert fold_vietnamese("Thủ tướng Phạm Minh Chính") == "thu tuong pham minh chinh"
+    text = "Giá vàng hôm nay tăng mạnh"
+    assert len(fold_vietnamese(text)) == len(text)
+
+
+def test_highlight_is_accent_insensitive_and_keeps_the_original_text():
+    assert highlight("Du lịch Đà Nẵng mùa hè", ["da", "nang"]) == \
+        "Du lịch <mark>Đà</mark> <mark>Nẵng</mark> mùa hè"
+    # Whole syllables only: "nan" is not a match inside "Nâng"
+    assert highlight("Nâng cấp", ["nan"]) == "Nâng cấp"
+
+
+def test_remove_stopwords_matches_on_accented_tokens():
+    stopwords = frozenset({"mà", "của", "vì vậy"})
+    tokens = tokenize("Vì vậy mã độc của hacker mà")
+    assert remove_stopwords(tokens, stopwords) == ["mã", "độc", "hacker"]
+    # All stopwords: the query is kept rather than emptied
+    assert remove_stopwords(["mà"], stopwords) == ["mà"]
+
+
+def backend(monkeypatch, tmp_path, rows):
+    db = FakeSupabase({"article": rows})
+    monkeypatch.setattr(search_backends_module, "supabase", db)
+    return db, Fts5SearchBackend(path=str(tmp_path / "index.db"), stopwords_path=str(tmp_path / "none.txt"),
+                                 page_size=2)
+
+
+def test_bm25_ranks_title_matches_above_description_matches(monkeypatch, tmp_path):
+    _, index = backend(monkeypatch, tmp_path, [
+        article(1, "Thời tiết hôm nay", "Bão số 3 đổ bộ vào Đà Nẵng"),
+        article(2, "Đà Nẵng đón bão số 3", "Thời tiết xấu"),
+        # Unrelated articles so "da nang" is rare enough to get a positive idf
+        *(article(i, "Giá vàng", "Không liên quan") for i in range(3, 10)),
+    ])
+
+    async def main():
+        await index.sync()
+        return await index.search("da nang", page=1, page_size=10)
+
+    result = asyncio.run(main())
+
+    assert [a["article_id"] for a in result["articles"]] == [2, 1]
+    assert result["total"] == 2
+    assert result["articles"][0]["score"] > result["articles"][1]["score"]
+    assert result["articles"][0]["title_highlight"] == "<mark>Đà</mark> <mark>Nẵng</mark> đón bão số 3"
+
+
+def test_full_sync_reindexes_edited_and_drops_deleted_articles(monkeypatch, tmp_path):
+    db, index = backend(monkeypatch, tmp_path, [
+        article(1, "Đà Nẵng mùa lễ hội"),
+        article(2, "Giá vàng tăng"),
+        article(3, "Hà Nội mưa lớn"),
+    ])
+
+    async def main():
+        await index.sync()
+        db.tables["article"][0]["title"] = "Huế mùa lễ hội"
+        del db.tables["article"][1]
+        db.tables["article"].append(article(4, "Đà Nẵng nắng nóng"))
+        incremental = await index.sync()
+        before = [a["article_id"] for a in (await index.search("da nang", 1, 10))["articles"]]
+        full = await index.sync(full=True)
+        return incremental, before, full, {
+            query: [a["article_id"] for a in (await index.search(query, 1, 10))["articles"]]
+            for query in ("da nang", "hue", "gia vang", "ha noi")
+        }
+
+    incremental, before, full, found = asyncio.run(main())
+
+    # The incremental pass only sees the new article
+    assert incremental["full"] is False and incremental["written"] == 1
+    assert sorted(before) == [1, 4]
+    assert full["full"] is True and full["written"] == 1 and full["deleted"] == 1
+    assert found == {"da nang": [4], "hue": [1], "gia vang": [], "ha noi": [3]}
+    assert index.stats()["last_sync"]["deleted"] == 1
+
+
+def test_full_sync_runs_again_after_the_interval(monkeypatch, tmp_path):
+    _, index = backend(monkeypatch, tmp_path, [article(1, "Đà Nẵng")])
+    index.full_sync_interval = 0
+
+    async def main():
+        return [(await index.sync())["full"] for _ in range(2)]
+
+    assert asyncio.run(main()) == [True, True]
@@ -0,0 +1,87 @@
+import asyncio
+
+from app.core.redis import redis_client
+from app.services import suggest_service
+from app.services.keyword_stats_service import KEYWORD_COOC_DF_KEY
+from app.services.suggest_service import SEARCH_POPULAR_KEY, SuggestIndex, _PrefixTable
+from fakes import FakeSupabase
+
+
+def test_refresh_caps_popular_queries(fake_redis, monkeypatch):
+    monkeypatch.setattr(suggest_service, "supabase", FakeSupabase({"keyword": [
+        {"keyword_id": 1, "keyword_name": "Đà Nẵng"},
+    ]}))
+    index = SuggestIndex(redis_client, popular_max=3, enabled=True)
+
+    async def main():
+        for i, query in enumerate(["giá vàng", "đà nẵng mưa", "bão số 3", "tỷ giá", "xăng dầu"]):
+            for _ in range(i + 1):
+                await index.record_query(query)
+        await index.refresh()
+        return await fake_redis.zrevrange(SEARCH_POPULAR_KEY, 0, -1)
+
+    assert asyncio.run(main()) == ["xăng dầu", "tỷ giá", "bão số 3"]
+    assert [s["text"] for s in index.suggest("da n")] == ["Đà Nẵng"]
+
+
+def test_disabled_index_records_nothing(fake_redis):
+    index = SuggestIndex(redis_client, enabled=False)
+
+    async def main():
+        await index.record_query("giá vàng")
+        return await fake_redis.exists(SEARCH_POPULAR_KEY)
+
+    assert asyncio.run(main()) == 0
+
+
+def test_keyword_weights_fall_back_to_database_counts(fake_redis, monkeypatch):
+    # kw_cooc:df is empty when the extractor runs with KEYWORD_COOC_ENABLED=0
+    db = FakeSupabase({"keyword": [
+        {"keyword_id": 1, "keyword_name": "Đà Nẵng"},
+        {"keyword_id": 2, "keyword_name": "Đà Lạt"},
+        {"keyword_id": 3, "keyword_name": "Đan Mạch"},
+    ]})
+    db.rpcs["get_hot_keywords"] = lambda limit_count: [
+        {"keyword_id": 2, "keyword_name": "Đà Lạt", "count": 40},
+        {"keyword_id": 1, "keyword_name": "Đà Nẵng", "count": 25},
+    ][:limit_count]
+    monkeypatch.setattr(suggest_service, "supabase", db)
+    index = SuggestIndex(redis_client, enabled=True)
+
+    asyncio.run(index.refresh())
+
+    assert [(s["text"], s["weight"]) for s in index.suggest("da")] == \
+        [("Đà Lạt", 40.0), ("Đà Nẵng", 25.0), ("Đan Mạch", 1.0)]
+
+
+def test_keyword_weights_prefer_the_df_hash(fake_redis, monkeypatch):
+    db = FakeSupabase({"keyword": [
+        {"keyword_id": 1, "keyword_name": "Đà Nẵng"},
+        {"keyword_id": 2, "keyword_name": "Đà Lạt"},
+    ]})
+    monkeypatch.setattr(suggest_service, "supabase", db)
+    index = SuggestIndex(redis_client, enabled=True)
+
+    async def main():
+        await fake_redis.hset(KEYWORD_COOC_DF_KEY, mapping={1: 7, 2: 3})
+        await index.refresh()
+
+    asyncio.run(main())
+
+    assert [(s["text"], s["weight"]) for s in index.suggest("da")] == [("Đà Nẵng", 7.0), ("Đà Lạt", 3.0)]
+    assert db.count("get_hot_keywords", "rpc") == 0
+
+
+def test_long_prefix_results_are_cached_until_an_insert():
+    table = _PrefixTable([
+        ("da nang", "Đà Nẵng", "keyword", 5.0),
+        ("da lat", "Đà Lạt", "keyword", 3.0),
+    ], short_length=2, top_k=10)
+
+    assert [e[1] for e in table.lookup("da ", 10, 100)] == ["Đà Nẵng", "Đà Lạt"]
+    assert list(table._results) == ["da "]
+
+    table.insert(("da bac", "Đà Bắc", "keyword", 9.0))
+
+    assert table._results == {}
+    assert [e[1] for e in table.lookup("da ", 10, 100)] == ["Đà Bắc", "Đà Nẵng", "Đà Lạt"]
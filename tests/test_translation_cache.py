@@ -0,0 +1,73 @@
+import pytest
+
+import translation_cache
+from fakes import MemoryStore
+from translation_cache import CachedTranslator, FakeTranslator, backoff_delay
+
+
+class FlakyTranslator(FakeTranslator):
+    """Fails the first `failures` calls, like a rate-limited translation API"""
+
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    def translate_batch(self, batch):
+        if self.failures:
+            self.failures -= 1
+            self.calls += 1
+            raise ConnectionError("429 Too Many Requests")
+        return super().translate_batch(batch)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(translation_cache.time, "sleep", delays.append)
+    return delays
+
+
+def test_translations_are_cached_by_content():
+    backend, store = FakeTranslator(), MemoryStore()
+    translator = CachedTranslator(backend=backend, store=store)
+
+    assert translator.translate_many(["Hello", "World", "Hello"]) == ["[vi] Hello", "[vi] World", "[vi] Hello"]
+    # A second translator on the same store (next run) does not call the backend
+    again = CachedTranslator(backend=backend, store=store)
+    assert again.translate("World") == "[vi] World"
+    assert backend.calls == 1
+    assert (again.hits, again.misses) == (1, 0)
+
+
+def test_misses_are_sent_in_batches():
+    backend = FakeTranslator()
+    translator = CachedTranslator(backend=backend, store=MemoryStore(), batch_size=2)
+
+    translator.translate_many([f"title {i}" for i in range(5)])
+
+    assert backend.calls == 3
+
+
+def test_retries_back_off_then_succeed(sleeps):
+    backend = FlakyTranslator(failures=2)
+    translator = CachedTranslator(backend=backend, store=MemoryStore(), retries=3,
+                                  base_delay=1.0, max_delay=30.0)
+
+    assert translator.translate("Hello") == "[vi] Hello"
+    assert backend.calls == 3 and len(sleeps) == 2
+    # Full jitter: attempt n waits somewhere in [0, base * 2^n]
+    assert 0 <= sleeps[0] <= 1.0 and 0 <= sleeps[1] <= 2.0
+
+
+def test_exhausted_retries_return_none_and_are_not_cached(sleeps):
+    store = MemoryStore()
+    translator = CachedTranslator(backend=FlakyTranslator(failures=3), store=store, retries=3)
+
+    assert translator.translate_many(["Hello"]) == [None]
+    assert translator.failures == 1 and store.data == {}
+    # The next pass translates it
+    assert translator.translate("Hello") == "[vi] Hello"
+
+
+def test_backoff_is_capped():
+    assert all(0 <= backoff_delay(attempt, base_delay=1.0, max_delay=5.0) <= 5.0 for attempt in range(20))